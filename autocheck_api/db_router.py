@@ -0,0 +1,143 @@
+"""
+Читання з реплік (DATABASE_REPLICA_URLS): view вмикає репліку для запиту
+(cars.replicas.ReplicaReadMixin), усе інше — primary. Після запису
+користувач читає з primary ще DATABASE_REPLICA_MAX_LAG секунд
+(read-your-writes); репліка з більшим відставанням або недоступна
+вважається нездоровою, і читання йде в primary.
+"""
+
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# відставання standby; 0 — якщо WAL програно повністю (або це не standby)
+REPLICA_LAG_SQL = """
+SELECT COALESCE(
+    CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END,
+    0)
+"""
+
+
+class RoutingState:
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+_state = ContextVar("db_routing", default=None)
+
+
+# =========================
+# Здоровʼя реплік
+# =========================
+
+
+def check_replica(alias):
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+            else:
+                cursor.execute("SELECT 1")
+                lag = 0.0
+    except DatabaseError as exc:
+        logger.warning("Replica %s unavailable: %s", alias, exc)
+        connection.close()
+        return False
+    if lag > settings.DATABASE_REPLICA_MAX_LAG:
+        logger.warning("Replica %s lags %.1f s behind primary", alias, lag)
+        return False
+    return True
+
+
+# alias -> (здорова, monotonic час перевірки); на процес
+_health = {}
+
+
+def replica_healthy(alias):
+    now = time.monotonic()
+    checked = _health.get(alias)
+    if checked is None or now - checked[1] >= settings.DATABASE_REPLICA_CHECK_INTERVAL:
+        checked = _health[alias] = (check_replica(alias), now)
+    return checked[0]
+
+
+def choose_replica():
+    healthy = [alias for alias in settings.DATABASE_REPLICAS if replica_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+# =========================
+# Стан запиту
+# =========================
+
+
+def _pin_key(user_id):
+    return f"db:primary:user:{user_id}"
+
+
+def pin_user(user_id):
+    cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_MAX_LAG)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+def start_request():
+    _state.set(RoutingState() if settings.DATABASE_REPLICAS else None)
+
+
+def finish_request(request):
+    state = _state.get()
+    _state.set(None)
+    if state is not None and state.wrote:
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_user(user.pk)
+
+
+def use_replica():
+    """
+    Читання до кінця запиту — з однієї здорової репліки (None — primary)
+    """
+    state = _state.get()
+    if state is None or state.wrote:
+        return None
+    state.replica = choose_replica()
+    return state.replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # решта запиту читає з primary
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,298 @@
+"""
+Метрики запитів (на процес): латентність по маршрутах, кількість і час
+SQL, час серіалізації + рендеру, розмір відповіді. Віддаються у текстовому
+форматі Prometheus на /metrics/; повільні запити логуються разом із SQL.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework import serializers
+from rest_framework.response import Response
+
+logger = logging.getLogger("autocheck_api.slow_requests")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# скільки SQL тримати для логу повільного запиту
+MAX_LOGGED_QUERIES = 50
+
+
+# =========================
+# Registry
+# =========================
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # значення міток -> [лічильники по бакетах (+Inf останній), сума]
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._series.items()
+            ]
+        for label_values, counts, total in sorted(series):
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.labels, label_values)
+            )
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format_value(bound)
+                yield f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}'
+            yield f"{self.name}_sum{{{labels}}} {_format_value(total)}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def histogram(self, name, documentation, labels, buckets):
+        metric = Histogram(name, documentation, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = [line for metric in self.metrics for line in metric.collect()]
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self.metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency until the view returned a response.",
+    ("route", "method", "status"),
+    LATENCY_BUCKETS,
+)
+DB_QUERIES = registry.histogram(
+    "http_request_db_queries",
+    "SQL queries executed per request.",
+    ("route", "method"),
+    QUERY_COUNT_BUCKETS,
+)
+DB_TIME = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL per request.",
+    ("route", "method"),
+    LATENCY_BUCKETS,
+)
+SERIALIZE_TIME = registry.histogram(
+    "http_request_serialize_duration_seconds",
+    "Time spent in serializer .data and response rendering per request.",
+    ("route", "method"),
+    LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes",
+    "Response body size (non-streaming responses).",
+    ("route", "method"),
+    SIZE_BUCKETS,
+)
+
+
+# =========================
+# Стан поточного запиту
+# =========================
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        # (секунди, sql) перших MAX_LOGGED_QUERIES запитів
+        self.sql = []
+
+
+_current = ContextVar("request_stats", default=None)
+
+
+def current_stats():
+    return _current.get()
+
+
+def start_request():
+    # зʼєднання, відкриті до install() (або в іншому потоці), — без обгортки
+    for connection in connections.all(initialized_only=True):
+        _install_query_wrapper(None, connection)
+    stats = RequestStats()
+    _current.set(stats)
+    return stats
+
+
+def finish_request():
+    stats = _current.get()
+    _current.set(None)
+    return stats
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper для всіх зʼєднань; поза інструментованим запитом — прохідний
+    """
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_time += duration
+        if len(stats.sql) < MAX_LOGGED_QUERIES:
+            stats.sql.append((duration, sql))
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed(prop):
+    """
+    property, час якої (лише зовнішній виклик) додається до serialize_time
+    """
+
+    def getter(self):
+        stats = _current.get()
+        if stats is None or stats.serializing:
+            return prop.fget(self)
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            stats.serialize_time += time.perf_counter() - started
+            stats.serializing = False
+
+    return property(getter)
+
+
+_installed = False
+
+
+def install():
+    """
+    Підключити облік SQL і часу серіалізації (один раз на процес)
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_install_query_wrapper)
+    serializers.Serializer.data = _timed(serializers.Serializer.data)
+    serializers.ListSerializer.data = _timed(serializers.ListSerializer.data)
+    Response.rendered_content = _timed(Response.rendered_content)
+
+
+# =========================
+# Запис і лог
+# =========================
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route
+
+
+def observe(request, response, stats):
+    duration = time.perf_counter() - stats.started
+    route = route_name(request)
+    method = request.method
+    REQUEST_LATENCY.observe(duration, route, method, str(response.status_code))
+    DB_QUERIES.observe(stats.queries, route, method)
+    DB_TIME.observe(stats.db_time, route, method)
+    SERIALIZE_TIME.observe(stats.serialize_time, route, method)
+    if not response.streaming:
+        RESPONSE_SIZE.observe(len(response.content), route, method)
+
+    if duration * 1000 >= settings.SLOW_REQUEST_MS:
+        log_slow_request(request, response, stats, duration)
+    return duration
+
+
+def log_slow_request(request, response, stats, duration):
+    # без query string: ?token= (/api/events/) не потрапляє в логи
+    lines = [
+        f"Slow request {request.method} {request.path} "
+        f"-> {response.status_code} in {duration * 1000:.1f} ms: "
+        f"{stats.queries} queries ({stats.db_time * 1000:.1f} ms), "
+        f"serialize {stats.serialize_time * 1000:.1f} ms"
+    ]
+    lines += [f"  {seconds * 1000:8.2f} ms  {sql}" for seconds, sql in stats.sql]
+    if stats.queries > len(stats.sql):
+        lines.append(f"  ... {stats.queries - len(stats.sql)} more")
+    logger.warning("\n".join(lines))
+
+
+# =========================
+# Endpoint
+# =========================
+
+
+def metrics_view(request):
+    """
+    Prometheus: лише з METRICS_ALLOWED_IPS або з Bearer METRICS_TOKEN
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = request.headers.get("Authorization") == f"Bearer {token}"
+    else:
+        allowed = request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+    if not allowed:
+        raise PermissionDenied
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,10 +1,124 @@
-class SwaggerJWTMiddleware:
+import math
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import db_router, metrics
+
+
+class AsyncCapableMiddleware:
+    """
+    Під ASGI синхронний middleware тримає потік на весь запит
+    (включно з async view); цей базовий клас працює в обох режимах
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.process(request) or self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = self.process(request) or await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process(self, request):
+        """Обробка запиту; відповідь (не None) перериває ланцюжок"""
+        return None
+
+    def process_response(self, request, response):
+        return response
+
+
+class SwaggerJWTMiddleware(AsyncCapableMiddleware):
+    def process(self, request):
         auth = request.META.get("HTTP_AUTHORIZATION", "")
         # Якщо токен без Bearer і це не Basic auth
         if auth and not auth.startswith("Bearer ") and not auth.startswith("Basic "):
             request.META["HTTP_AUTHORIZATION"] = f"Bearer {auth}"
-        return self.get_response(request)
+
+
+class InstrumentationMiddleware(AsyncCapableMiddleware):
+    """
+    Латентність, SQL, серіалізація і розмір відповіді по маршрутах
+    (autocheck_api.metrics, /metrics/)
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        metrics.install()
+
+    def process(self, request):
+        metrics.start_request()
+
+    def process_response(self, request, response):
+        stats = metrics.finish_request()
+        if stats is not None:
+            metrics.observe(request, response, stats)
+        return response
+
+
+class DatabaseRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Стан читання з реплік на запит; після запису користувач читає
+    з primary (autocheck_api.db_router)
+    """
+
+    def process(self, request):
+        db_router.start_request()
+
+    def process_response(self, request, response):
+        db_router.finish_request(request)
+        return response
+
+
+class RateLimitHeadersMiddleware(AsyncCapableMiddleware):
+    """
+    X-RateLimit-* з найжорсткішого бакета, який перевіряли для запиту
+    (autocheck_api.throttling)
+    """
+
+    def process_response(self, request, response):
+        state = getattr(request, "rate_limit", None)
+        if state is not None:
+            response["X-RateLimit-Limit"] = str(state.limit)
+            response["X-RateLimit-Remaining"] = str(state.remaining)
+            response["X-RateLimit-Reset"] = str(math.ceil(state.reset))
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise для ASGI: у потік переходить лише віддача статики,
+    решта запитів іде далі без sync_to_async
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
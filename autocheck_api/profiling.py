@@ -0,0 +1,225 @@
+"""
+Профіль окремого запиту на проді: staff додає заголовок X-Profile (або
+?profile=) до будь-якого /api/ запиту. Профіль — семпли стеку у форматі
+collapsed (flamegraph.pl, speedscope) або cProfile — разом із SQL
+зберігається в кеші; id — у заголовку відповіді X-Profile-Id.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.authentication import ClaimsJWTAuthentication
+
+from .middleware import AsyncCapableMiddleware
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "profile"
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_TIMEOUT = 60 * 60
+# скільки функцій cProfile показувати (за cumulative)
+PROFILE_TOP_FUNCTIONS = 60
+
+
+def _profile_key(profile_id):
+    return f"profile:{profile_id}"
+
+
+def get_profile(profile_id):
+    return cache.get(_profile_key(profile_id))
+
+
+class StackSampler:
+    """
+    Потік, що раз на `interval` знімає стек цільового потоку;
+    результат — collapsed stacks ("a;b;c кількість")
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._prefixes = sorted(
+            {
+                str(settings.BASE_DIR) + os.sep,
+                *(path + os.sep for path in sys.path if path),
+            },
+            key=len,
+            reverse=True,
+        )
+
+    def _name(self, code):
+        filename = code.co_filename
+        for prefix in self._prefixes:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix) :]
+                break
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.counts.items())
+
+
+def profile_view(request, mode, view_func, view_args, view_kwargs):
+    """
+    Виконати view під профайлером; відповідь рендериться тут же,
+    щоб у профіль потрапили серіалізація і рендер
+    """
+    result = {}
+    started = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                response = view_func(request, *view_args, **view_kwargs)
+                if hasattr(response, "render") and not response.is_rendered:
+                    response.render()
+            finally:
+                profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(
+                PROFILE_TOP_FUNCTIONS
+            )
+            result["stats"] = stream.getvalue()
+        else:
+            with StackSampler(
+                threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL
+            ) as sampler:
+                response = view_func(request, *view_args, **view_kwargs)
+                if hasattr(response, "render") and not response.is_rendered:
+                    response.render()
+            result["collapsed"] = sampler.collapsed()
+    duration = time.perf_counter() - started
+
+    profile_id = uuid.uuid4().hex
+    result.update(
+        {
+            "id": profile_id,
+            "mode": mode,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "sql": [
+                {"sql": query["sql"], "time": query["time"]}
+                for query in queries.captured_queries
+            ],
+        }
+    )
+    cache.set(_profile_key(profile_id), result, PROFILE_TIMEOUT)
+    response["X-Profile-Id"] = profile_id
+    return response
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Має стояти останнім: профілюється лише view (після process_view решти).
+    Async views не профілюються.
+    """
+
+    authenticator = ClaimsJWTAuthentication()
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(self):
+            self.process_view = self.aprocess_view
+
+    def _mode(self, request, view_func):
+        if not request.path.startswith("/api/") or iscoroutinefunction(view_func):
+            return None
+        flag = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+        if not flag:
+            return None
+        try:
+            # лише claims з токена — без запиту до БД
+            auth = self.authenticator.authenticate(request)
+        except Exception:
+            return None
+        if auth is None or not auth[0].is_staff:
+            return None
+        return flag if flag in PROFILE_MODES else "sample"
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        mode = self._mode(request, view_func)
+        if mode is None:
+            return None
+        return profile_view(request, mode, view_func, view_args, view_kwargs)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        mode = self._mode(request, view_func)
+        if mode is None:
+            return None
+        return await sync_to_async(profile_view)(
+            request, mode, view_func, view_args, view_kwargs
+        )
+
+
+# =========================
+# Перегляд профілю
+# =========================
+
+
+class CollapsedStackRenderer(BaseRenderer):
+    """
+    ?format=collapsed — текст для flamegraph.pl / speedscope
+    (для cProfile — таблиця pstats)
+    """
+
+    media_type = "text/plain"
+    format = "collapsed"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict):
+            return b""
+        text = data.get("collapsed") or data.get("stats") or data.get("detail", "")
+        return str(text).encode()
+
+
+class ProfileView(APIView):
+    permission_classes = [IsAdminUser]
+    renderer_classes = [JSONRenderer, CollapsedStackRenderer]
+
+    def get(self, request, profile_id):
+        profile = get_profile(profile_id)
+        if profile is None:
+            raise NotFound("Profile not found or expired.")
+        return Response(profile)
@@ -11,10 +11,8 @@ DJANGO_ENV = os.getenv("DJANGO_ENV", "local")
 DATABASE_URL = os.getenv("DATABASE_URL", "local")
 
 SECRET_KEY = "change-me-to-a-secure-secret-in-prod"
-if os.name == "nt":
-    DEBUG = True
-else:
-    DEBUG = False
+# DEBUG=1 / 0; за замовчуванням — увімкнено лише на Windows (локальна розробка)
+DEBUG = os.getenv("DEBUG", "1" if os.name == "nt" else "0").lower() in ("1", "true")
 
 ALLOWED_HOSTS = ["*"]
 
@@ -35,7 +33,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "autocheck_api.middleware.AsyncWhiteNoiseMiddleware",
+    "autocheck_api.middleware.InstrumentationMiddleware",
+    "autocheck_api.middleware.DatabaseRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -43,6 +43,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "autocheck_api.middleware.SwaggerJWTMiddleware",
+    "autocheck_api.middleware.RateLimitHeadersMiddleware",
+    "autocheck_api.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "autocheck_api.urls"
@@ -66,7 +68,139 @@ TEMPLATES = [
 WSGI_APPLICATION = "autocheck_api.wsgi.application"
 
 
-DATABASES = {"default": dj_database_url.config(default=DATABASE_URL, conn_max_age=600)}
+# Пул зʼєднань PostgreSQL (psycopg 3 і psycopg_pool з requirements.txt):
+# вмикається DB_POOL_MAX_SIZE > 0, persistent connections тоді вимикаються
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+
+def _database(config):
+    if DB_POOL_MAX_SIZE and config.get("ENGINE") == "django.db.backends.postgresql":
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+    return config
+
+
+DATABASES = {
+    "default": _database(
+        dj_database_url.config(
+            default=DATABASE_URL, conn_max_age=600, conn_health_checks=True
+        )
+    )
+}
+
+# Репліки для читання (каталог і списки): DATABASE_REPLICA_URLS=url1,url2
+DATABASE_REPLICAS = []
+for _url in filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")):
+    _alias = f"replica{len(DATABASE_REPLICAS) + 1}"
+    DATABASES[_alias] = _database(
+        dj_database_url.parse(_url.strip(), conn_max_age=600, conn_health_checks=True)
+    )
+    DATABASES[_alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(_alias)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["autocheck_api.db_router.ReplicaRouter"]
+# секунди: більше відставання — репліка нездорова; стільки ж після запису
+# користувач читає з primary
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = float(
+    os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", "5")
+)
+
+# Спільний кеш між процесами (Redis), інакше — локальна памʼять процесу.
+# У ньому лічильники версій (ETag, знімок каталогу): з кількома воркерами
+# (WEB_CONCURRENCY, як у gunicorn) без REDIS_URL — помилка cars.E001
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Відкликані refresh tokens: "cache" — bloom filter у спільному кеші,
+# "local" — у памʼяті процесу зі звіркою з БД кожні кілька секунд
+TOKEN_REVOCATION_STORE = os.getenv(
+    "TOKEN_REVOCATION_STORE", "cache" if REDIS_URL else "local"
+)
+# секунди: як часто перебудова фільтра видаляє прострочені записи
+TOKEN_REVOCATION_PRUNE_INTERVAL = int(
+    os.getenv("TOKEN_REVOCATION_PRUNE_INTERVAL", "3600")
+)
+
+
+# Метрики (/metrics/, формат Prometheus): доступ з METRICS_ALLOWED_IPS
+# або з заголовком Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+# запити, довші за SLOW_REQUEST_MS, логуються разом із SQL
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+# профіль запиту для staff (X-Profile): інтервал семплів стеку, секунди
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.002"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"autocheck_api": {"handlers": ["console"], "level": "INFO"}},
+}
+
+
+# Бакети throttling: "redis" — спільні для всіх процесів (pip install redis),
+# "local" — у памʼяті процесу
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "redis" if REDIS_URL else "local")
+
+
+# Хешування паролів: алгоритм pbkdf2 | scrypt | argon2 (pip install argon2-cffi)
+# і вартість; підібрати під сервер: python manage.py bench_password_hashing
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "users.hashers.PBKDF2PasswordHasher",
+    "scrypt": "users.hashers.ScryptPasswordHasher",
+    "argon2": "users.hashers.Argon2PasswordHasher",
+}
+# обраний — першим, решта — щоб старі хеші перевірялись і перехешовувались при вході
+PASSWORD_HASHERS = [_PASSWORD_HASHERS.pop(PASSWORD_HASHER), *_PASSWORD_HASHERS.values()]
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+
+def _env_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+PASSWORD_PBKDF2_ITERATIONS = _env_int("PASSWORD_PBKDF2_ITERATIONS")
+PASSWORD_SCRYPT_WORK_FACTOR = _env_int("PASSWORD_SCRYPT_WORK_FACTOR")
+PASSWORD_ARGON2_TIME_COST = _env_int("PASSWORD_ARGON2_TIME_COST")
+PASSWORD_ARGON2_MEMORY_COST = _env_int("PASSWORD_ARGON2_MEMORY_COST")
+# скільки хешів рахувати паралельно і скільки входів тримати в черзі;
+# це лише ліміт — потік запиту чекає на свій хеш
+PASSWORD_HASH_WORKERS = _env_int("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1
+PASSWORD_HASH_QUEUE = _env_int("PASSWORD_HASH_QUEUE") or 32
+
+
+# Події змін для SSE (/api/events/): "redis" — Redis Streams, спільні для всіх
+# процесів (pip install redis), "local" — у памʼяті одного процесу
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "redis" if REDIS_URL else "local")
+# скільки останніх подій на користувача зберігати для Last-Event-ID
+EVENTS_BACKLOG = _env_int("EVENTS_BACKLOG") or 500
+# секунди: коментар-пінг, щоб проксі не закривали зʼєднання, і максимальна
+# тривалість одного потоку (далі браузер перепідключається сам)
+EVENTS_HEARTBEAT = _env_int("EVENTS_HEARTBEAT") or 15
+EVENTS_MAX_DURATION = _env_int("EVENTS_MAX_DURATION") or 300
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -89,13 +223,29 @@ STATIC_URL = "/static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# Зібраний фронтенд (python manage.py build_assets): бандли і маніфест
+ASSETS_BUILD_DIR = BASE_DIR / "build"
+if (ASSETS_BUILD_DIR / "static").is_dir():
+    STATICFILES_DIRS.append(ASSETS_BUILD_DIR / "static")
+# Tailwind CSS v3 CLI для збірки стилів замість CDN (інакше — tailwindcss з PATH)
+TAILWIND_CLI = os.getenv("TAILWIND_CLI")
+# зібраний Tailwind до цього розміру (байти) вбудовується в index.html
+ASSET_INLINE_CSS_MAX = 14 * 1024
+# бюджет build_assets, байти після стиснення: index.html з inline CSS, JS, CSS
+ASSET_BUDGETS = {"html": 14 * 1024, "js": 30 * 1024, "css": 20 * 1024}
 if not DEBUG:
     # Tell Django to copy static assets into a path called `staticfiles` (this is specific to Render)
     STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
-    # Enable the WhiteNoise storage backend, which compresses static files to reduce disk use
+    # Enable the WhiteNoise storage backend, which compresses static files (gzip, brotli)
     # and renames the files with unique names for each version to support long-term caching
-    STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+    # (WhiteNoise віддає їх з Cache-Control: immutable на рік)
+    STORAGES = {
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {
+            "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        },
+    }
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -104,24 +254,43 @@ AUTH_USER_MODEL = "users.User"
 
 # DRF + SimpleJWT
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.ClaimsJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "PAGE_SIZE": 20,
+    # скільки проксі перед застосунком дописують X-Forwarded-For (Render — 1);
+    # IP для throttling — останній запис від них, 0 — REMOTE_ADDR, а не
+    # заголовок, який клієнт може підставити сам
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
+    # token bucket (autocheck_api/throttling.py): ємність = кількість запитів
+    "DEFAULT_THROTTLE_CLASSES": (
+        "autocheck_api.throttling.AnonReadThrottle",
+        "autocheck_api.throttling.UserThrottle",
+        "autocheck_api.throttling.WriteThrottle",
+        "autocheck_api.throttling.ScopedThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon_read": os.getenv("THROTTLE_ANON_READ", "60/min"),
+        "user": os.getenv("THROTTLE_USER", "600/min"),
+        "write": os.getenv("THROTTLE_WRITE", "120/min"),
+        "auth": os.getenv("THROTTLE_AUTH", "10/min"),
+        # throttle_scope окремих view
+        "catalog_import": "10/hour",
+        "events": "30/min",
+    },
 }
 
-from rest_framework_simplejwt.settings import api_settings as jwt_settings
-
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
+    "TOKEN_USER_CLASS": "users.authentication.ClaimsUser",
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.ClaimsTokenRefreshSerializer",
 }
 
 # drf-yasg settings - no specific config required for basics
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.utils import get_tokens_for_user
+
+from .throttling import reset_throttles
+
+
+class QueryBudgetMixin:
+    """
+    Фіксована кількість SQL-запитів на endpoint незалежно від обсягу даних.
+    Ловить N+1 після змін у queryset / серіалізаторах.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # лічильники версій, знімки і бакети throttling — кожен тест з чистого стану
+        cache.clear()
+        reset_throttles()
+
+    def api_client(self, user=None):
+        client = APIClient()
+        if user is not None:
+            access = get_tokens_for_user(user)["access"]
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
+
+    def _assert_budget(self, budget, call, status_code):
+        with CaptureQueriesContext(connection) as queries:
+            response = call()
+            # потокові відповіді виконують запити під час читання
+            body = response.getvalue()
+        if status_code is not None:
+            self.assertEqual(response.status_code, status_code, body)
+        self.assertEqual(
+            len(queries),
+            budget,
+            "Query budget exceeded:\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries),
+        )
+        return response
+
+    def assertQueryBudget(self, budget, call, grow=None, status_code=None):
+        """
+        call() має вкластися рівно в `budget` запитів;
+        після grow() (більше даних) — у стільки ж
+        """
+        response = self._assert_budget(budget, call, status_code)
+        if grow is not None:
+            grow()
+            response = self._assert_budget(budget, call, status_code)
+        return response
@@ -0,0 +1,298 @@
+"""
+Throttling на token bucket: ємність — кількість запитів з rate ("120/min"),
+поповнення рівномірне. Бакети — у Redis (спільні для процесів, атомарно
+через Lua) або в памʼяті процесу.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:  # optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """
+    "120/min" -> (120, 60); None — без обмеження
+    """
+    if rate is None:
+        return None
+    num, period = rate.split("/")
+    return int(num), RATE_PERIODS[period[0]]
+
+
+class BucketState(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    # секунди до наступного токена (429) і до повного бакета
+    wait: float
+    reset: float
+
+
+def bucket_state(allowed, capacity, tokens, rate):
+    return BucketState(
+        allowed,
+        capacity,
+        int(tokens),
+        0.0 if allowed else (1 - tokens) / rate,
+        (capacity - tokens) / rate,
+    )
+
+
+# =========================
+# Сховища бакетів
+# =========================
+
+
+class LocalBucketStore:
+    """
+    Бакети в памʼяті процесу: ліміт множиться на кількість воркерів
+    """
+
+    max_buckets = 100_000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # від найдавніше використаних до останніх
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, period):
+        rate = capacity / period
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - stamp) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            # повний — не clear(): витісняємо найдавніше використані (LRU)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return bucket_state(allowed, capacity, tokens, rate)
+
+    async def aconsume(self, key, capacity, period):
+        return self.consume(key, capacity, period)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# ARGV: ємність, токенів за секунду, поточний час (с)
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local stamp = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - stamp) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """
+    Бакет — hash у Redis, оновлюється одним EVALSHA; Redis недоступний —
+    запит пропускається (None)
+    """
+
+    def __init__(self, url=None):
+        if redis is None:
+            raise ImproperlyConfigured(
+                "THROTTLE_STORE=redis requires: pip install redis"
+            )
+        self.url = url or settings.REDIS_URL
+        self.script = redis.Redis.from_url(self.url).register_script(TOKEN_BUCKET_LUA)
+        self._async_script = None
+
+    @property
+    def async_script(self):
+        if self._async_script is None:
+            self._async_script = redis.asyncio.Redis.from_url(self.url).register_script(
+                TOKEN_BUCKET_LUA
+            )
+        return self._async_script
+
+    def _state(self, reply, capacity, rate):
+        allowed, tokens = reply
+        return bucket_state(bool(allowed), capacity, float(tokens), rate)
+
+    def consume(self, key, capacity, period):
+        rate = capacity / period
+        try:
+            reply = self.script(keys=[key], args=[capacity, rate, time.time()])
+        except redis.RedisError as exc:
+            logger.warning("Throttling skipped: %s", exc)
+            return None
+        return self._state(reply, capacity, rate)
+
+    async def aconsume(self, key, capacity, period):
+        rate = capacity / period
+        try:
+            reply = await self.async_script(
+                keys=[key], args=[capacity, rate, time.time()]
+            )
+        except redis.RedisError as exc:
+            logger.warning("Throttling skipped: %s", exc)
+            return None
+        return self._state(reply, capacity, rate)
+
+    def reset(self):
+        pass
+
+
+STORES = {
+    "local": LocalBucketStore,
+    "redis": RedisBucketStore,
+}
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = STORES[settings.THROTTLE_STORE]()
+    return _store
+
+
+def reset_throttles():
+    get_store().reset()
+
+
+def record_rate_limit(request, state):
+    """
+    Найжорсткіший з бакетів запиту — для заголовків X-RateLimit-*
+    """
+    request = getattr(request, "_request", request)
+    current = getattr(request, "rate_limit", None)
+    if current is None or state.remaining < current.remaining:
+        request.rate_limit = state
+
+
+# =========================
+# DRF throttles
+# =========================
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Бакет на (scope, користувач або IP); rate — DEFAULT_THROTTLE_RATES[scope]
+    """
+
+    scope = None
+
+    def __init__(self):
+        self.state = None
+
+    def get_scope(self, view):
+        return self.scope
+
+    def applies(self, request):
+        return True
+
+    def get_key(self, request, scope):
+        user = request.user
+        if user is not None and user.is_authenticated:
+            return f"throttle:{scope}:user:{user.pk}"
+        return f"throttle:{scope}:ip:{self.get_ident(request)}"
+
+    def _bucket(self, request, view):
+        scope = self.get_scope(view)
+        if scope is None or not self.applies(request):
+            return None
+        rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+        if rate is None:
+            return None
+        return (self.get_key(request, scope), *rate)
+
+    def _allow(self, request, state):
+        self.state = state
+        if state is None:
+            return True
+        record_rate_limit(request, state)
+        return state.allowed
+
+    def allow_request(self, request, view):
+        bucket = self._bucket(request, view)
+        if bucket is None:
+            return True
+        return self._allow(request, get_store().consume(*bucket))
+
+    async def aallow_request(self, request, view):
+        bucket = self._bucket(request, view)
+        if bucket is None:
+            return True
+        return self._allow(request, await get_store().aconsume(*bucket))
+
+    def wait(self):
+        return None if self.state is None else self.state.wait
+
+
+class AnonReadThrottle(TokenBucketThrottle):
+    """Анонімне читання (каталог: brands, models, catalog) — за IP"""
+
+    scope = "anon_read"
+
+    def applies(self, request):
+        return request.method in SAFE_METHODS and not request.user.is_authenticated
+
+
+class UserThrottle(TokenBucketThrottle):
+    """Усі запити авторизованого користувача"""
+
+    scope = "user"
+
+    def applies(self, request):
+        return request.user.is_authenticated
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Запити, що змінюють дані"""
+
+    scope = "write"
+
+    def applies(self, request):
+        return request.method not in SAFE_METHODS
+
+
+class AuthThrottle(TokenBucketThrottle):
+    """signin / signup / refresh — за IP, окремо від решти API"""
+
+    scope = "auth"
+
+    def get_key(self, request, scope):
+        return f"throttle:{scope}:ip:{self.get_ident(request)}"
+
+
+class ScopedThrottle(TokenBucketThrottle):
+    """Окремий бакет для view з атрибутом throttle_scope"""
+
+    def get_scope(self, view):
+        return getattr(view, "throttle_scope", None)
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from autocheck_api.metrics import metrics_view
+from autocheck_api.profiling import ProfileView
+
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -13,6 +16,12 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("users.urls")),
     path("api/", include("cars.urls")),
+    # async-версії cars API для ASGI (uvicorn)
+    path("api/async/", include("cars.async_urls")),
+    # метрики для Prometheus (внутрішній endpoint)
+    path("metrics/", metrics_view, name="metrics"),
+    # профілі запитів, знятих з X-Profile (staff)
+    path("api/profiles/<str:profile_id>/", ProfileView.as_view(), name="profile"),
     # OpenAPI 3 (Swagger)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -1,7 +1,10 @@
 set -o errexit
 pip install gunicorn
 pip install -r requirements.txt
+# мініфікація, critical CSS і бюджет розмірів; collectstatic додає хеші, gzip і brotli
+python manage.py build_assets --check
 python manage.py collectstatic --no-input
-python manage.py makemigrations
+# міграції комітяться в репозиторій; збірка падає, якщо моделі з ними розійшлися
+python manage.py makemigrations --check --dry-run
 python manage.py migrate
 python manage.py createsuperuser
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from .async_views import (
+    BrandDetailView,
+    BrandListView,
+    CarDetailView,
+    CarListView,
+    CarModelDetailView,
+    CarModelListView,
+    ServiceDetailView,
+    ServiceListView,
+)
+
+# ті самі шляхи, що й у cars/urls.py, підключаються під /api/async/
+urlpatterns = [
+    path("brands/", BrandListView.as_view(), name="async-brands-list"),
+    path("brands/<int:pk>/", BrandDetailView.as_view(), name="async-brands-detail"),
+    path("models/", CarModelListView.as_view(), name="async-models-list"),
+    path("models/<int:pk>/", CarModelDetailView.as_view(), name="async-models-detail"),
+    path("cars/", CarListView.as_view(), name="async-cars-list"),
+    path("cars/<int:pk>/", CarDetailView.as_view(), name="async-cars-detail"),
+    path("services/", ServiceListView.as_view(), name="async-services-list"),
+    path(
+        "services/<int:pk>/",
+        ServiceDetailView.as_view(),
+        name="async-services-detail",
+    ),
+]
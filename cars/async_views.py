@@ -0,0 +1,370 @@
+"""
+Async-версії list / retrieve / create для brands, models, cars, services
+(/api/async/...). Відповіді такі самі, як у sync viewsets; читання — async ORM,
+тож повільний клієнт не тримає потік з пулу.
+"""
+
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from users.authentication import ClaimsJWTAuthentication
+
+from .fastpath import CAR_VALUES, SERVICE_VALUES, FastJSONRenderer, car_row, service_row
+from .models import Brand, CarModel, Car, Service
+from .serializers import (
+    AsyncCarModelSerializer,
+    AsyncCarWriteSerializer,
+    AsyncServiceWriteSerializer,
+    BrandSerializer,
+)
+
+renderer = FastJSONRenderer()
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        renderer.render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def raw_pk(data, key):
+    try:
+        return int(data[key])
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+async def existing_ids(model, pk, **filters):
+    """
+    {pk}, якщо обʼєкт існує, інакше порожня множина
+    """
+    if pk is None:
+        return set()
+    return {pk} if await model.objects.filter(pk=pk, **filters).aexists() else set()
+
+
+# =========================
+# Permissions
+# =========================
+
+
+class AsyncIsAuthenticated:
+    async def has_permission(self, request, view):
+        return request.user.is_authenticated
+
+
+class AsyncReadOnlyOrAuthenticated:
+    """
+    GET/HEAD/OPTIONS — доступні всім, решта — тільки авторизованим
+    """
+
+    async def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or request.user.is_authenticated
+
+
+# =========================
+# Base view
+# =========================
+
+
+class AsyncAPIView(View):
+    """
+    Мінімальний async-аналог APIView: JWT (claims), permissions,
+    JSON-тіло і помилки у форматі DRF
+    """
+
+    permission_classes = (AsyncIsAuthenticated,)
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    authenticator = ClaimsJWTAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # як APIView: JWT, а не cookie-сесія — CSRF не потрібен
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.initial(request)
+            handler = getattr(self, request.method.lower(), None)
+            if handler is None or request.method.lower() not in self.http_method_names:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except (exceptions.APIException, Http404, DjangoPermissionDenied) as exc:
+            return self.handle_exception(request, exc)
+
+    async def initial(self, request):
+        request.user, request.auth = AnonymousUser(), None
+        result = await self.authenticator.aauthenticate(request)
+        if result is not None:
+            request.user, request.auth = result
+
+        for permission_class in self.permission_classes:
+            if not await permission_class().has_permission(request, self):
+                if request.auth is None:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied()
+
+        waits = []
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not await throttle.aallow_request(request, self):
+                waits.append(throttle.wait())
+        if waits:
+            raise exceptions.Throttled(max(waits))
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound(*exc.args)
+        elif isinstance(exc, DjangoPermissionDenied):
+            exc = exceptions.PermissionDenied(*exc.args)
+
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            headers["WWW-Authenticate"] = self.authenticator.authenticate_header(
+                request
+            )
+        if getattr(exc, "wait", None):
+            headers["Retry-After"] = "%d" % exc.wait
+
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return json_response(data, exc.status_code, headers)
+
+    def parse_body(self, request):
+        content_type = request.content_type or ""
+        if content_type != "application/json":
+            raise exceptions.UnsupportedMediaType(content_type)
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+
+    def validate(self, serializer):
+        if not serializer.is_valid():
+            raise exceptions.ValidationError(serializer.errors)
+        return serializer.validated_data
+
+    async def save(self, serializer, **kwargs):
+        # транзакції (і сигнали зі зведеннями) — лише в sync-коді
+        def save():
+            with transaction.atomic():
+                return serializer.save(**kwargs)
+
+        await sync_to_async(save)()
+        return json_response(serializer.data, status.HTTP_201_CREATED)
+
+    async def paginate(self, request, rows, row=None):
+        """
+        PageNumberPagination: {"count", "next", "previous", "results"}
+        """
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        count = await rows.acount()
+        pages = max(1, math.ceil(count / page_size))
+
+        page = request.GET.get("page", 1)
+        if page == "last":
+            page = pages
+        try:
+            page = int(page)
+        except (TypeError, ValueError):
+            page = 0
+        if not 1 <= page <= pages:
+            raise exceptions.NotFound("Invalid page.")
+
+        offset = (page - 1) * page_size
+        results = [
+            row(item) if row else item
+            async for item in rows[offset : offset + page_size]
+        ]
+
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, "page", page + 1) if page < pages else None
+        previous_url = None
+        if page == 2:
+            previous_url = remove_query_param(url, "page")
+        elif page > 2:
+            previous_url = replace_query_param(url, "page", page - 1)
+
+        return json_response(
+            {
+                "count": count,
+                "next": next_url,
+                "previous": previous_url,
+                "results": results,
+            }
+        )
+
+    async def retrieve(self, rows, model, row=None):
+        item = await rows.afirst()
+        if item is None:
+            raise Http404(f"No {model._meta.object_name} matches the given query.")
+        return json_response(row(item) if row else item)
+
+
+# =========================
+# Brands / models (публічне читання)
+# =========================
+
+BRAND_VALUES = ("id", "title", "logo_filename")
+CAR_MODEL_VALUES = ("id", "car_brand", "title")
+
+
+class BrandListView(AsyncAPIView):
+    permission_classes = (AsyncReadOnlyOrAuthenticated,)
+
+    async def get(self, request):
+        return await self.paginate(
+            request, Brand.objects.order_by("id").values(*BRAND_VALUES)
+        )
+
+    async def post(self, request):
+        serializer = BrandSerializer(data=self.parse_body(request))
+        self.validate(serializer)
+        return await self.save(serializer)
+
+
+class BrandDetailView(AsyncAPIView):
+    permission_classes = (AsyncReadOnlyOrAuthenticated,)
+
+    async def get(self, request, pk):
+        return await self.retrieve(
+            Brand.objects.filter(pk=pk).values(*BRAND_VALUES), Brand
+        )
+
+
+class CarModelListView(AsyncAPIView):
+    permission_classes = (AsyncReadOnlyOrAuthenticated,)
+
+    async def get(self, request):
+        rows = CarModel.objects.order_by("id").values(*CAR_MODEL_VALUES)
+        brand_id = request.GET.get("brand")
+        if brand_id:
+            if not brand_id.isdigit():
+                raise exceptions.ValidationError(
+                    {"brand": ["A valid integer is required."]}
+                )
+            rows = rows.filter(car_brand_id=brand_id)
+        return await self.paginate(request, rows)
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        brand_id = raw_pk(data, "car_brand")
+        serializer = AsyncCarModelSerializer(
+            data=data, context={"brand_ids": await existing_ids(Brand, brand_id)}
+        )
+        validated = self.validate(serializer)
+        if await CarModel.objects.filter(
+            car_brand_id=validated["car_brand_id"], title=validated["title"]
+        ).aexists():
+            raise exceptions.ValidationError(
+                {
+                    "non_field_errors": [
+                        "The fields car_brand, title must make a unique set."
+                    ]
+                }
+            )
+        return await self.save(serializer)
+
+
+class CarModelDetailView(AsyncAPIView):
+    permission_classes = (AsyncReadOnlyOrAuthenticated,)
+
+    async def get(self, request, pk):
+        return await self.retrieve(
+            CarModel.objects.filter(pk=pk).values(*CAR_MODEL_VALUES), CarModel
+        )
+
+
+# =========================
+# Cars / services (тільки власні)
+# =========================
+
+
+def owned_cars(request):
+    return Car.objects.filter(owner_id=request.user.id)
+
+
+def owned_services(request):
+    return Service.objects.filter(car__owner_id=request.user.id)
+
+
+class CarListView(AsyncAPIView):
+    async def get(self, request):
+        rows = owned_cars(request).order_by("id").values(*CAR_VALUES)
+        return await self.paginate(request, rows, car_row)
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        serializer = AsyncCarWriteSerializer(
+            data=data,
+            context={
+                "brand_ids": await existing_ids(Brand, raw_pk(data, "car_brand")),
+                "model_ids": await existing_ids(CarModel, raw_pk(data, "car_model")),
+            },
+        )
+        self.validate(serializer)
+        return await self.save(serializer, owner_id=request.user.id)
+
+
+class CarDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        rows = owned_cars(request).filter(pk=pk).values(*CAR_VALUES)
+        return await self.retrieve(rows, Car, car_row)
+
+
+class ServiceListView(AsyncAPIView):
+    async def get(self, request):
+        rows = owned_services(request)
+        car_id = request.GET.get("car")
+        if car_id:
+            if not car_id.isdigit():
+                raise exceptions.ValidationError(
+                    {"car": ["A valid integer is required."]}
+                )
+            rows = rows.filter(car_id=car_id)
+        return await self.paginate(request, rows.values(*SERVICE_VALUES), service_row)
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        car_id = raw_pk(data, "car")
+        owner_id = None
+        if car_id is not None:
+            owner_id = (
+                await Car.objects.filter(pk=car_id)
+                .values_list("owner_id", flat=True)
+                .afirst()
+            )
+        serializer = AsyncServiceWriteSerializer(
+            data=data, context={"car_ids": set() if owner_id is None else {car_id}}
+        )
+        self.validate(serializer)
+        if owner_id != request.user.id:
+            raise exceptions.PermissionDenied("You do not own this car")
+        return await self.save(serializer)
+
+
+class ServiceDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        rows = owned_services(request).filter(pk=pk).values(*SERVICE_VALUES)
+        return await self.retrieve(rows, Service, service_row)
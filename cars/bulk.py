@@ -0,0 +1,111 @@
+from functools import partial
+
+from django.db import transaction
+from rest_framework.serializers import ListSerializer
+
+from .events import deferred_events, service_event
+from .models import Service
+from .serializers import BULK_MAX_ITEMS
+from .signals import bump_car_owner_version
+from .summary import (
+    deferred_summaries,
+    locked_service_states,
+    record_service_change,
+    service_state,
+)
+from .versions import bump_table_version
+
+
+def payload_errors(items):
+    """
+    Не список або більше BULK_MAX_ITEMS — помилка ще до запитів до БД
+    (інакше collect_ids дав би необмежений id__in)
+    """
+    messages = ListSerializer.default_error_messages
+    if not isinstance(items, list):
+        message = messages["not_a_list"].format(input_type=type(items).__name__)
+    elif len(items) > BULK_MAX_ITEMS:
+        message = messages["max_length"].format(max_length=BULK_MAX_ITEMS)
+    else:
+        return None
+    return {"non_field_errors": [message]}
+
+
+def collect_ids(items, key):
+    """
+    Цілі id з сирого пакета (до валідації) — для одного запиту перевірки власності
+    """
+    ids = set()
+    if isinstance(items, list):
+        for item in items:
+            try:
+                ids.add(int(item[key]))
+            except (TypeError, ValueError, KeyError):
+                pass
+    return ids
+
+
+def item_errors(errors):
+    """
+    Помилки ListSerializer -> [{"index": i, "errors": {...}}] лише для невалідних елементів
+    """
+    if isinstance(errors, list):
+        return [
+            {"index": index, "errors": error}
+            for index, error in enumerate(errors)
+            if error
+        ]
+    return errors
+
+
+def services_changed(services, event_type):
+    # bulk_create / bulk_update не надсилають post_save
+    transaction.on_commit(partial(bump_table_version, Service))
+    for car_id in {service.car_id for service in services}:
+        transaction.on_commit(partial(bump_car_owner_version, car_id))
+    for service in services:
+        service_event(event_type, service)
+
+
+def create_services(items):
+    services = [Service(car_id=item.pop("car"), **item) for item in items]
+    with transaction.atomic(), deferred_summaries(), deferred_events():
+        Service.objects.bulk_create(services)
+        for service in services:
+            record_service_change(None, service_state(service))
+        services_changed(services, "service.created")
+    return services
+
+
+def update_service_statuses(services, items):
+    """
+    services — {id: Service} власника, items — провалідовані {"id", "status"}
+    """
+    changed = {}
+    with transaction.atomic(), deferred_summaries(), deferred_events():
+        # дельти — від збережених рядків, не від services, прочитаних до транзакції
+        stored = locked_service_states(services)
+        for item in items:
+            service = services[item["id"]]
+            old = stored.get(service.pk)
+            if old is None:
+                continue
+            service.car_id, service.status, service.hours = old
+            if service.status != item["status"]:
+                service.status = item["status"]
+                stored[service.pk] = service_state(service)
+                record_service_change(old, stored[service.pk])
+                changed[service.pk] = service
+
+        Service.objects.bulk_update(changed.values(), ["status"])
+        if changed:
+            services_changed(changed.values(), "service.updated")
+    return [services[item["id"]] for item in items]
+
+
+def delete_services(queryset):
+    with transaction.atomic(), deferred_summaries(), deferred_events():
+        # блокування до delete(): колектор прочитає актуальні рядки
+        locked_service_states(queryset.values("pk"))
+        deleted, _ = queryset.delete()
+    return deleted
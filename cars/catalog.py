@@ -0,0 +1,80 @@
+import threading
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from .models import Brand, CarModel
+from .versions import get_version, bump_version
+
+CATALOG_VERSION = "catalog"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+class CatalogSnapshot:
+    """
+    Готовий JSON-документ каталогу (бренди + моделі) для однієї версії
+    """
+
+    __slots__ = ("version", "content")
+
+    def __init__(self, version, content):
+        self.version = version
+        self.content = content
+
+    @property
+    def etag(self):
+        return f'"catalog-{self.version}"'
+
+
+_local_snapshot = None
+_build_lock = threading.Lock()
+
+
+def _snapshot_key(version):
+    return f"catalog:snapshot:{version}"
+
+
+def build_catalog_document(version):
+    models_by_brand = {}
+    for model in CarModel.objects.order_by("title").values(
+        "id", "car_brand_id", "title"
+    ):
+        models_by_brand.setdefault(model.pop("car_brand_id"), []).append(model)
+
+    brands = []
+    for brand in Brand.objects.order_by("title").values("id", "title", "logo_filename"):
+        brand["models"] = models_by_brand.get(brand["id"], [])
+        brands.append(brand)
+
+    return {"version": version, "brands": brands}
+
+
+def get_catalog_snapshot():
+    """
+    Знімок каталогу: локальна памʼять процесу -> спільний кеш -> БД.
+    У стабільному стані не робить жодного запиту до БД.
+    """
+    global _local_snapshot
+
+    version = get_version(CATALOG_VERSION)
+    snapshot = _local_snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _build_lock:
+        snapshot = _local_snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        content = cache.get(_snapshot_key(version))
+        if content is None:
+            content = JSONRenderer().render(build_catalog_document(version))
+            cache.set(_snapshot_key(version), content, SNAPSHOT_TIMEOUT)
+
+        snapshot = CatalogSnapshot(version, content)
+        _local_snapshot = snapshot
+        return snapshot
+
+
+def invalidate_catalog():
+    bump_version(CATALOG_VERSION)
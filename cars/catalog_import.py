@@ -0,0 +1,273 @@
+import codecs
+import csv
+import json
+from functools import partial
+from itertools import islice
+
+from django.db import transaction
+
+from .catalog import invalidate_catalog
+from .models import Brand, CarModel
+from .versions import bump_table_version
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "ndjson")
+# скільки описів помилок повертати у звіті (лічильник invalid — повний)
+MAX_REPORTED_ERRORS = 20
+
+TITLE_MAX_LENGTH = CarModel._meta.get_field("title").max_length
+LOGO_MAX_LENGTH = Brand._meta.get_field("logo_filename").max_length
+
+
+INVALID_UTF8 = "Invalid UTF-8"
+
+
+class CatalogImportError(ValueError):
+    pass
+
+
+class ImportReport:
+    """
+    Лічильники імпорту: inserted / updated / skipped для брендів і моделей
+    """
+
+    def __init__(self):
+        self.brands = {"inserted": 0, "updated": 0, "skipped": 0}
+        self.models = {"inserted": 0, "updated": 0, "skipped": 0}
+        self.invalid = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "brands": self.brands,
+            "models": self.models,
+            "invalid": self.invalid,
+            "errors": self.errors,
+        }
+
+
+def detect_format(filename, fmt=None):
+    if fmt is None and filename:
+        fmt = filename.rsplit(".", 1)[-1].lower()
+        if fmt in ("jsonl", "json"):
+            fmt = "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        raise CatalogImportError(
+            f"Unsupported format, expected one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    return fmt
+
+
+class TextLines:
+    """
+    Рядки бінарного потоку як текст; number — скільки рядків прочитано.
+    Рядки не в UTF-8 декодуються із заміною, їхні номери — в invalid:
+    помилка лише цього запису, а не всього імпорту
+    """
+
+    def __init__(self, binary):
+        self.binary = binary
+        self.number = 0
+        self.invalid = set()
+
+    def __iter__(self):
+        for raw in self.binary:
+            self.number += 1
+            if self.number == 1 and raw.startswith(codecs.BOM_UTF8):
+                raw = raw[len(codecs.BOM_UTF8) :]
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.invalid.add(self.number)
+                yield raw.decode("utf-8", "replace")
+
+
+def _csv_records(lines):
+    reader = csv.DictReader(iter(lines))
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as exc:
+        raise CatalogImportError(f"Malformed CSV header: {exc}")
+    if lines.invalid:
+        raise CatalogImportError("CSV header is not valid UTF-8")
+    if not fieldnames or "brand" not in fieldnames:
+        raise CatalogImportError("CSV header must contain a 'brand' column")
+    while True:
+        # запис у лапках може займати кілька рядків; номер — першого
+        first = lines.number + 1
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            record = ValueError(f"Malformed row: {exc}")
+        if not lines.invalid.isdisjoint(range(first, lines.number + 1)):
+            record = ValueError(INVALID_UTF8)
+        yield first, record
+
+
+def _ndjson_records(lines):
+    for text in lines:
+        if not text.strip():
+            continue
+        if lines.number in lines.invalid:
+            yield lines.number, ValueError(INVALID_UTF8)
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            record = None
+        yield lines.number, record
+
+
+def read_records(binary, fmt):
+    """
+    (номер рядка, dict | None | ValueError) з бінарного потоку — рядок за рядком
+    """
+    if fmt == "csv":
+        return _csv_records(TextLines(binary))
+    return _ndjson_records(TextLines(binary))
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def parse_record(record):
+    """
+    (brand, model, logo_filename) або ValueError з описом проблеми
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Malformed row")
+    brand = _clean(record.get("brand"))
+    model = _clean(record.get("model"))
+    logo = _clean(record.get("logo_filename"))
+    if not brand:
+        raise ValueError("Brand is required")
+    # PostgreSQL не зберігає NUL у текстових полях
+    if "\x00" in brand + model + logo:
+        raise ValueError("NUL character is not allowed")
+    if len(brand) > TITLE_MAX_LENGTH or len(model) > TITLE_MAX_LENGTH:
+        raise ValueError(f"Title is longer than {TITLE_MAX_LENGTH} characters")
+    if len(logo) > LOGO_MAX_LENGTH:
+        raise ValueError(f"Logo filename is longer than {LOGO_MAX_LENGTH} characters")
+    return brand, model, logo
+
+
+class CatalogImporter:
+    """
+    Пакетний upsert брендів (за title) і моделей (за car_brand + title).
+    У памʼяті тримаються лише бренди та поточний пакет рядків.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self.brands = {}
+        for brand_id, title, logo in Brand.objects.order_by("-id").values_list(
+            "id", "title", "logo_filename"
+        ):
+            # дублікати назв у БД — беремо найстаріший бренд
+            self.brands[title] = [brand_id, logo]
+        self.seen_brands = set()
+
+    def run(self, records):
+        records = iter(records)
+        try:
+            while batch := list(islice(records, self.batch_size)):
+                self.import_batch(batch)
+        finally:
+            self.finish()
+        return self.report
+
+    def import_batch(self, batch):
+        rows = []
+        for line, record in batch:
+            try:
+                rows.append(parse_record(record))
+            except ValueError as exc:
+                self.report.add_error(line, str(exc))
+
+        with transaction.atomic():
+            self.upsert_brands(rows)
+            self.insert_models(rows)
+
+    def upsert_brands(self, rows):
+        logos = {}
+        for brand, _, logo in rows:
+            if logo or brand not in logos:
+                logos[brand] = logo
+
+        created, changed = [], []
+        for title, logo in logos.items():
+            first_seen = title not in self.seen_brands
+            self.seen_brands.add(title)
+            known = self.brands.get(title)
+            if known is None:
+                created.append(Brand(title=title, logo_filename=logo))
+            elif logo and known[1] != logo:
+                known[1] = logo
+                changed.append(Brand(id=known[0], title=title, logo_filename=logo))
+                if first_seen:
+                    self.report.brands["updated"] += 1
+            elif first_seen:
+                self.report.brands["skipped"] += 1
+
+        if created:
+            Brand.objects.bulk_create(created, batch_size=self.batch_size)
+            for brand_id, title, logo in Brand.objects.filter(
+                title__in=[brand.title for brand in created]
+            ).values_list("id", "title", "logo_filename"):
+                self.brands.setdefault(title, [brand_id, logo])
+            self.report.brands["inserted"] += len(created)
+        if changed:
+            Brand.objects.bulk_update(changed, ["logo_filename"])
+
+    def insert_models(self, rows):
+        wanted = set()
+        for brand, model, _ in rows:
+            if not model:
+                continue
+            key = (self.brands[brand][0], model)
+            if key in wanted:
+                self.report.models["skipped"] += 1
+            wanted.add(key)
+
+        if not wanted:
+            return
+        existing = set(
+            CarModel.objects.filter(
+                car_brand_id__in={brand_id for brand_id, _ in wanted},
+                title__in={title for _, title in wanted},
+            ).values_list("car_brand_id", "title")
+        )
+        created = [
+            CarModel(car_brand_id=brand_id, title=title)
+            for brand_id, title in wanted
+            if (brand_id, title) not in existing
+        ]
+        # ignore_conflicts — на випадок паралельного імпорту тих самих моделей
+        CarModel.objects.bulk_create(
+            created, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        self.report.models["inserted"] += len(created)
+        self.report.models["skipped"] += len(wanted) - len(created)
+
+    def finish(self):
+        # bulk_create / bulk_update не надсилають post_save
+        transaction.on_commit(invalidate_catalog)
+        transaction.on_commit(partial(bump_table_version, Brand))
+        transaction.on_commit(partial(bump_table_version, CarModel))
+
+
+def import_catalog(binary, fmt, batch_size=IMPORT_BATCH_SIZE):
+    return CatalogImporter(batch_size).run(read_records(binary, fmt))
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# кеш, якого не бачать інші процеси
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches)
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Лічильники версій (cars.versions) мають бути спільні для всіх воркерів:
+    інакше запис скидає ETag і знімок каталогу лише у своєму процесі
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.WEB_CONCURRENCY > 1 and backend in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"WEB_CONCURRENCY={settings.WEB_CONCURRENCY}, but the default "
+                f"cache ({backend}) is local to each process.",
+                hint="Set REDIS_URL (or another shared cache) or run one worker.",
+                id="cars.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,95 @@
+import hashlib
+import math
+
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .versions import get_versions, table_version_name
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified для list і retrieve.
+    На If-None-Match / If-Modified-Since відповідає 304 без серіалізації.
+
+    ETag будується з лічильників змін таблиць `conditional_tables`,
+    Last-Modified — з часу останньої зміни цих таблиць, а для одного
+    обʼєкта ще й з поля `last_modified_field` (страховка від записів
+    в обхід сигналів, наприклад queryset.update()).
+    """
+
+    conditional_tables = ()
+    last_modified_field = None
+    conditional_public = False
+
+    def get_conditional_tables(self):
+        return self.conditional_tables
+
+    def get_conditional_state(self, *parts):
+        versions = get_versions(
+            [table_version_name(model) for model in self.get_conditional_tables()]
+        )
+        request = self.request
+        digest = hashlib.sha1(
+            repr(
+                (
+                    sorted(versions.items()),
+                    None if self.conditional_public else request.user.pk,
+                    request.get_full_path(),
+                    request.accepted_renderer.format,
+                    parts,
+                )
+            ).encode()
+        ).hexdigest()
+        last_modified = max((changed for _, changed in versions.values()), default=0)
+        return f'"{digest}"', last_modified
+
+    def conditional_response(self, etag, last_modified, render):
+        last_modified = math.ceil(last_modified) or None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(
+                response,
+                no_cache=True,
+                **({"public": True} if self.conditional_public else {"private": True}),
+            )
+            if not self.conditional_public:
+                patch_vary_headers(response, ("Authorization",))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_conditional_state()
+        return self.conditional_response(
+            etag,
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_object_response(self.get_object())
+
+    def conditional_object_response(self, instance):
+        """Один обʼєкт через get_serializer — для retrieve і detail-дій"""
+        etag, last_modified = self.get_conditional_state(instance.pk)
+        if self.last_modified_field:
+            row_modified = getattr(instance, self.last_modified_field, None)
+            if row_modified is not None:
+                last_modified = max(last_modified, row_modified.timestamp())
+
+        def render():
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
+
+        return self.conditional_response(etag, last_modified, render)
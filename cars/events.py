@@ -0,0 +1,474 @@
+"""
+Події змін для SSE (/api/events/): у кожного користувача свій потік
+(сервіси: створення / зміна / видалення, пробіг авто). Бекенд тримає останні
+EVENTS_BACKLOG подій, тож після перепідключення клієнт дочитує пропущене
+за Last-Event-ID.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from .fastpath import FastJSONRenderer, datetime_string
+from .models import Car, Service
+from .serializers import ServiceWriteSerializer
+
+try:
+    import redis
+    import redis.asyncio
+except ImportError:  # optional
+    redis = None
+
+# скільки чекати перед перепідключенням після обриву (мс, поле retry SSE)
+RECONNECT_DELAY = 3000
+# скільки власників авто памʼятати (car_id -> owner_id не змінюється)
+CAR_OWNERS_CACHE_SIZE = 10_000
+
+renderer = FastJSONRenderer()
+
+
+class Event(NamedTuple):
+    id: object
+    type: str
+    data: str
+
+
+# =========================
+# Бекенди
+# =========================
+
+
+class LocalEventBackend:
+    """
+    Події в памʼяті процесу: один процес (runserver, uvicorn без воркерів) і тести.
+    id — наскрізний лічильник, що стартує з мітки часу в мс.
+    """
+
+    def __init__(self, backlog=None):
+        self.backlog = backlog or settings.EVENTS_BACKLOG
+        self._cond = threading.Condition()
+        self._start = self._last = int(time.time() * 1000)
+        self._streams = {}
+        # user_id -> id останньої події, що випала з backlog
+        self._dropped = {}
+        # user_id -> {(loop, asyncio.Event)} — async-потоки, що чекають
+        self._waiters = {}
+
+    def parse_id(self, value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def publish(self, user_id, event_type, data):
+        return self.publish_many(user_id, [(event_type, data)])
+
+    def publish_many(self, user_id, events):
+        with self._cond:
+            stream = self._streams.setdefault(user_id, deque(maxlen=self.backlog))
+            for event_type, data in events:
+                self._last += 1
+                if len(stream) == stream.maxlen:
+                    self._dropped[user_id] = stream[0].id
+                stream.append(Event(self._last, event_type, data))
+            self._cond.notify_all()
+            waiters = list(self._waiters.get(user_id, ()))
+        for loop, ready in waiters:
+            loop.call_soon_threadsafe(ready.set)
+        return self._last
+
+    def head(self, user_id):
+        return self._last
+
+    def read(self, user_id, after):
+        """
+        (події після `after`, чи могли частину втратити)
+        """
+        with self._cond:
+            events = [e for e in self._streams.get(user_id, ()) if e.id > after]
+            # id з попереднього запуску процесу (до _start або після _last) —
+            # що було між ними, невідомо
+            missed = (
+                after < self._dropped.get(user_id, self._start) or after > self._last
+            )
+        return events, missed
+
+    async def ahead(self, user_id):
+        return self.head(user_id)
+
+    async def aread(self, user_id, after):
+        return self.read(user_id, after)
+
+    def _has_new(self, user_id, after):
+        stream = self._streams.get(user_id)
+        return bool(stream) and stream[-1].id > after
+
+    def wait(self, user_id, after, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: self._has_new(user_id, after), timeout)
+
+    async def await_new(self, user_id, after, timeout):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            if self._has_new(user_id, after):
+                return True
+            self._waiters.setdefault(user_id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._cond:
+                waiters = self._waiters.get(user_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[user_id]
+
+
+class RedisEventBackend:
+    """
+    Redis Streams: потік на користувача (XADD з MAXLEN), спільний для всіх
+    процесів; очікування — XREAD BLOCK
+    """
+
+    id_pattern = re.compile(r"^\d+-\d+$")
+    start_id = "0-0"
+    # потоки неактивних користувачів видаляються
+    stream_timeout = 24 * 60 * 60
+
+    def __init__(self, url=None, backlog=None):
+        if redis is None:
+            raise ImproperlyConfigured(
+                "EVENTS_BACKEND=redis requires: pip install redis"
+            )
+        self.url = url or settings.REDIS_URL
+        self.backlog = backlog or settings.EVENTS_BACKLOG
+        self.client = redis.Redis.from_url(self.url, decode_responses=True)
+        self._async_client = None
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = redis.asyncio.Redis.from_url(
+                self.url, decode_responses=True
+            )
+        return self._async_client
+
+    def _key(self, user_id):
+        return f"events:user:{user_id}"
+
+    def parse_id(self, value):
+        if value and self.id_pattern.match(value):
+            return value
+        return None
+
+    def publish(self, user_id, event_type, data):
+        return self.publish_many(user_id, [(event_type, data)])
+
+    def publish_many(self, user_id, events):
+        key = self._key(user_id)
+        with self.client.pipeline(transaction=False) as pipe:
+            for event_type, data in events:
+                pipe.xadd(
+                    key,
+                    {"type": event_type, "data": data},
+                    maxlen=self.backlog,
+                    approximate=True,
+                )
+            pipe.expire(key, self.stream_timeout)
+            *event_ids, _ = pipe.execute()
+        return event_ids[-1]
+
+    def _head(self, entries):
+        return entries[0][0] if entries else self.start_id
+
+    def head(self, user_id):
+        return self._head(self.client.xrevrange(self._key(user_id), count=1))
+
+    async def ahead(self, user_id):
+        return self._head(
+            await self.async_client.xrevrange(self._key(user_id), count=1)
+        )
+
+    def _events(self, entries, after):
+        # з `after` включно: якщо його вже обрізано (MAXLEN / TTL) — могли втратити
+        missed = False
+        if after != self.start_id:
+            if entries and entries[0][0] == after:
+                entries = entries[1:]
+            else:
+                missed = True
+        events = [
+            Event(event_id, fields["type"], fields["data"])
+            for event_id, fields in entries
+        ]
+        return events, missed
+
+    def read(self, user_id, after):
+        return self._events(self.client.xrange(self._key(user_id), min=after), after)
+
+    async def aread(self, user_id, after):
+        return self._events(
+            await self.async_client.xrange(self._key(user_id), min=after), after
+        )
+
+    def _xread_args(self, user_id, after, timeout):
+        # block=0 у Redis — чекати без кінця
+        return {self._key(user_id): after}, 1, max(1, int(timeout * 1000))
+
+    def wait(self, user_id, after, timeout):
+        return bool(self.client.xread(*self._xread_args(user_id, after, timeout)))
+
+    async def await_new(self, user_id, after, timeout):
+        return bool(
+            await self.async_client.xread(*self._xread_args(user_id, after, timeout))
+        )
+
+
+BACKENDS = {
+    "local": LocalEventBackend,
+    "redis": RedisEventBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[settings.EVENTS_BACKEND]()
+    return _backend
+
+
+# =========================
+# Публікація
+# =========================
+
+
+def publish(user_id, event_type, data):
+    return get_backend().publish(user_id, event_type, renderer.render(data).decode())
+
+
+def publish_many(user_id, events):
+    """
+    events — [(тип, дані)]: один виклик бекенду (для Redis — один pipeline)
+    """
+    return get_backend().publish_many(
+        user_id,
+        [(event_type, renderer.render(data).decode()) for event_type, data in events],
+    )
+
+
+_car_owners = {}
+
+
+def remember_car_owner(car):
+    if len(_car_owners) >= CAR_OWNERS_CACHE_SIZE:
+        _car_owners.clear()
+    _car_owners[car.pk] = car.owner_id
+
+
+def forget_car_owner(car_id):
+    _car_owners.pop(car_id, None)
+
+
+def car_owner(car_id):
+    if car_id not in _car_owners:
+        owner_id = (
+            Car.objects.filter(pk=car_id).values_list("owner_id", flat=True).first()
+        )
+        if owner_id is None:
+            return None
+        remember_car_owner(Car(pk=car_id, owner_id=owner_id))
+    return _car_owners[car_id]
+
+
+_pending = threading.local()
+
+
+@contextmanager
+def deferred_events():
+    """
+    Накопичує події сервісів (пакетні операції) і після commit публікує
+    їх одним викликом бекенду на власника. Використовувати всередині
+    transaction.atomic().
+    """
+    if getattr(_pending, "events", None) is not None:
+        yield
+        return
+
+    _pending.events = []
+    try:
+        yield
+        events = _pending.events
+    finally:
+        _pending.events = None
+    if events:
+        transaction.on_commit(partial(_publish_service_events, events), robust=True)
+
+
+def _publish_service_events(events):
+    # дані серіалізуються тут, після commit: відкат транзакції нічого не коштує
+    services = [data for _, _, data in events if isinstance(data, Service)]
+    serialized = iter(
+        ServiceWriteSerializer(services, many=True).data if services else ()
+    )
+    by_owner = {}
+    for car_id, event_type, data in events:
+        owner_id = car_owner(car_id)
+        if isinstance(data, Service):
+            data = next(serialized)
+        if owner_id is not None:
+            by_owner.setdefault(owner_id, []).append((event_type, data))
+    for owner_id, owner_events in by_owner.items():
+        publish_many(owner_id, owner_events)
+
+
+def service_event(event_type, service):
+    """
+    Подія про сервіс — після commit; дані й власника готуємо вже поза транзакцією
+    """
+    if Service.car.is_cached(service):
+        remember_car_owner(service.car)
+    if event_type == "service.deleted":
+        # після delete() у інстанса вже не буде pk
+        data = {"id": service.pk, "car": service.car_id}
+    else:
+        data = service
+    event = (service.car_id, event_type, data)
+    events = getattr(_pending, "events", None)
+    if events is not None:
+        events.append(event)
+    else:
+        transaction.on_commit(partial(_publish_service_events, [event]), robust=True)
+
+
+def car_event(event_type, car):
+    remember_car_owner(car)
+    if event_type == "car.deleted":
+        data = {"id": car.pk}
+    else:
+        data = {
+            "id": car.pk,
+            "mileage": car.mileage,
+            "updated_mileage_at": datetime_string(car.updated_mileage_at),
+        }
+    transaction.on_commit(partial(publish, car.owner_id, event_type, data), robust=True)
+
+
+# =========================
+# SSE-потік
+# =========================
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Щоб Accept: text/event-stream пройшов content negotiation;
+    помилки (401 тощо) віддаються однією подією error
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"event: error\ndata: " + renderer.render(data) + b"\n\n"
+
+
+def _frame(event):
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.data}\n\n".encode()
+
+
+START = f"retry: {RECONNECT_DELAY}\n\n".encode()
+PING = b": ping\n\n"
+
+
+def _stream_frames(events, missed, after, head):
+    """
+    (новий after, кадри для відправки)
+    """
+    if missed:
+        # частину подій втрачено — клієнт має перечитати дані повністю
+        return head, [f"id: {head}\nevent: reset\ndata: {{}}\n\n".encode()]
+    if events:
+        after = events[-1].id
+    return after, [_frame(event) for event in events]
+
+
+def _iter_events(user_id, last_event_id, duration):
+    backend = get_backend()
+    deadline = time.monotonic() + duration
+    after = backend.parse_id(last_event_id)
+    if after is None:
+        after = backend.head(user_id)
+    yield START
+    while True:
+        events, missed = backend.read(user_id, after)
+        head = backend.head(user_id) if missed else None
+        after, frames = _stream_frames(events, missed, after, head)
+        if frames:
+            yield b"".join(frames)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not backend.wait(user_id, after, min(settings.EVENTS_HEARTBEAT, remaining)):
+            yield PING
+
+
+async def _aiter_events(user_id, last_event_id, duration):
+    backend = get_backend()
+    deadline = time.monotonic() + duration
+    after = backend.parse_id(last_event_id)
+    if after is None:
+        after = await backend.ahead(user_id)
+    yield START
+    while True:
+        events, missed = await backend.aread(user_id, after)
+        head = await backend.ahead(user_id) if missed else None
+        after, frames = _stream_frames(events, missed, after, head)
+        if frames:
+            yield b"".join(frames)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not await backend.await_new(
+            user_id, after, min(settings.EVENTS_HEARTBEAT, remaining)
+        ):
+            yield PING
+
+
+def event_stream_response(request, user_id, token):
+    """
+    Потік подій до закінчення EVENTS_MAX_DURATION або терміну дії токена
+    (браузер перепідключається з Last-Event-ID). Під ASGI — асинхронний
+    ітератор: очікування подій не займає потік.
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    duration = settings.EVENTS_MAX_DURATION
+    if token is not None and "exp" in token:
+        duration = max(0, min(duration, token["exp"] - time.time()))
+
+    if isinstance(request, ASGIRequest):
+        content = _aiter_events(user_id, last_event_id, duration)
+    else:
+        content = _iter_events(user_id, last_event_id, duration)
+
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
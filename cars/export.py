@@ -0,0 +1,133 @@
+import csv
+import io
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .fastpath import SERVICE_VALUES, FastJSONRenderer, service_row
+
+EXPORT_CHUNK_SIZE = 2000
+# скільки байтів накопичувати перед відправкою шматка відповіді
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+CSV_COLUMNS = (
+    "id",
+    "car",
+    "brand",
+    "model",
+    "work_description",
+    "hours",
+    "scheduled_date",
+    "status",
+    "created_at",
+)
+
+
+class NDJSONFormatter:
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self):
+        self.renderer = FastJSONRenderer()
+
+    def header(self):
+        return b""
+
+    def line(self, row):
+        return self.renderer.render(service_row(row)) + b"\n"
+
+
+class CSVFormatter:
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _encode(self, values):
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(values)
+        return self.buffer.getvalue().encode()
+
+    def header(self):
+        # BOM — щоб Excel відкривав UTF-8 без питань
+        return b"\xef\xbb\xbf" + self._encode(CSV_COLUMNS)
+
+    @staticmethod
+    def _cell(value):
+        # захист від формул у табличних редакторах
+        if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+            return "'" + value
+        return value
+
+    def line(self, row):
+        data = service_row(row)
+        return self._encode(
+            (
+                data["id"],
+                data["car"],
+                self._cell(data["car_info"]["brand"]),
+                self._cell(data["car_info"]["model"]),
+                self._cell(data["work_description"]),
+                data["hours"],
+                data["scheduled_date"],
+                data["status"],
+                data["created_at"],
+            )
+        )
+
+
+FORMATTERS = {
+    "ndjson": NDJSONFormatter,
+    "csv": CSVFormatter,
+}
+
+
+def _iter_export(rows, formatter):
+    chunk = [formatter.header()]
+    size = len(chunk[0])
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        line = formatter.line(row)
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+async def _aiter_export(rows, formatter):
+    chunk = [formatter.header()]
+    size = len(chunk[0])
+    async for row in rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE):
+        line = formatter.line(row)
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+def export_services_response(request, queryset, fmt):
+    """
+    Потокова відповідь з усіма сервісами queryset (server-side cursor, памʼять стала).
+    Під ASGI — асинхронний ітератор: синхронний Django зібрав би все у памʼять.
+    """
+    formatter = FORMATTERS[fmt]()
+    rows = queryset.values(*SERVICE_VALUES)
+    if isinstance(request, ASGIRequest):
+        content = _aiter_export(rows, formatter)
+    else:
+        content = _iter_export(rows, formatter)
+
+    response = StreamingHttpResponse(content, content_type=formatter.content_type)
+    filename = f"services-{timezone.localdate():%Y%m%d}.{formatter.extension}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Accel-Buffering"] = "no"
+    return response
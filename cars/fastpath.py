@@ -0,0 +1,178 @@
+"""
+Швидкий шлях для list: рядки з .values() замість ModelSerializer
+і рендер через orjson (requirements.txt; без нього — стандартний json).
+Вихід байт-у-байт такий самий, як у CarReadSerializer /
+ServiceReadSerializer + JSONRenderer.
+"""
+
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+try:
+    import orjson
+except ImportError:  # у requirements.txt; без нього — лише повільніше
+    orjson = None
+
+
+# =========================
+# Рендер
+# =========================
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson; без orjson або з indent — звичайний JSONRenderer
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # як і JSONRenderer: U+2028 / U+2029 завжди екрануються
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+# =========================
+# Перетворення значень (як у полях DRF)
+# =========================
+
+
+def decimal_string(value, places):
+    if value is None:
+        return None
+    return "{:f}".format(value.quantize(Decimal(".1") ** places))
+
+
+def date_string(value):
+    return None if value is None else value.isoformat()
+
+
+def datetime_string(value):
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+# =========================
+# Рядки
+# =========================
+
+SERVICE_VALUES = (
+    "id",
+    "car_id",
+    "car__car_brand__title",
+    "car__car_model__title",
+    "work_description",
+    "hours",
+    "scheduled_date",
+    "status",
+    "created_at",
+)
+
+
+def service_row(row):
+    """ServiceReadSerializer"""
+    return {
+        "id": row["id"],
+        "car_info": {
+            "id": row["car_id"],
+            "brand": row["car__car_brand__title"],
+            "model": row["car__car_model__title"],
+        },
+        "work_description": row["work_description"],
+        "hours": decimal_string(row["hours"], 1),
+        "scheduled_date": date_string(row["scheduled_date"]),
+        "status": row["status"],
+        "created_at": datetime_string(row["created_at"]),
+        "car": row["car_id"],
+    }
+
+
+CAR_VALUES = (
+    "id",
+    "car_brand__title",
+    "car_model__title",
+    "car_brand__logo_filename",
+    "initial_mileage",
+    "mileage",
+    "updated_mileage_at",
+    "summary__car_id",
+    "summary__pending_count",
+    "summary__in_progress_count",
+    "summary__completed_count",
+    "summary__total_hours",
+    "summary__next_scheduled_date",
+)
+
+
+def car_row(row):
+    """CarReadSerializer"""
+    summary = None
+    if row["summary__car_id"] is not None:
+        summary = {
+            "pending": row["summary__pending_count"],
+            "in_progress": row["summary__in_progress_count"],
+            "completed": row["summary__completed_count"],
+            "total_hours": decimal_string(row["summary__total_hours"], 1),
+            "next_scheduled_date": date_string(row["summary__next_scheduled_date"]),
+        }
+    return {
+        "id": row["id"],
+        "brand": row["car_brand__title"],
+        "model": row["car_model__title"],
+        "logo": row["car_brand__logo_filename"],
+        "initial_mileage": row["initial_mileage"],
+        "mileage": row["mileage"],
+        "updated_mileage_at": datetime_string(row["updated_mileage_at"]),
+        "summary": summary,
+    }
+
+
+# =========================
+# ViewSet
+# =========================
+
+
+class FastListMixin:
+    """
+    list() з .values() + row builder замість серіалізатора.
+    Вмикається у viewset: fast_list = True, fast_list_values, fast_list_row.
+    """
+
+    fast_list = False
+    fast_list_values = ()
+    fast_list_row = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.fast_list and self.action == "list":
+            return [
+                FastJSONRenderer() if type(renderer) is JSONRenderer else renderer
+                for renderer in renderers
+            ]
+        return renderers
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*self.fast_list_values)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                [self.fast_list_row(row) for row in page]
+            )
+        return Response([self.fast_list_row(row) for row in rows])
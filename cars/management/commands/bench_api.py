@@ -0,0 +1,348 @@
+import json
+import math
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from autocheck_api.throttling import reset_throttles
+from cars.management.commands.seed_bench_data import BENCH_PASSWORD, BENCH_USERNAME
+
+# кроки сценарію — у порядку static/app.js
+STEPS = ("login", "catalog", "brands", "models", "cars", "services", "status")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, p):
+    """nearest-rank; values — відсортовані"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def results_of(data):
+    return data["results"] if isinstance(data, dict) else data or []
+
+
+# =========================
+# Транспорти
+# =========================
+
+
+class ClientTransport:
+    """
+    Django test Client у тому ж процесі: повний стек middleware + кількість SQL
+    """
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        body = json.dumps(data) if data is not None else ""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.generic(
+                method, path, body, content_type="application/json", headers=headers
+            )
+            content = response.getvalue()
+            elapsed = time.perf_counter() - started
+        return response.status_code, content, elapsed, len(queries)
+
+    def close(self):
+        connection.close()
+
+
+class HttpTransport:
+    """
+    Живий сервер (--url): латентність мережі включно, без кількості SQL
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, path, data=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=body, headers=headers, method=method
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            status, content = exc.code, exc.read()
+        return status, content, time.perf_counter() - started, None
+
+    def close(self):
+        pass
+
+
+# =========================
+# Сценарій
+# =========================
+
+
+class Session:
+    """
+    Віртуальний користувач: вхід, каталог, авто, сервіси, зміна статусу
+    """
+
+    def __init__(self, transport, username, rng, samples):
+        self.transport = transport
+        self.username = username
+        self.rng = rng
+        self.samples = samples
+        self.token = None
+
+    def call(self, step, method, path, data=None):
+        status, content, elapsed, queries = self.transport.request(
+            method, path, data, self.token
+        )
+        self.samples[step].append((elapsed, queries, status >= 400))
+        if status >= 400:
+            return None
+        return json.loads(content) if content else None
+
+    def login(self):
+        data = self.call(
+            "login",
+            "POST",
+            "/api/auth/signin/",
+            {"username": self.username, "password": BENCH_PASSWORD},
+        )
+        self.token = data["access"] if data else None
+        return self.token is not None
+
+    def run(self):
+        self.call("catalog", "GET", "/api/catalog/")
+        brands = results_of(self.call("brands", "GET", "/api/brands/"))
+        if brands:
+            brand = self.rng.choice(brands)
+            self.call("models", "GET", f"/api/models/?brand={brand['id']}")
+
+        services = []
+        for car in results_of(self.call("cars", "GET", "/api/cars/")):
+            services += results_of(
+                self.call("services", "GET", f"/api/services/?car={car['id']}")
+            )
+        if services:
+            service = self.rng.choice(services)
+            status = self.rng.choice(
+                [
+                    s
+                    for s in ("pending", "in_progress", "completed")
+                    if s != service["status"]
+                ]
+            )
+            self.call(
+                "status", "PATCH", f"/api/services/{service['id']}/", {"status": status}
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        "Навантажувальний бенчмарк API за сценаріями static/app.js "
+        "(дані: seed_bench_data): p50/p95/p99, запити/с, SQL на запит; "
+        "--output зберігає результат, --compare порівнює з попереднім"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", help="Базовий URL живого сервера (інакше — in-process Client)"
+        )
+        parser.add_argument(
+            "--users", type=int, default=100, help="Скільки bench-user-N є"
+        )
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument(
+            "--iterations", type=int, default=20, help="Сценаріїв на потік"
+        )
+        parser.add_argument(
+            "--relogin", action="store_true", help="Вхід на кожній ітерації"
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Зберегти результат (JSON)")
+        parser.add_argument("--compare", help="Попередній результат (JSON)")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Регресія p95, %%, після якої команда завершується з помилкою",
+        )
+
+    def handle(self, *args, **options):
+        if options["url"]:
+            results = self.run(options)
+        else:
+            # ліміти з запасом: міряємо API, а не 429
+            rates = {
+                scope: "1000000000/s"
+                for scope in settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+            }
+            rest_framework = {
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": rates,
+            }
+            with override_settings(REST_FRAMEWORK=rest_framework):
+                reset_throttles()
+                results = self.run(options)
+
+        self.report(results)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"saved: {options['output']}")
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                self.compare(json.load(file), results, options["threshold"])
+
+    def make_transport(self, options):
+        if options["url"]:
+            return HttpTransport(options["url"])
+        return ClientTransport()
+
+    def worker(self, index, options, samples, errors):
+        rng = random.Random(options["seed"] * 1000 + index)
+        transport = self.make_transport(options)
+        try:
+            session = None
+            for _ in range(options["iterations"]):
+                if session is None or options["relogin"]:
+                    username = BENCH_USERNAME.format(rng.randrange(options["users"]))
+                    session = Session(transport, username, rng, samples)
+                    if not session.login():
+                        raise CommandError(
+                            f"Login failed for {username}: run seed_bench_data first"
+                        )
+                session.run()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            transport.close()
+
+    def run(self, options):
+        per_worker = [defaultdict(list) for _ in range(options["concurrency"])]
+        errors = []
+        threads = [
+            threading.Thread(target=self.worker, args=(index, options, samples, errors))
+            for index, samples in enumerate(per_worker)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+
+        steps = {}
+        total = 0
+        for step in STEPS:
+            samples = [sample for worker in per_worker for sample in worker[step]]
+            if not samples:
+                continue
+            total += len(samples)
+            latencies = sorted(elapsed for elapsed, _, _ in samples)
+            queries = [count for _, count, _ in samples if count is not None]
+            steps[step] = {
+                "count": len(samples),
+                "errors": sum(error for _, _, error in samples),
+                **{
+                    f"p{p}_ms": round(percentile(latencies, p) * 1000, 3)
+                    for p in PERCENTILES
+                },
+                "queries": round(sum(queries) / len(queries), 2) if queries else None,
+            }
+
+        return {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "commit": self.git_commit(),
+                "target": options["url"] or "in-process",
+                "database": None if options["url"] else connection.vendor,
+                "concurrency": options["concurrency"],
+                "iterations": options["iterations"],
+            },
+            "duration_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 1),
+            "steps": steps,
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except OSError:
+            return None
+
+    def report(self, results):
+        meta = results["meta"]
+        self.stdout.write(
+            f"target: {meta['target']}, database: {meta['database'] or '-'}, "
+            f"concurrency: {meta['concurrency']}, commit: {meta['commit'] or '-'}"
+        )
+        self.stdout.write(
+            f"{'step':>9} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'queries':>8}"
+        )
+        for step, row in results["steps"].items():
+            queries = "-" if row["queries"] is None else f"{row['queries']:.1f}"
+            self.stdout.write(
+                f"{step:>9} {row['count']:>7} {row['errors']:>7} {row['p50_ms']:>9.2f} "
+                f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {queries:>8}"
+            )
+        self.stdout.write(
+            f"{results['requests']} requests in {results['duration_s']:.1f} s: "
+            f"{results['throughput_rps']:.1f} requests/s"
+        )
+
+    def compare(self, before, after, threshold):
+        def change(old, new):
+            return (new - old) / old * 100 if old else 0.0
+
+        self.stdout.write(
+            f"compare with {before['meta']['commit'] or '-'} "
+            f"({before['meta']['timestamp']}):"
+        )
+        self.stdout.write(
+            f"{'step':>9} {'p95 before':>11} {'p95 after':>10} {'change':>8}"
+        )
+        regressions = []
+        for step, row in after["steps"].items():
+            old = before["steps"].get(step)
+            if old is None:
+                continue
+            delta = change(old["p95_ms"], row["p95_ms"])
+            self.stdout.write(
+                f"{step:>9} {old['p95_ms']:>11.2f} {row['p95_ms']:>10.2f} {delta:>+7.1f}%"
+            )
+            if delta > threshold:
+                regressions.append(step)
+        self.stdout.write(
+            f"throughput: {before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f} "
+            f"requests/s ({change(before['throughput_rps'], after['throughput_rps']):+.1f}%)"
+        )
+        if regressions:
+            raise CommandError(
+                f"p95 regression over {threshold:g}%: {', '.join(regressions)}"
+            )
@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from autocheck_api.throttling import get_store
+
+# (назва, метод, авторизований)
+PROFILES = [
+    ("anon read", "get", False),
+    ("user read", "get", True),
+    ("user write", "post", True),
+]
+
+
+class BenchUser:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+class Command(BaseCommand):
+    help = (
+        "Скільки мікросекунд додає throttling (check_throttles) на запит: "
+        "анонімне читання, читання і запис користувача; --threads — під конкуренцією"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20_000)
+        parser.add_argument("--threads", type=int, default=1)
+        parser.add_argument("--users", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # ліміти з запасом: міряємо вартість перевірки, а не 429
+        rates = {
+            scope: "1000000000/s"
+            for scope in settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+        }
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+        store = type(get_store()).__name__
+        self.stdout.write(
+            f"store: {store}, requests: {options['requests']}, "
+            f"threads: {options['threads']}, users: {options['users']}"
+        )
+        self.stdout.write(f"{'profile':>12} {'us/request':>11} {'requests/s':>12}")
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for name, method, authenticated in PROFILES:
+                requests = self.make_requests(method, authenticated, options["users"])
+                per_request, throughput = self.measure(
+                    requests, options["requests"], options["threads"]
+                )
+                self.stdout.write(
+                    f"{name:>12} {per_request * 1e6:>11.1f} {throughput:>12.0f}"
+                )
+
+    def make_requests(self, method, authenticated, users):
+        factory = APIRequestFactory()
+        requests = []
+        for i in range(users):
+            request = Request(
+                getattr(factory, method)("/api/brands/", REMOTE_ADDR=f"10.0.{i}.1")
+            )
+            request.user = BenchUser(i) if authenticated else AnonymousUser()
+            requests.append(request)
+        return requests
+
+    def measure(self, requests, total, threads):
+        view = APIView()
+        per_thread = total // threads
+
+        def run(offset):
+            started = time.perf_counter()
+            for i in range(per_thread):
+                view.check_throttles(requests[(offset + i) % len(requests)])
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            durations = list(pool.map(run, range(threads)))
+        elapsed = time.perf_counter() - started
+        return sum(durations) / (per_thread * threads), per_thread * threads / elapsed
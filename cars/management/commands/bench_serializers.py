@@ -0,0 +1,102 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from cars.fastpath import SERVICE_VALUES, FastJSONRenderer, orjson, service_row
+from cars.models import Brand, CarModel, Car, Service
+from cars.serializers import ServiceReadSerializer
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Порівняти list через ServiceReadSerializer + JSONRenderer "
+        "і fast path (.values() + FastJSONRenderer). Дані створюються і відкочуються."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[20, 100, 1000],
+            help="Розміри сторінок",
+        )
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                queryset = self.make_data(max(options["sizes"]))
+                self.run(queryset, options["sizes"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def make_data(self, count):
+        user = User.objects.create_user("bench-serializers", password=None)
+        brand = Brand.objects.create(title="Bench")
+        model = CarModel.objects.create(car_brand=brand, title="Bench")
+        car = Car.objects.create(
+            owner=user,
+            car_brand=brand,
+            car_model=model,
+            initial_mileage=0,
+            mileage=0,
+        )
+        Service.objects.bulk_create(
+            Service(
+                car=car,
+                work_description=f"Service #{i}",
+                hours="1.5",
+                scheduled_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+            )
+            for i in range(count)
+        )
+        return Service.objects.filter(car=car)
+
+    def measure(self, func, repeat):
+        func()  # warm-up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat
+
+    def run(self, queryset, sizes, repeat):
+        serializer_qs = queryset.select_related(
+            "car", "car__car_brand", "car__car_model"
+        ).only(*ServiceReadSerializer.Meta.only_fields)
+        renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(f"orjson: {'yes' if orjson else 'no (stdlib json)'}")
+        self.stdout.write(
+            f"{'rows':>6} {'serializer ms':>14} {'fast ms':>9} {'rows/s ser':>11} "
+            f"{'rows/s fast':>12} {'speedup':>8}"
+        )
+        for size in sizes:
+            slow = self.measure(
+                lambda: renderer.render(
+                    ServiceReadSerializer(serializer_qs[:size], many=True).data
+                ),
+                repeat,
+            )
+            fast = self.measure(
+                lambda: fast_renderer.render(
+                    [
+                        service_row(row)
+                        for row in queryset.values(*SERVICE_VALUES)[:size]
+                    ]
+                ),
+                repeat,
+            )
+            self.stdout.write(
+                f"{size:>6} {slow * 1000:>14.2f} {fast * 1000:>9.2f} "
+                f"{size / slow:>11.0f} {size / fast:>12.0f} {slow / fast:>7.1f}x"
+            )
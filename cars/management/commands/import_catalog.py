@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cars.catalog_import import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    CatalogImportError,
+    detect_format,
+    import_catalog,
+)
+
+
+class Command(BaseCommand):
+    help = "Імпортувати бренди та моделі з CSV (brand,model,logo_filename) або NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Шлях до файлу або '-' для stdin")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, dest="fmt")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            fmt = detect_format(None if path == "-" else path, options["fmt"])
+            if path == "-":
+                report = import_catalog(sys.stdin.buffer, fmt, options["batch_size"])
+            else:
+                with open(path, "rb") as binary:
+                    report = import_catalog(binary, fmt, options["batch_size"])
+        except (CatalogImportError, OSError) as exc:
+            raise CommandError(exc)
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Brands: {inserted} inserted, {updated} updated, {skipped} skipped".format(
+                    **report.brands
+                )
+            )
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Models: {inserted} inserted, {skipped} skipped".format(**report.models)
+            )
+        )
+        if report.invalid:
+            self.stdout.write(self.style.WARNING(f"Invalid rows: {report.invalid}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from cars.summary import REBUILD_BATCH_SIZE, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Перерахувати зведення по сервісах авто (CarSummary)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--car", type=int, action="append", dest="cars", help="ID авто"
+        )
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_summaries(options["cars"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} car summaries"))
@@ -0,0 +1,121 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from cars.models import Brand, CarModel, Car, Service
+from cars.summary import rebuild_summaries
+from users.models import User
+
+BENCH_USERNAME = "bench-user-{}"
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 10_000
+WORKS = [
+    "Заміна масла",
+    "Заміна фільтрів",
+    "Діагностика",
+    "Заміна гальмівних колодок",
+    "Шиномонтаж",
+    "Розвал-сходження",
+    "Заміна ременя ГРМ",
+    "Заміна свічок",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Синтетичні дані для bench_api: користувачі bench-user-N "
+        f"(пароль {BENCH_PASSWORD}), бренди, моделі, авто і сервіси (bulk)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--cars", type=int, default=3, help="Авто на користувача")
+        parser.add_argument(
+            "--services", type=int, default=100_000, help="Сервісів усього"
+        )
+        parser.add_argument("--brands", type=int, default=50)
+        parser.add_argument("--models", type=int, default=10, help="Моделей на бренд")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username=BENCH_USERNAME.format(0)).exists():
+            raise CommandError("Bench data already exists: use a fresh database")
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            models = self.make_catalog(options["brands"], options["models"])
+            users = self.make_users(options["users"])
+            cars = self.make_cars(rng, users, models, options["cars"])
+        self.make_services(rng, cars, options["services"])
+        rebuild_summaries()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(users)} users, {len(cars)} cars, "
+                f"{options['services']} services in {time.perf_counter() - started:.1f} s"
+            )
+        )
+
+    def make_catalog(self, brands, models_per_brand):
+        brands = Brand.objects.bulk_create(
+            Brand(title=f"Bench brand {i}") for i in range(brands)
+        )
+        return CarModel.objects.bulk_create(
+            CarModel(car_brand=brand, title=f"Model {i}")
+            for brand in brands
+            for i in range(models_per_brand)
+        )
+
+    def make_users(self, count):
+        # один хеш на всіх: вартість хешування — у сценарії login, не в сидері
+        password = make_password(BENCH_PASSWORD)
+        return User.objects.bulk_create(
+            (
+                User(
+                    username=BENCH_USERNAME.format(i),
+                    email=f"{BENCH_USERNAME.format(i)}@example.com",
+                    password=password,
+                )
+                for i in range(count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+    def make_cars(self, rng, users, models, per_user):
+        cars = []
+        for user in users:
+            for _ in range(per_user):
+                model = rng.choice(models)
+                mileage = rng.randint(0, 300_000)
+                cars.append(
+                    Car(
+                        owner=user,
+                        car_brand_id=model.car_brand_id,
+                        car_model=model,
+                        initial_mileage=mileage,
+                        mileage=mileage + rng.randint(0, 50_000),
+                    )
+                )
+        return Car.objects.bulk_create(cars, batch_size=BATCH_SIZE)
+
+    def make_services(self, rng, cars, total):
+        start = datetime.date(2020, 1, 1)
+        statuses = Service.Status.values
+        for offset in range(0, total, BATCH_SIZE):
+            Service.objects.bulk_create(
+                Service(
+                    car=rng.choice(cars),
+                    work_description=rng.choice(WORKS),
+                    hours=f"{rng.randint(1, 80) / 10:.1f}",
+                    scheduled_date=start
+                    + datetime.timedelta(days=rng.randint(0, 2000)),
+                    status=rng.choice(statuses),
+                )
+                for _ in range(min(BATCH_SIZE, total - offset))
+            )
+            self.stdout.write(f"services: {min(offset + BATCH_SIZE, total)}/{total}")
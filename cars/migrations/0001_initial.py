@@ -0,0 +1,149 @@
+# Generated by Django 5.2 on 2026-10-18 10:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Brand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=100)),
+                ("logo_filename", models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                "verbose_name": "Brand",
+                "verbose_name_plural": "Brands",
+            },
+        ),
+        migrations.CreateModel(
+            name="CarModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=100)),
+                (
+                    "car_brand",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="models",
+                        to="cars.brand",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Car model",
+                "verbose_name_plural": "Car models",
+                "unique_together": {("car_brand", "title")},
+            },
+        ),
+        migrations.CreateModel(
+            name="Car",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("initial_mileage", models.PositiveIntegerField()),
+                ("mileage", models.PositiveIntegerField()),
+                ("updated_mileage_at", models.DateTimeField(auto_now=True)),
+                (
+                    "car_brand",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT, to="cars.brand"
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cars",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "car_model",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT, to="cars.carmodel"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Car",
+                "verbose_name_plural": "Cars",
+            },
+        ),
+        migrations.CreateModel(
+            name="Service",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("work_description", models.CharField(max_length=255)),
+                ("hours", models.DecimalField(decimal_places=1, max_digits=4)),
+                ("scheduled_date", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Очікує"),
+                            ("in_progress", "В роботі"),
+                            ("completed", "Виконано"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "car",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="services",
+                        to="cars.car",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Service",
+                "verbose_name_plural": "Services",
+                "ordering": ("-scheduled_date",),
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 10:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cars", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="service",
+            options={
+                "ordering": ("-scheduled_date", "-id"),
+                "verbose_name": "Service",
+                "verbose_name_plural": "Services",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="car",
+            index=models.Index(fields=["owner", "id"], name="car_owner_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["-scheduled_date", "-id"], name="service_sched_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["car", "-scheduled_date", "-id"],
+                name="service_car_sched_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cars", "0002_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(fields=["car", "status"], name="service_car_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                condition=models.Q(("status", "completed"), _negated=True),
+                fields=["car", "scheduled_date"],
+                name="service_open_car_sched_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+
+def populate_summaries(apps, schema_editor):
+    Car = apps.get_model("cars", "Car")
+    CarSummary = apps.get_model("cars", "CarSummary")
+    Service = apps.get_model("cars", "Service")
+
+    rows = (
+        Service.objects.order_by()
+        .values("car_id")
+        .annotate(
+            pending_count=Count("id", filter=Q(status="pending")),
+            in_progress_count=Count("id", filter=Q(status="in_progress")),
+            completed_count=Count("id", filter=Q(status="completed")),
+            total_hours=Sum("hours"),
+            next_scheduled_date=Min("scheduled_date", filter=~Q(status="completed")),
+        )
+    )
+    by_car = {row.pop("car_id"): row for row in rows.iterator()}
+    CarSummary.objects.bulk_create(
+        (
+            CarSummary(car_id=car_id, **by_car.get(car_id, {}))
+            for car_id in Car.objects.values_list("id", flat=True).iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cars", "0003_service_status_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CarSummary",
+            fields=[
+                (
+                    "car",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="cars.car",
+                    ),
+                ),
+                ("pending_count", models.PositiveIntegerField(default=0)),
+                ("in_progress_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_hours",
+                    models.DecimalField(decimal_places=1, default=0, max_digits=12),
+                ),
+                ("next_scheduled_date", models.DateField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Car summary",
+                "verbose_name_plural": "Car summaries",
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
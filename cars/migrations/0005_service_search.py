@@ -0,0 +1,102 @@
+from django.db import DatabaseError, migrations, transaction
+
+# cars.search: SEARCH_CONFIG і FTS_TABLE
+SEARCH_CONFIG = "simple"
+FTS_TABLE = "cars_service_fts"
+
+SQLITE_FTS = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        work_description,
+        content='cars_service',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # тригери, а не сигнали: bulk_create і queryset.update() теж індексуються.
+    # Перебудова cars_service на SQLite (AlterField) видаляє тригери —
+    # таку міграцію треба доповнити повторним створенням
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON cars_service BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, work_description)
+        VALUES (new.id, new.work_description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON cars_service BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, work_description)
+        VALUES ('delete', old.id, old.work_description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF work_description ON cars_service
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, work_description)
+        VALUES ('delete', old.id, old.work_description);
+        INSERT INTO {FTS_TABLE}(rowid, work_description)
+        VALUES (new.id, new.work_description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def postgresql_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        GinIndex(
+            SearchVector("work_description", config=SEARCH_CONFIG),
+            name="service_search_idx",
+        ),
+        GinIndex(
+            OpClass("work_description", name="gin_trgm_ops"),
+            name="service_trgm_idx",
+        ),
+    )
+
+
+def create_search(apps, schema_editor):
+    connection = schema_editor.connection
+    Service = apps.get_model("cars", "Service")
+    if connection.vendor == "postgresql":
+        search_index, trigram_index = postgresql_indexes()
+        schema_editor.add_index(Service, search_index)
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError:
+            # без прав на розширення — пошук без виправлення опечаток
+            return
+        schema_editor.add_index(Service, trigram_index)
+    elif connection.vendor == "sqlite":
+        try:
+            with transaction.atomic(using=connection.alias):
+                for sql in SQLITE_FTS:
+                    schema_editor.execute(sql)
+        except DatabaseError:
+            # SQLite без FTS5 — пошук через icontains
+            pass
+
+
+def drop_search(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        for index in postgresql_indexes():
+            schema_editor.execute(f"DROP INDEX IF EXISTS {index.name}")
+    elif connection.vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cars", "0004_car_summary"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search, drop_search),
+    ]
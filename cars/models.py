@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 
 class Brand(models.Model):
@@ -40,9 +41,19 @@ class Car(models.Model):
     mileage = models.PositiveIntegerField()
     updated_mileage_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # стан з БД — подія про пробіг лише при реальній зміні
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     class Meta:
         verbose_name = "Car"
         verbose_name_plural = "Cars"
+        indexes = [
+            models.Index(fields=("owner", "id"), name="car_owner_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.car_brand} {self.car_model} ({self.owner})"
@@ -64,10 +75,57 @@ class Service(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # стан з БД — щоб зведення по авто оновлювалось дельтою без зайвого запиту
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     class Meta:
         verbose_name = "Service"
         verbose_name_plural = "Services"
-        ordering = ("-scheduled_date",)
+        ordering = ("-scheduled_date", "-id")
+        indexes = [
+            # keyset-пагінація: ORDER BY scheduled_date DESC, id DESC
+            models.Index(
+                fields=("-scheduled_date", "-id"), name="service_sched_id_idx"
+            ),
+            models.Index(
+                fields=("car", "-scheduled_date", "-id"),
+                name="service_car_sched_id_idx",
+            ),
+            models.Index(fields=("car", "status"), name="service_car_status_idx"),
+            # лише незавершені роботи — найближчі заплановані по авто
+            models.Index(
+                fields=("car", "scheduled_date"),
+                condition=~Q(status="completed"),
+                name="service_open_car_sched_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.work_description} ({self.car})"
+
+
+class CarSummary(models.Model):
+    """
+    Зведення по сервісах авто, оновлюється інкрементально (див. cars/summary.py)
+    """
+
+    car = models.OneToOneField(
+        Car, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    pending_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    total_hours = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    # найближча дата серед незавершених робіт
+    next_scheduled_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Car summary"
+        verbose_name_plural = "Car summaries"
+
+    def __str__(self):
+        return f"Summary ({self.car_id})"
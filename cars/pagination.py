@@ -0,0 +1,159 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset-пагінація: сторінка = WHERE (поля сортування) "після" курсора + LIMIT.
+    Без COUNT(*) і OFFSET, тому глибокі сторінки коштують як перша.
+    Останнє поле в `ordering` має бути унікальним (tiebreaker).
+    """
+
+    ordering = ("-id",)
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+        ordering = self.get_effective_ordering(reverse)
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            try:
+                queryset = queryset.filter(self.get_seek_filter(ordering, cursor["v"]))
+            except (ValidationError, ValueError, TypeError):
+                # значення не того типу для поля ("bad" замість дати)
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_effective_ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    def get_seek_filter(self, ordering, values):
+        # (a, b, c) "після" (x, y, z) = a>x | a=x & b>y | a=x & b=y & c>z
+        seek = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            seek |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return seek
+
+    def get_position(self, instance):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            # fast path віддає рядки .values()
+            value = (
+                instance[name]
+                if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # {"r": 0|1, "v": [рядок або число на кожне поле ordering]}
+        if (
+            not isinstance(cursor, dict)
+            or cursor.get("r") not in (0, 1)
+            or not isinstance(cursor.get("v"), list)
+            or len(cursor["v"]) != len(self.ordering)
+            or not all(
+                isinstance(value, (str, int)) and not isinstance(value, bool)
+                for value in cursor["v"]
+            )
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, instance, reverse):
+        cursor = {"r": int(reverse), "v": self.get_position(instance)}
+        encoded = urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode()
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class ServiceKeysetPagination(KeysetPagination):
+    ordering = ("-scheduled_date", "-id")
+
+
+class CarKeysetPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class SelectablePaginationMixin:
+    """
+    Page-number пагінація за замовчуванням, keyset — за `?pagination=cursor`
+    (або коли в запиті вже є `cursor`)
+    """
+
+    cursor_pagination_class = None
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return self.cursor_pagination_class is not None and (
+            params.get("pagination") == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from autocheck_api.db_router import is_pinned, use_replica
+
+from .versions import get_versions, table_version_name
+
+
+class ReplicaReadMixin:
+    """
+    Безпечні запити `replica_actions` (None — усі) читаються з репліки.
+    Приватні view — якщо користувач нічого не писав останні
+    DATABASE_REPLICA_MAX_LAG секунд; публічні (conditional_public) — якщо
+    за цей час не змінювались conditional_tables, інакше новий ETag
+    отримав би застарілі дані.
+    """
+
+    replica_actions = ("list",)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.replica_allowed(request):
+            use_replica()
+
+    def replica_allowed(self, request):
+        if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+            return False
+        if self.replica_actions is not None and self.action not in self.replica_actions:
+            return False
+        if self.conditional_public:
+            versions = get_versions(
+                [table_version_name(model) for model in self.conditional_tables]
+            )
+            changed_at = max((changed for _, changed in versions.values()), default=0)
+            return time.time() - changed_at > settings.DATABASE_REPLICA_MAX_LAG
+        return not is_pinned(request.user.pk)
@@ -0,0 +1,232 @@
+"""
+Пошук. Каталог — префіксний індекс у памʼяті процесу (будується зі знімка
+каталогу, перебудовується зі зміною його версії). Сервіси — повнотекстовий
+пошук по work_description: PostgreSQL tsvector (GIN-індекс; без збігів —
+pg_trgm, якщо встановлений), SQLite FTS5 (таблиця cars_service_fts,
+синхронізується тригерами), інакше icontains.
+"""
+
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+
+from django.db import connections
+from django.db.models import Case, IntegerField, When
+from django.db.models.expressions import RawSQL
+
+from .catalog import get_catalog_snapshot
+from .models import Service
+
+WORD_RE = re.compile(r"\w+")
+# слів у запиті — решта відкидається
+MAX_TERMS = 8
+# конфігурація PostgreSQL без стемінгу: опис робіт і українською, і англійською
+SEARCH_CONFIG = "simple"
+TRIGRAM_THRESHOLD = 0.4
+FTS_TABLE = "cars_service_fts"
+
+
+def normalize(text):
+    """Mercedes-Benz -> mercedes benz"""
+    return " ".join(WORD_RE.findall(unicodedata.normalize("NFKC", text).casefold()))
+
+
+def search_terms(query):
+    return normalize(query or "").split()[:MAX_TERMS]
+
+
+# =========================
+# Каталог: префіксний індекс
+# =========================
+
+
+class PrefixIndex:
+    """
+    Відсортовані суфікси назв від початку кожного слова; пошук — bisect.
+    Вище — збіг з початку назви, далі коротші назви, далі порядок items.
+    """
+
+    def __init__(self, items, text):
+        self.items = list(items)
+        keys = []
+        for position, item in enumerate(self.items):
+            normalized = normalize(text(item))
+            for match in re.finditer(r"\S+", normalized):
+                keys.append(
+                    (
+                        normalized[match.start() :],
+                        match.start() > 0,
+                        len(normalized),
+                        position,
+                    )
+                )
+        keys.sort()
+        self.keys = keys
+        self.words = [key[0] for key in keys]
+
+    def search(self, query, limit=None):
+        query = normalize(query or "")
+        if not query:
+            return []
+        ranks = {}
+        for key, inner, length, position in self.keys[bisect_left(self.words, query) :]:
+            if not key.startswith(query):
+                break
+            rank = (inner, length, position)
+            if position not in ranks or rank < ranks[position]:
+                ranks[position] = rank
+        return [self.items[p] for p in sorted(ranks, key=ranks.get)[:limit]]
+
+
+class CatalogIndex:
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.etag = f'"catalog-search-{snapshot.version}"'
+        brands = json.loads(snapshot.content)["brands"]
+        self.brands = PrefixIndex(
+            (
+                {key: brand[key] for key in ("id", "title", "logo_filename")}
+                for brand in brands
+            ),
+            lambda brand: brand["title"],
+        )
+        # "BMW X5": і за моделлю, і за брендом
+        self.models = PrefixIndex(
+            (
+                {
+                    "id": model["id"],
+                    "title": model["title"],
+                    "car_brand": brand["id"],
+                    "brand": brand["title"],
+                }
+                for brand in brands
+                for model in brand["models"]
+            ),
+            lambda model: f"{model['brand']} {model['title']}",
+        )
+
+    def search_models(self, query, brand_id=None, limit=None):
+        models = self.models.search(query)
+        if brand_id is not None:
+            models = [model for model in models if model["car_brand"] == brand_id]
+        return models[:limit]
+
+
+_catalog_index = None
+
+
+def get_catalog_index():
+    """Без запитів до БД, поки знімок каталогу в памʼяті"""
+    global _catalog_index
+    snapshot = get_catalog_snapshot()
+    index = _catalog_index
+    if index is None or index.version != snapshot.version:
+        index = _catalog_index = CatalogIndex(snapshot)
+    return index
+
+
+def order_by_ids(queryset, ids):
+    """filter(pk__in=ids) у порядку ids (результат індексу)"""
+    ranking = Case(
+        *(When(pk=pk, then=position) for position, pk in enumerate(ids)),
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ranking)
+
+
+# =========================
+# Сервіси: повнотекстовий пошук
+# =========================
+
+# alias -> чи є FTS5 / pg_trgm; перевіряється раз на процес
+_features = {}
+
+
+def _has_feature(connection, name, sql):
+    key = (connection.alias, name)
+    if key not in _features:
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            _features[key] = cursor.fetchone() is not None
+    return _features[key]
+
+
+def search_services(queryset, query):
+    """
+    Лише сервіси зі всіма словами запиту (за префіксом), найрелевантніші
+    першими; однакова релевантність — новіші першими
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        return _search_postgresql(queryset, terms, connection)
+    if connection.vendor == "sqlite" and _has_feature(
+        connection,
+        "fts5",
+        f"SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{FTS_TABLE}'",
+    ):
+        return _search_sqlite(queryset, terms, connection)
+    for term in terms:
+        queryset = queryset.filter(work_description__icontains=term)
+    return queryset
+
+
+def _search_postgresql(queryset, terms, connection):
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+        TrigramWordSimilarity,
+    )
+
+    # той самий вираз, що в індексі service_search_idx (міграція 0005)
+    vector = SearchVector("work_description", config=SEARCH_CONFIG)
+    tsquery = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+    # normalization=1: коротший опис з тими ж словами — вище, як у bm25 (SQLite)
+    rank = SearchRank(vector, tsquery, normalization=1)
+    matches = (
+        queryset.annotate(search_vector=vector, search_rank=rank)
+        .filter(search_vector=tsquery)
+        .order_by("-search_rank", "-scheduled_date", "-id")
+    )
+    if matches.exists() or not _has_feature(
+        connection, "pg_trgm", "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+    ):
+        return matches
+    # опечатки ("oil chnage"): схожість триграм
+    return (
+        queryset.annotate(
+            search_rank=TrigramWordSimilarity(" ".join(terms), "work_description")
+        )
+        .filter(search_rank__gte=TRIGRAM_THRESHOLD)
+        .order_by("-search_rank", "-scheduled_date", "-id")
+    )
+
+
+def _search_sqlite(queryset, terms, connection):
+    # кожне слово в лапках — без синтаксису FTS5 із запиту користувача
+    match = " ".join(f'"{term}"*' for term in terms)
+    table = connection.ops.quote_name(Service._meta.db_table)
+    return (
+        queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+        .annotate(
+            # bm25: менше — релевантніше
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                [match],
+            )
+        )
+        .order_by("-search_rank", "-scheduled_date", "-id")
+    )
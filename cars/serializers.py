@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Brand, CarModel, Car, Service
+from .models import Brand, CarModel, Car, CarSummary, Service
 
 
 class BrandSerializer(serializers.ModelSerializer):
@@ -26,10 +26,27 @@ class CarWriteSerializer(serializers.ModelSerializer):
         )
 
 
+class CarSummarySerializer(serializers.ModelSerializer):
+    pending = serializers.IntegerField(source="pending_count")
+    in_progress = serializers.IntegerField(source="in_progress_count")
+    completed = serializers.IntegerField(source="completed_count")
+
+    class Meta:
+        model = CarSummary
+        fields = (
+            "pending",
+            "in_progress",
+            "completed",
+            "total_hours",
+            "next_scheduled_date",
+        )
+
+
 class CarReadSerializer(serializers.ModelSerializer):
     brand = serializers.CharField(source="car_brand.title", read_only=True)
     model = serializers.CharField(source="car_model.title", read_only=True)
     logo = serializers.CharField(source="car_brand.logo_filename", read_only=True)
+    summary = CarSummarySerializer(read_only=True, allow_null=True)
 
     class Meta:
         model = Car
@@ -41,7 +58,32 @@ class CarReadSerializer(serializers.ModelSerializer):
             "initial_mileage",
             "mileage",
             "updated_mileage_at",
+            "summary",
         )
+        only_fields = (
+            "id",
+            "initial_mileage",
+            "mileage",
+            "updated_mileage_at",
+            "car_brand__title",
+            "car_brand__logo_filename",
+            "car_model__title",
+            "summary__pending_count",
+            "summary__in_progress_count",
+            "summary__completed_count",
+            "summary__total_hours",
+            "summary__next_scheduled_date",
+        )
+
+
+class DashboardSerializer(serializers.Serializer):
+    cars_count = serializers.IntegerField()
+    pending = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    total_hours = serializers.DecimalField(max_digits=14, decimal_places=1)
+    next_scheduled_date = serializers.DateField(allow_null=True)
+    cars = CarReadSerializer(many=True)
 
 
 class ServiceWriteSerializer(serializers.ModelSerializer):
@@ -62,11 +104,243 @@ class ServiceReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Service
-        fields = "__all__"
+        # порядок як у колишньому "__all__"
+        fields = (
+            "id",
+            "car_info",
+            "work_description",
+            "hours",
+            "scheduled_date",
+            "status",
+            "created_at",
+            "car",
+        )
+        # колонки, які рендерить серіалізатор (для .only() у queryset)
+        only_fields = (
+            "id",
+            "work_description",
+            "hours",
+            "scheduled_date",
+            "status",
+            "created_at",
+            "car",
+            "car__car_brand__title",
+            "car__car_model__title",
+        )
 
     def get_car_info(self, obj):
         return {
-            "id": obj.car.id,
+            "id": obj.car_id,
             "brand": obj.car.car_brand.title,
             "model": obj.car.car_model.title,
         }
+
+
+# =========================
+# Авто разом із сервісами: ?fields= і ?include=
+# =========================
+
+CAR_INCLUDES = ("brand", "model")
+
+
+def parse_sparse_fields(value, serializer_class, nested):
+    """
+    "id,mileage,services.status" -> {"": {...}, "services": {...}};
+    немає ключа — усі поля. Невідомі поля — ValidationError
+    """
+    if not value:
+        return {}
+    selected = {}
+    for name in filter(None, (part.strip() for part in value.split(","))):
+        prefix, _, field = name.rpartition(".")
+        selected.setdefault(prefix, set()).add(field)
+        if prefix:
+            # services.status без services — однаково потрібне вкладене поле
+            selected.setdefault("", set()).add(prefix)
+    known = {"": set(serializer_class.Meta.fields)}
+    for field_name, nested_class in nested.items():
+        known[field_name] = set(nested_class.Meta.fields)
+    unknown = sorted(
+        f"{prefix}.{field}" if prefix else field
+        for prefix, fields in selected.items()
+        for field in fields - known.get(prefix, set())
+    )
+    if unknown:
+        raise serializers.ValidationError({"fields": [f"Unknown fields: {unknown}"]})
+    return selected
+
+
+def parse_include(value):
+    include = {part.strip() for part in (value or "").split(",") if part.strip()}
+    unknown = sorted(include - set(CAR_INCLUDES))
+    if unknown:
+        raise serializers.ValidationError({"include": [f"Unknown include: {unknown}"]})
+    return include
+
+
+class SparseFieldsMixin:
+    """
+    Лише поля з context["fields"][sparse_fields_key] (немає ключа — усі)
+    """
+
+    sparse_fields_key = ""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get("fields", {}).get(self.sparse_fields_key)
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class CarServiceSerializer(SparseFieldsMixin, ServiceReadSerializer):
+    """Сервіс усередині авто: без car і car_info"""
+
+    sparse_fields_key = "services"
+
+    class Meta(ServiceReadSerializer.Meta):
+        fields = (
+            "id",
+            "work_description",
+            "hours",
+            "scheduled_date",
+            "status",
+            "created_at",
+        )
+        only_fields = fields + ("car",)
+
+
+class CarWithServicesSerializer(SparseFieldsMixin, CarReadSerializer):
+    services = CarServiceSerializer(many=True, read_only=True)
+
+    class Meta(CarReadSerializer.Meta):
+        fields = CarReadSerializer.Meta.fields + ("services",)
+        only_fields = CarReadSerializer.Meta.only_fields + ("car_model__car_brand",)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        include = self.context.get("include", ())
+        # ?include=brand,model: обʼєкт замість назви
+        if "brand" in include and "brand" in fields:
+            fields["brand"] = BrandSerializer(source="car_brand", read_only=True)
+        if "model" in include and "model" in fields:
+            fields["model"] = CarModelSerializer(source="car_model", read_only=True)
+        return fields
+
+
+# =========================
+# Async views: без запитів до БД під час валідації
+# =========================
+
+
+class PkField(serializers.IntegerField):
+    """
+    id повʼязаного обʼєкта з тими ж помилками типу, що й у PrimaryKeyRelatedField
+    """
+
+    default_error_messages = {
+        "incorrect_type": "Incorrect type. Expected pk value, received {data_type}.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return int(data)
+        except ValueError:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+def existing_pk(value, existing_ids):
+    # те саме повідомлення, що й у PrimaryKeyRelatedField
+    if value not in existing_ids:
+        raise serializers.ValidationError(
+            f'Invalid pk "{value}" - object does not exist.'
+        )
+    return value
+
+
+class AsyncCarModelSerializer(CarModelSerializer):
+    """
+    context["brand_ids"] — наявні бренди; unique_together перевіряє view
+    """
+
+    car_brand = PkField(source="car_brand_id")
+
+    class Meta(CarModelSerializer.Meta):
+        validators = []
+
+    def validate_car_brand(self, value):
+        return existing_pk(value, self.context["brand_ids"])
+
+
+class AsyncCarWriteSerializer(CarWriteSerializer):
+    """
+    context["brand_ids"], context["model_ids"] — наявні бренди й моделі
+    """
+
+    car_brand = PkField(source="car_brand_id")
+    car_model = PkField(source="car_model_id")
+
+    def validate_car_brand(self, value):
+        return existing_pk(value, self.context["brand_ids"])
+
+    def validate_car_model(self, value):
+        return existing_pk(value, self.context["model_ids"])
+
+
+class AsyncServiceWriteSerializer(ServiceWriteSerializer):
+    """
+    context["car_ids"] — наявні авто; власність перевіряє view
+    """
+
+    car = PkField(source="car_id")
+
+    def validate_car(self, value):
+        return existing_pk(value, self.context["car_ids"])
+
+
+# =========================
+# Bulk (пакетні операції з сервісами)
+# =========================
+
+BULK_MAX_ITEMS = 500
+
+
+class ServiceBulkCreateSerializer(serializers.ModelSerializer):
+    # id авто замість PrimaryKeyRelatedField: власність перевіряється
+    # одним запитом для всього пакета (context["owned_car_ids"])
+    car = serializers.IntegerField()
+
+    class Meta:
+        model = Service
+        fields = (
+            "car",
+            "work_description",
+            "hours",
+            "scheduled_date",
+            "status",
+        )
+
+    def validate_car(self, value):
+        if value not in self.context["owned_car_ids"]:
+            raise serializers.ValidationError("You do not own this car")
+        return value
+
+
+class ServiceStatusPatchSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Service.Status.choices)
+
+    def validate_id(self, value):
+        if value not in self.context["services"]:
+            raise serializers.ValidationError("Service not found")
+        return value
+
+
+class ServiceBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
@@ -0,0 +1,151 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .catalog import invalidate_catalog
+from .events import car_event, car_owner, forget_car_owner, service_event
+from .models import Brand, CarModel, Car, CarSummary, Service
+from .summary import (
+    loaded_service_state,
+    locked_service_states,
+    record_service_change,
+    service_state,
+)
+from .versions import bump_table_version, bump_user_version
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def catalog_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+@receiver(post_save, sender=Car)
+@receiver(post_delete, sender=Car)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def table_changed(sender, **kwargs):
+    transaction.on_commit(partial(bump_table_version, sender))
+
+
+def bump_car_owner_version(car_id):
+    owner_id = car_owner(car_id)
+    if owner_id is not None:
+        bump_user_version(owner_id)
+
+
+@receiver(post_save, sender=Car)
+@receiver(post_delete, sender=Car)
+def car_changed_for_owner(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(partial(bump_user_version, instance.owner_id))
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def service_changed_for_owner(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw and not _deleted_with_car(origin):
+        transaction.on_commit(partial(bump_car_owner_version, instance.car_id))
+
+
+# =========================
+# Зведення по авто
+# =========================
+
+
+@receiver(post_save, sender=Car)
+def create_car_summary(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        CarSummary.objects.create(car=instance)
+
+
+@receiver(pre_save, sender=Service)
+def remember_service_state(sender, instance, raw=False, **kwargs):
+    # не _loaded_values: рядок міг змінитись після читання
+    old = None
+    if instance.pk is not None and not instance._state.adding and not raw:
+        old = locked_service_states([instance.pk]).get(instance.pk)
+    instance._summary_old = old
+
+
+@receiver(post_save, sender=Service)
+def service_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_service_change(instance._summary_old, service_state(instance))
+    instance._loaded_values = {
+        **(getattr(instance, "_loaded_values", None) or {}),
+        "car_id": instance.car_id,
+        "status": instance.status,
+        "hours": instance.hours,
+    }
+
+
+def _deleted_with_car(origin):
+    if isinstance(origin, QuerySet):
+        return origin.model is Car
+    return isinstance(origin, Car)
+
+
+@receiver(pre_delete, sender=Service)
+def remember_deleted_service_state(sender, instance, origin=None, **kwargs):
+    # instance.delete(); рядки queryset.delete() блокує delete_services
+    if origin is instance:
+        instance._summary_old = locked_service_states([instance.pk]).get(instance.pk)
+
+
+@receiver(post_delete, sender=Service)
+def service_deleted(sender, instance, origin=None, **kwargs):
+    # разом з авто видаляється і його зведення
+    if _deleted_with_car(origin):
+        return
+    if origin is instance:
+        # None — вже видалений паралельним запитом
+        old = instance._summary_old
+    else:
+        old = loaded_service_state(instance) or service_state(instance)
+    if old is not None:
+        record_service_change(old, None)
+
+
+# =========================
+# Події для SSE
+# =========================
+
+
+@receiver(post_save, sender=Service)
+def publish_service_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        service_event("service.created" if created else "service.updated", instance)
+
+
+@receiver(post_delete, sender=Service)
+def publish_service_deleted(sender, instance, origin=None, **kwargs):
+    # з авто — досить події car.deleted
+    if not _deleted_with_car(origin):
+        service_event("service.deleted", instance)
+
+
+@receiver(post_save, sender=Car)
+def publish_car_mileage(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    loaded = getattr(instance, "_loaded_values", None) or {}
+    if loaded.get("mileage") != instance.mileage:
+        car_event("car.mileage", instance)
+    instance._loaded_values = {**loaded, "mileage": instance.mileage}
+
+
+@receiver(post_delete, sender=Car)
+def publish_car_deleted(sender, instance, **kwargs):
+    car_event("car.deleted", instance)
+    transaction.on_commit(partial(forget_car_owner, instance.pk))
@@ -0,0 +1,173 @@
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery, Sum
+
+from .models import Car, CarSummary, Service
+from .versions import bump_table_version
+
+COUNT_FIELDS = {
+    Service.Status.PENDING: "pending_count",
+    Service.Status.IN_PROGRESS: "in_progress_count",
+    Service.Status.COMPLETED: "completed_count",
+}
+REBUILD_BATCH_SIZE = 500
+
+_pending = threading.local()
+
+
+def service_state(service):
+    return (service.car_id, service.status, service.hours)
+
+
+def loaded_service_state(service):
+    """
+    Стан сервісу на момент завантаження з БД (None, якщо невідомий)
+    """
+    values = getattr(service, "_loaded_values", None) or {}
+    try:
+        return (values["car_id"], values["status"], values["hours"])
+    except KeyError:
+        return None
+
+
+def locked_service_states(pks):
+    """
+    {id: (car_id, status, hours)} збережених рядків; у транзакції — під
+    select_for_update, тож паралельні зміни того самого сервісу не
+    рахуються двічі від одного старого стану
+    """
+    queryset = Service.objects.filter(pk__in=pks)
+    if transaction.get_connection().in_atomic_block:
+        queryset = queryset.select_for_update()
+    return {
+        pk: (car_id, status, hours)
+        for pk, car_id, status, hours in queryset.values_list(
+            "id", "car_id", "status", "hours"
+        )
+    }
+
+
+def record_service_change(old, new):
+    """
+    old / new — (car_id, status, hours) до і після зміни; None при створенні / видаленні.
+    Поза deferred_summaries() застосовується одразу.
+    """
+    deltas = getattr(_pending, "deltas", None)
+    immediate = deltas is None
+    if immediate:
+        deltas = {}
+
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        car_id, status, hours = state
+        delta = deltas.setdefault(
+            car_id, {"counts": dict.fromkeys(COUNT_FIELDS.values(), 0), "hours": 0}
+        )
+        delta["counts"][COUNT_FIELDS[status]] += sign
+        delta["hours"] += sign * Decimal(str(hours))
+
+    if immediate:
+        apply_deltas(deltas)
+
+
+@contextmanager
+def deferred_summaries():
+    """
+    Накопичує дельти (пакетні операції, каскадні видалення) і застосовує
+    один UPDATE на авто при виході. Використовувати всередині transaction.atomic().
+    """
+    if getattr(_pending, "deltas", None) is not None:
+        yield
+        return
+
+    _pending.deltas = {}
+    try:
+        yield
+        deltas = _pending.deltas
+    finally:
+        _pending.deltas = None
+    apply_deltas(deltas)
+
+
+def next_scheduled_date_subquery():
+    # partial index service_open_car_sched_idx
+    return Subquery(
+        Service.objects.filter(car_id=OuterRef("car"))
+        .exclude(status=Service.Status.COMPLETED)
+        .order_by("scheduled_date")
+        .values("scheduled_date")[:1]
+    )
+
+
+def apply_deltas(deltas):
+    for car_id, delta in deltas.items():
+        changes = {
+            field: F(field) + value for field, value in delta["counts"].items() if value
+        }
+        if delta["hours"]:
+            changes["total_hours"] = F("total_hours") + delta["hours"]
+        CarSummary.objects.filter(car_id=car_id).update(
+            next_scheduled_date=next_scheduled_date_subquery(), **changes
+        )
+    if deltas:
+        transaction.on_commit(partial(bump_table_version, CarSummary))
+
+
+def _rebuild_batch(car_ids):
+    rows = (
+        Service.objects.filter(car_id__in=car_ids)
+        .order_by()
+        .values("car_id")
+        .annotate(
+            pending_count=Count("id", filter=Q(status=Service.Status.PENDING)),
+            in_progress_count=Count("id", filter=Q(status=Service.Status.IN_PROGRESS)),
+            completed_count=Count("id", filter=Q(status=Service.Status.COMPLETED)),
+            total_hours=Sum("hours"),
+            next_scheduled_date=Min(
+                "scheduled_date", filter=~Q(status=Service.Status.COMPLETED)
+            ),
+        )
+    )
+    by_car = {row.pop("car_id"): row for row in rows}
+    CarSummary.objects.bulk_create(
+        [CarSummary(car_id=car_id, **by_car.get(car_id, {})) for car_id in car_ids],
+        update_conflicts=True,
+        unique_fields=["car"],
+        update_fields=[
+            "pending_count",
+            "in_progress_count",
+            "completed_count",
+            "total_hours",
+            "next_scheduled_date",
+        ],
+    )
+    return len(car_ids)
+
+
+def rebuild_summaries(car_ids=None, batch_size=REBUILD_BATCH_SIZE):
+    """
+    Повний перерахунок зведень (усіх авто або car_ids) пачками по batch_size авто
+    """
+    cars = Car.objects.order_by("id").values_list("id", flat=True)
+    if car_ids is not None:
+        cars = cars.filter(id__in=car_ids)
+
+    rebuilt = 0
+    batch = []
+    for car_id in cars.iterator(chunk_size=batch_size):
+        batch.append(car_id)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                rebuilt += _rebuild_batch(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            rebuilt += _rebuild_batch(batch)
+
+    bump_table_version(CarSummary)
+    return rebuilt
@@ -0,0 +1,1857 @@
+import base64
+import csv
+import datetime
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from autocheck_api.db_router import is_pinned, use_replica
+from autocheck_api.testing import QueryBudgetMixin
+from autocheck_api.throttling import LocalBucketStore
+from users.models import User
+from users.utils import get_tokens_for_user
+
+from .catalog_import import import_catalog
+from .checks import shared_cache_check
+from .serializers import BULK_MAX_ITEMS, ServiceWriteSerializer
+from .events import LocalEventBackend, publish
+from .models import Brand, CarModel, Car, CarSummary, Service
+from .bulk import update_service_statuses
+from .summary import rebuild_summaries
+from .views import CATALOG_SEARCH_LIMIT, CarViewSet, ServiceViewSet
+
+
+class CarTestCase(QueryBudgetMixin, TestCase):
+    """
+    Спільні дані: користувач owner з одним авто (cls.user, cls.brand,
+    cls.model, cls.car); бренд і модель — brand_fields / model_title
+    """
+
+    brand_fields = {"title": "BMW"}
+    model_title = "X5"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = cls.create_user("owner")
+        cls.brand = Brand.objects.create(**cls.brand_fields)
+        cls.model = CarModel.objects.create(car_brand=cls.brand, title=cls.model_title)
+        cls.car = cls.create_car()
+
+    @staticmethod
+    def create_user(username, **fields):
+        return User.objects.create_user(
+            username, f"{username}@mail.com", "StrongPass123", **fields
+        )
+
+    @classmethod
+    def create_car(cls, **fields):
+        return Car.objects.create(
+            **{
+                "owner": cls.user,
+                "car_brand": cls.brand,
+                "car_model": cls.model,
+                "initial_mileage": 1000,
+                "mileage": 2000,
+                **fields,
+            }
+        )
+
+
+class QueryPlanTests(CarTestCase):
+    """
+    Гарячі запити ServiceViewSet / CarViewSet мають йти через індекси
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Service.objects.bulk_create(
+            Service(
+                car=cls.car,
+                work_description=f"Service {i}",
+                hours=1,
+                scheduled_date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+                status=Service.Status.COMPLETED if i % 2 else Service.Status.PENDING,
+            )
+            for i in range(50)
+        )
+
+    def setUp(self):
+        super().setUp()
+        if connection.vendor == "postgresql":
+            # на маленьких таблицях планувальник і так обрав би seq scan
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    def get_queryset(self, view_class, **params):
+        request = Request(APIRequestFactory().get("/", params))
+        request.user = self.user
+        view = view_class(request=request, action="list", format_kwarg=None)
+        return view.get_queryset()
+
+    def assertUsesIndex(self, queryset, *tables):
+        plan = queryset.explain()
+        for table in tables:
+            lines = [line for line in plan.splitlines() if f" {table} " in f"{line} "]
+            self.assertTrue(lines, f"{table} is missing from plan:\n{plan}")
+            for line in lines:
+                if connection.vendor == "sqlite":
+                    self.assertIn("SEARCH", line, plan)
+                elif connection.vendor == "postgresql":
+                    self.assertNotIn("Seq Scan", line, plan)
+
+    def test_services_of_owner(self):
+        self.assertUsesIndex(
+            self.get_queryset(ServiceViewSet), "cars_service", "cars_car"
+        )
+
+    def test_services_of_car(self):
+        self.assertUsesIndex(
+            self.get_queryset(ServiceViewSet, car=self.car.id), "cars_service"
+        )
+
+    def test_services_keyset_page(self):
+        queryset = self.get_queryset(ServiceViewSet, car=self.car.id).filter(
+            scheduled_date__lt=datetime.date(2025, 2, 1)
+        )
+        self.assertUsesIndex(queryset, "cars_service")
+
+    def test_open_services_of_car(self):
+        queryset = Service.objects.filter(car=self.car).exclude(
+            status=Service.Status.COMPLETED
+        )
+        self.assertUsesIndex(queryset.order_by("scheduled_date")[:1], "cars_service")
+
+    def test_cars_of_owner(self):
+        self.assertUsesIndex(self.get_queryset(CarViewSet), "cars_car")
+
+
+class SharedCacheCheckTests(TestCase):
+    LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    REDIS = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        }
+    }
+
+    def test_single_worker(self):
+        with override_settings(WEB_CONCURRENCY=1, CACHES=self.LOCMEM):
+            self.assertEqual(shared_cache_check(None), [])
+
+    def test_workers_need_shared_cache(self):
+        with override_settings(WEB_CONCURRENCY=4, CACHES=self.LOCMEM):
+            self.assertEqual(
+                [error.id for error in shared_cache_check(None)], ["cars.E001"]
+            )
+        with override_settings(WEB_CONCURRENCY=4, CACHES=self.REDIS):
+            self.assertEqual(shared_cache_check(None), [])
+
+
+class QueryBudgetTests(CarTestCase):
+    """
+    Кількість запитів cars API не залежить від кількості рядків
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.car = cls.make_cars(1)[0]
+
+    @classmethod
+    def make_cars(cls, count, services=3):
+        cars = []
+        for _ in range(count):
+            brand = Brand.objects.create(title="Audi")
+            model = CarModel.objects.create(car_brand=brand, title="A6")
+            car = cls.create_car(car_brand=brand, car_model=model)
+            Service.objects.bulk_create(
+                Service(
+                    car=car,
+                    work_description=f"Service {i}",
+                    hours=1,
+                    scheduled_date=datetime.date(2025, 1, 1),
+                )
+                for i in range(services)
+            )
+            cars.append(car)
+        rebuild_summaries([car.id for car in cars])
+        return cars
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def grow(self):
+        self.make_cars(5)
+
+    # ---------- brands / models / catalog ----------
+
+    def test_brands_list(self):
+        client = self.api_client()
+        self.assertQueryBudget(
+            2, lambda: client.get("/api/brands/"), self.grow, status_code=200
+        )
+
+    def test_models_list(self):
+        client = self.api_client()
+        self.assertQueryBudget(
+            2,
+            lambda: client.get(f"/api/models/?brand={self.brand.id}"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_brand_retrieve(self):
+        client = self.api_client()
+        self.assertQueryBudget(
+            1,
+            lambda: client.get(f"/api/brands/{self.brand.id}/"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_model_retrieve(self):
+        client = self.api_client()
+        self.assertQueryBudget(
+            1,
+            lambda: client.get(f"/api/models/{self.model.id}/"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_brand_create(self):
+        self.assertQueryBudget(
+            1,
+            lambda: self.client.post("/api/brands/", {"title": "Audi"}, format="json"),
+            status_code=201,
+        )
+
+    def test_model_create(self):
+        payload = {"car_brand": self.brand.id, "title": "X6"}
+        # бренд, перевірка унікальності (бренд, назва), INSERT
+        self.assertQueryBudget(
+            3,
+            lambda: self.client.post("/api/models/", payload, format="json"),
+            status_code=201,
+        )
+
+    def test_catalog_warm(self):
+        client = self.api_client()
+        client.get("/api/catalog/")
+        self.assertQueryBudget(0, lambda: client.get("/api/catalog/"), status_code=200)
+
+    # ---------- cars ----------
+
+    def test_cars_list(self):
+        self.assertQueryBudget(
+            2, lambda: self.client.get("/api/cars/"), self.grow, status_code=200
+        )
+
+    def test_cars_list_cursor(self):
+        self.assertQueryBudget(
+            1,
+            lambda: self.client.get("/api/cars/?pagination=cursor"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_car_retrieve(self):
+        self.assertQueryBudget(
+            1, lambda: self.client.get(f"/api/cars/{self.car.id}/"), status_code=200
+        )
+
+    def test_car_with_services(self):
+        def grow():
+            Service.objects.bulk_create(
+                Service(
+                    car=self.car,
+                    work_description="Extra",
+                    hours=1,
+                    scheduled_date=datetime.date(2025, 2, 1),
+                )
+                for _ in range(5)
+            )
+
+        self.assertQueryBudget(
+            2,
+            lambda: self.client.get(f"/api/cars/{self.car.id}/with-services/"),
+            grow,
+            status_code=200,
+        )
+
+    def test_cars_dashboard(self):
+        self.assertQueryBudget(
+            2,
+            lambda: self.client.get("/api/cars/dashboard/"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_car_create(self):
+        payload = {
+            "car_brand": self.brand.id,
+            "car_model": self.model.id,
+            "initial_mileage": 100,
+            "mileage": 200,
+        }
+        self.assertQueryBudget(
+            6,
+            lambda: self.client.post("/api/cars/", payload, format="json"),
+            status_code=201,
+        )
+
+    # ---------- services ----------
+
+    def test_services_list(self):
+        self.assertQueryBudget(
+            2, lambda: self.client.get("/api/services/"), self.grow, status_code=200
+        )
+
+    def test_services_list_cursor(self):
+        self.assertQueryBudget(
+            1,
+            lambda: self.client.get("/api/services/?pagination=cursor"),
+            self.grow,
+            status_code=200,
+        )
+
+    def test_service_retrieve(self):
+        service = self.car.services.first()
+        self.assertQueryBudget(
+            1,
+            lambda: self.client.get(f"/api/services/{service.id}/"),
+            status_code=200,
+        )
+
+    def test_service_create(self):
+        payload = {
+            "car": self.car.id,
+            "work_description": "Oil change",
+            "hours": "1.5",
+            "scheduled_date": "2025-03-01",
+        }
+        self.assertQueryBudget(
+            5,
+            lambda: self.client.post("/api/services/", payload, format="json"),
+            status_code=201,
+        )
+
+    def test_service_status_patch(self):
+        service = self.car.services.first()
+        # + SELECT ... FOR UPDATE збереженого стану для зведення
+        self.assertQueryBudget(
+            6,
+            lambda: self.client.patch(
+                f"/api/services/{service.id}/", {"status": "completed"}, format="json"
+            ),
+            status_code=200,
+        )
+
+    def test_services_bulk_create(self):
+        def call(count):
+            payload = [
+                {
+                    "car": self.car.id,
+                    "work_description": f"Job {i}",
+                    "hours": "1",
+                    "scheduled_date": "2025-03-01",
+                }
+                for i in range(count)
+            ]
+            return self.client.post("/api/services/bulk/", payload, format="json")
+
+        self.assertQueryBudget(5, lambda: call(2), status_code=201)
+        self.assertQueryBudget(5, lambda: call(50), status_code=201)
+
+    def test_services_export(self):
+        url = "/api/services/export/ndjson/"
+        self.assertQueryBudget(
+            1, lambda: self.client.get(url), self.grow, status_code=200
+        )
+        response = self.client.get(url)
+        self.assertEqual(
+            len(response.getvalue().splitlines()),
+            Service.objects.filter(car__owner=self.user).count(),
+        )
+
+
+class ConditionalGetTests(CarTestCase):
+    """
+    ETag / Last-Modified і 304 для list і retrieve; запис змінює ETag
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.service = Service.objects.create(
+            car=cls.car,
+            work_description="Oil change",
+            hours=1,
+            scheduled_date=datetime.date(2025, 1, 1),
+        )
+        rebuild_summaries([cls.car.id])
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def urls(self):
+        return [
+            "/api/brands/",
+            f"/api/brands/{self.brand.id}/",
+            "/api/models/",
+            f"/api/models/{self.model.id}/",
+            "/api/cars/",
+            f"/api/cars/{self.car.id}/",
+            "/api/services/",
+            f"/api/services/{self.service.id}/",
+        ]
+
+    def test_not_modified(self):
+        for url in self.urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("no-cache", response["Cache-Control"])
+                etag = response["ETag"]
+                last_modified = response["Last-Modified"]
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response["ETag"], etag)
+
+                response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, 304)
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+                self.assertEqual(response.status_code, 200)
+
+    def test_private_per_user(self):
+        other = self.create_user("other")
+        response = self.client.get("/api/services/")
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("Authorization", response["Vary"])
+        other_response = self.api_client(other).get(
+            "/api/services/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(other_response.status_code, 200)
+        self.assertIn("public", self.client.get("/api/brands/")["Cache-Control"])
+
+    def assertWriteChangesETag(self, urls, write):
+        etags = {url: self.client.get(url)["ETag"] for url in urls}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = write()
+        self.assertLess(response.status_code, 300)
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_brand_write(self):
+        self.assertWriteChangesETag(
+            ["/api/brands/", f"/api/brands/{self.brand.id}/"],
+            lambda: self.client.patch(
+                f"/api/brands/{self.brand.id}/", {"title": "BMW AG"}, format="json"
+            ),
+        )
+
+    def test_model_write(self):
+        self.assertWriteChangesETag(
+            ["/api/models/", f"/api/models/{self.model.id}/"],
+            lambda: self.client.post(
+                "/api/models/",
+                {"car_brand": self.brand.id, "title": "X6"},
+                format="json",
+            ),
+        )
+
+    def test_car_write(self):
+        self.assertWriteChangesETag(
+            ["/api/cars/", f"/api/cars/{self.car.id}/"],
+            lambda: self.client.patch(
+                f"/api/cars/{self.car.id}/", {"mileage": 2500}, format="json"
+            ),
+        )
+
+    def test_service_write(self):
+        self.assertWriteChangesETag(
+            [
+                "/api/services/",
+                f"/api/services/{self.service.id}/",
+                # зведення по авто теж змінилось
+                f"/api/cars/{self.car.id}/",
+            ],
+            lambda: self.client.patch(
+                f"/api/services/{self.service.id}/",
+                {"status": "completed"},
+                format="json",
+            ),
+        )
+
+
+class KeysetPaginationTests(CarTestCase):
+    """
+    ?pagination=cursor: сторінки без пропусків і повторів при однакових датах
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # по три сервіси на дату — порядок усередині дати за id
+        Service.objects.bulk_create(
+            Service(
+                car=cls.car,
+                work_description=f"Service {i}",
+                hours=1,
+                scheduled_date=datetime.date(2025, 1, 1 + i // 3),
+            )
+            for i in range(7)
+        )
+        cls.expected = list(
+            Service.objects.order_by("-scheduled_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def pages(self, url):
+        ids, pages = [], []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(data)
+            ids += [service["id"] for service in data["results"]]
+            url = data["next"]
+        return ids, pages
+
+    def test_forward_and_back(self):
+        ids, pages = self.pages("/api/services/?pagination=cursor&page_size=2")
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]["previous"])
+
+        # назад з останньої сторінки — ті самі сторінки у зворотному порядку
+        previous = pages[-1]["previous"]
+        for page in reversed(pages[:-1]):
+            data = self.client.get(previous).json()
+            self.assertEqual(data["results"], page["results"])
+            previous = data["previous"]
+        self.assertIsNone(previous)
+
+    def test_invalid_cursor(self):
+        def encode(cursor):
+            return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+        cursors = [
+            "not-base64!",
+            encode([1, 2]),
+            encode({"v": ["2025-01-01", 1]}),
+            encode({"r": 2, "v": ["2025-01-01", 1]}),
+            encode({"r": 0, "v": ["2025-01-01"]}),
+            encode({"r": 0, "v": ["bad", 1]}),
+            encode({"r": 0, "v": [None, 1]}),
+            encode({"r": 0, "v": [["2025-01-01"], 1]}),
+            encode({"r": 0, "v": ["2025-01-01", "x"]}),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f"/api/services/?cursor={cursor}")
+                self.assertEqual(response.status_code, 404)
+
+
+class BulkServicesTests(CarTestCase):
+    """
+    /api/services/bulk/: все або нічого, помилки по елементах, лише власні дані
+    """
+
+    url = "/api/services/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = cls.create_user("other")
+        cls.other_car = cls.create_car(owner=cls.other)
+        cls.services = [
+            Service.objects.create(
+                car=cls.car,
+                work_description=f"Service {i}",
+                hours=1,
+                scheduled_date=datetime.date(2025, 1, 1),
+            )
+            for i in range(2)
+        ]
+        cls.other_service = Service.objects.create(
+            car=cls.other_car,
+            work_description="Other",
+            hours=1,
+            scheduled_date=datetime.date(2025, 1, 1),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def item(self, car=None, **fields):
+        return {
+            "car": car or self.car.id,
+            "work_description": "Job",
+            "hours": "1.5",
+            "scheduled_date": "2025-03-01",
+            **fields,
+        }
+
+    def statuses(self):
+        return dict(Service.objects.values_list("id", "status"))
+
+    def test_create(self):
+        response = self.client.post(
+            self.url, [self.item(), self.item(status="completed")], format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        created = Service.objects.filter(pk__in=[s["id"] for s in response.json()])
+        self.assertEqual(
+            sorted(created.values_list("status", flat=True)), ["completed", "pending"]
+        )
+
+    def test_create_all_or_nothing(self):
+        count = Service.objects.count()
+        response = self.client.post(
+            self.url,
+            [self.item(), self.item(hours="abc"), self.item(car=self.other_car.id)],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual([error["index"] for error in errors], [1, 2])
+        self.assertIn("hours", errors[0]["errors"])
+        self.assertIn("car", errors[1]["errors"])
+        self.assertEqual(Service.objects.count(), count)
+
+    def test_update_status(self):
+        first, second = self.services
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": first.id, "status": "completed"},
+                {"id": second.id, "status": "in_progress"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [s["status"] for s in response.json()], ["completed", "in_progress"]
+        )
+        statuses = self.statuses()
+        self.assertEqual(statuses[first.id], "completed")
+        self.assertEqual(statuses[second.id], "in_progress")
+
+    def test_update_all_or_nothing(self):
+        before = self.statuses()
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": self.services[0].id, "status": "completed"},
+                {"id": self.services[1].id, "status": "unknown"},
+                {"id": self.other_service.id, "status": "completed"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual([error["index"] for error in errors], [1, 2])
+        self.assertIn("status", errors[0]["errors"])
+        self.assertEqual(errors[1]["errors"], {"id": ["Service not found"]})
+        self.assertEqual(self.statuses(), before)
+
+    def test_delete(self):
+        response = self.client.delete(
+            self.url, {"ids": [s.id for s in self.services]}, format="json"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Service.objects.filter(car=self.car).exists())
+        self.assertTrue(Service.objects.filter(pk=self.other_service.id).exists())
+
+    def test_delete_all_or_nothing(self):
+        response = self.client.delete(
+            self.url,
+            {"ids": [self.services[0].id, self.other_service.id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            [{"index": 1, "errors": {"id": ["Service not found"]}}],
+        )
+        self.assertEqual(Service.objects.count(), 3)
+
+    def test_max_items(self):
+        count = Service.objects.count()
+        too_many = BULK_MAX_ITEMS + 1
+        responses = [
+            self.client.post(self.url, [self.item()] * too_many, format="json"),
+            self.client.patch(
+                self.url,
+                [{"id": self.services[0].id, "status": "completed"}] * too_many,
+                format="json",
+            ),
+            self.client.delete(
+                self.url, {"ids": [self.services[0].id] * too_many}, format="json"
+            ),
+        ]
+        for response in responses:
+            with self.subTest(method=response.request["REQUEST_METHOD"]):
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(Service.objects.count(), count)
+        self.assertEqual(self.statuses()[self.services[0].id], "pending")
+
+    def test_oversized_payload_without_queries(self):
+        # різні id — інакше перевірка власності зібрала б id__in на весь пакет
+        too_many = range(1, BULK_MAX_ITEMS + 2)
+        payloads = [
+            ("post", [{**self.item(), "car": pk} for pk in too_many]),
+            ("patch", [{"id": pk, "status": "completed"} for pk in too_many]),
+            ("post", {"car": self.car.id}),
+            ("patch", "completed"),
+        ]
+        self.client.get("/api/cars/")
+        for method, payload in payloads:
+            with self.subTest(method=method, payload=type(payload).__name__):
+                with self.assertNumQueries(0):
+                    response = getattr(self.client, method)(
+                        self.url, payload, format="json"
+                    )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("non_field_errors", response.json()["errors"])
+
+
+class SummaryConsistencyTests(CarTestCase):
+    """
+    Після кожного виду запису CarSummary збігається з повним перерахунком
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.second_car = cls.create_car()
+        for day, status in enumerate(["pending", "in_progress", "completed"], start=1):
+            Service.objects.create(
+                car=cls.car,
+                work_description=f"Service {day}",
+                hours=f"{day}.5",
+                scheduled_date=datetime.date(2025, 1, day),
+                status=status,
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+        self.services = list(Service.objects.filter(car=self.car).order_by("id"))
+
+    def summaries(self):
+        return {
+            row.pop("car_id"): row
+            for row in CarSummary.objects.order_by("car_id").values()
+        }
+
+    def assertConsistent(self, response, status_code):
+        self.assertEqual(response.status_code, status_code, response.content)
+        stored = self.summaries()
+        rebuild_summaries()
+        self.assertEqual(stored, self.summaries())
+        return stored
+
+    def test_concurrent_writes_from_stale_rows(self):
+        # обидва "запити" прочитали сервіс до того, як інший його змінив
+        pending = self.services[0]
+        first, second, third = (Service.objects.get(pk=pending.pk) for _ in range(3))
+        first.status = "completed"
+        first.save()
+        second.status = "completed"
+        second.hours = "4.0"
+        second.save()
+        stored = self.assertConsistent(self.client.get("/api/cars/"), 200)
+        self.assertEqual(stored[self.car.id]["pending_count"], 0)
+        self.assertEqual(stored[self.car.id]["completed_count"], 2)
+
+        update_service_statuses(
+            {pending.pk: third}, [{"id": pending.pk, "status": "in_progress"}]
+        )
+        self.assertConsistent(self.client.get("/api/cars/"), 200)
+        third.delete()
+        stored = self.assertConsistent(self.client.get("/api/cars/"), 200)
+        self.assertEqual(stored[self.car.id]["in_progress_count"], 1)
+
+        # видалений паралельно — зведення не чіпається вдруге
+        stale = Service.objects.get(pk=self.services[1].pk)
+        Service.objects.get(pk=stale.pk).delete()
+        stale.delete()
+        self.assertConsistent(self.client.get("/api/cars/"), 200)
+
+    def test_initial(self):
+        stored = self.assertConsistent(self.client.get("/api/cars/"), 200)
+        self.assertEqual(stored[self.car.id]["pending_count"], 1)
+        self.assertEqual(stored[self.second_car.id]["total_hours"], 0)
+
+    def test_create(self):
+        response = self.client.post(
+            "/api/services/",
+            {
+                "car": self.car.id,
+                "work_description": "New",
+                "hours": "2.0",
+                "scheduled_date": "2024-12-31",
+            },
+            format="json",
+        )
+        stored = self.assertConsistent(response, 201)
+        self.assertEqual(
+            stored[self.car.id]["next_scheduled_date"], datetime.date(2024, 12, 31)
+        )
+
+    def test_status_and_hours_change(self):
+        service = self.services[0]
+        response = self.client.patch(
+            f"/api/services/{service.id}/",
+            {"status": "completed", "hours": "4.0"},
+            format="json",
+        )
+        self.assertConsistent(response, 200)
+
+    def test_move_to_other_car(self):
+        service = self.services[1]
+        response = self.client.patch(
+            f"/api/services/{service.id}/", {"car": self.second_car.id}, format="json"
+        )
+        stored = self.assertConsistent(response, 200)
+        self.assertEqual(stored[self.second_car.id]["in_progress_count"], 1)
+
+    def test_delete(self):
+        response = self.client.delete(f"/api/services/{self.services[0].id}/")
+        self.assertConsistent(response, 204)
+
+    def test_bulk_create(self):
+        response = self.client.post(
+            "/api/services/bulk/",
+            [
+                {
+                    "car": car.id,
+                    "work_description": "Bulk",
+                    "hours": "1.0",
+                    "scheduled_date": "2025-02-01",
+                    "status": status,
+                }
+                for car in (self.car, self.second_car)
+                for status in ("pending", "completed")
+            ],
+            format="json",
+        )
+        self.assertConsistent(response, 201)
+
+    def test_bulk_update_status(self):
+        response = self.client.patch(
+            "/api/services/bulk/",
+            [
+                {"id": self.services[0].id, "status": "in_progress"},
+                {"id": self.services[1].id, "status": "completed"},
+                {"id": self.services[2].id, "status": "completed"},
+            ],
+            format="json",
+        )
+        self.assertConsistent(response, 200)
+
+    def test_bulk_delete(self):
+        response = self.client.delete(
+            "/api/services/bulk/",
+            {"ids": [self.services[0].id, self.services[2].id]},
+            format="json",
+        )
+        self.assertConsistent(response, 204)
+
+    def test_car_delete(self):
+        response = self.client.delete(f"/api/cars/{self.car.id}/")
+        stored = self.assertConsistent(response, 204)
+        self.assertEqual(list(stored), [self.second_car.id])
+
+
+class ExportTests(CarTestCase):
+    """
+    /api/services/export/<fmt>/: вміст NDJSON і CSV, фільтр ?car=, лише власні дані
+    """
+
+    brand_fields = {"title": "=BMW"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = cls.create_user("other")
+        cls.second_car = cls.create_car()
+        cls.other_car = cls.create_car(owner=cls.other)
+        cls.descriptions = ["=SUM(A1)", "+1", "-1", "@cmd", 'Oil, "5W-30"']
+        for description in cls.descriptions:
+            Service.objects.create(
+                car=cls.car,
+                work_description=description,
+                hours="1.5",
+                scheduled_date=datetime.date(2025, 1, 1),
+            )
+        cls.second = Service.objects.create(
+            car=cls.second_car,
+            work_description="Brakes",
+            hours=2,
+            scheduled_date=datetime.date(2025, 2, 1),
+        )
+        Service.objects.create(
+            car=cls.other_car,
+            work_description="Other owner",
+            hours=1,
+            scheduled_date=datetime.date(2025, 1, 1),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def export(self, fmt, query=""):
+        response = self.client.get(f"/api/services/export/{fmt}/{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'.{fmt}"', response["Content-Disposition"])
+        return response["Content-Type"], response.getvalue()
+
+    def test_ndjson(self):
+        content_type, body = self.export("ndjson")
+        self.assertEqual(content_type, "application/x-ndjson")
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        # ті самі рядки, що й у списку API
+        api = self.client.get("/api/services/?page_size=100").json()["results"]
+        self.assertEqual(rows, api)
+        self.assertEqual(len(rows), len(self.descriptions) + 1)
+
+    def test_csv(self):
+        content_type, body = self.export("csv")
+        self.assertEqual(content_type, "text/csv; charset=utf-8")
+        self.assertTrue(body.startswith(b"\xef\xbb\xbf"))
+        rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+        self.assertEqual(
+            list(rows[0]),
+            [
+                "id",
+                "car",
+                "brand",
+                "model",
+                "work_description",
+                "hours",
+                "scheduled_date",
+                "status",
+                "created_at",
+            ],
+        )
+        by_id = {int(row["id"]): row for row in rows}
+        self.assertEqual(by_id[self.second.id]["work_description"], "Brakes")
+        self.assertEqual(by_id[self.second.id]["hours"], "2.0")
+        # формули екрануються апострофом, решта — як є (лапки й коми — csv)
+        self.assertEqual(
+            sorted(
+                row["work_description"]
+                for row in rows
+                if row["car"] == str(self.car.id)
+            ),
+            sorted(["'=SUM(A1)", "'+1", "'-1", "'@cmd", 'Oil, "5W-30"']),
+        )
+        self.assertEqual({row["brand"] for row in rows}, {"'=BMW"})
+
+    def test_car_filter(self):
+        _, body = self.export("ndjson", f"?car={self.second_car.id}")
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.second.id])
+
+    def test_other_owner(self):
+        for fmt in ("ndjson", "csv"):
+            with self.subTest(fmt=fmt):
+                _, body = self.export(fmt, f"?car={self.other_car.id}")
+                self.assertNotIn(b"Other owner", body)
+                _, body = self.export(fmt)
+                self.assertNotIn(b"Other owner", body)
+        _, body = self.export("csv", f"?car={self.other_car.id}")
+        # лише заголовок
+        self.assertEqual(len(body.decode("utf-8-sig").splitlines()), 1)
+
+
+class FastPathTests(CarTestCase):
+    """
+    Fast path list має давати байт-у-байт ту саму відповідь, що й серіалізатори
+    """
+
+    brand_fields = {"title": 'Škoda \u2028 "quoted"', "logo_filename": "a/b.png"}
+    model_title = "Октавія\t\u0001"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cars = [cls.car, *(cls.create_car(mileage=2000 + i) for i in (1, 2))]
+        for i in range(30):
+            Service.objects.create(
+                car=cars[i % 3],
+                work_description=f"Заміна масла \u2029 <{i}> \\ /",
+                hours=["1.5", "12", "0.1"][i % 3],
+                scheduled_date=datetime.date(2025, 1, 1 + i % 7),
+                status=Service.Status.values[i % 3],
+            )
+        # авто без зведення
+        cars[2].summary.delete()
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def assertSameAsSerializer(self, view_class, url):
+        fast = self.client.get(url)
+        with mock.patch.object(view_class, "fast_list", False):
+            slow = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+
+    def test_services(self):
+        self.assertSameAsSerializer(ServiceViewSet, "/api/services/?page=2")
+
+    def test_services_cursor(self):
+        self.assertSameAsSerializer(
+            ServiceViewSet, "/api/services/?pagination=cursor&page_size=7"
+        )
+
+    def test_cars(self):
+        self.assertSameAsSerializer(CarViewSet, "/api/cars/")
+
+
+class CarWithServicesTests(CarTestCase):
+    """
+    /api/cars/<id>/with-services/: ?fields= і ?include=
+    """
+
+    brand_fields = {"title": "BMW", "logo_filename": "bmw.png"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for day in (1, 2):
+            Service.objects.create(
+                car=cls.car,
+                work_description=f"Service {day}",
+                hours=1,
+                scheduled_date=datetime.date(2025, 1, day),
+            )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+        self.url = f"/api/cars/{self.car.id}/with-services/"
+
+    def test_full(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["brand"], "BMW")
+        self.assertEqual(
+            [s["work_description"] for s in data["services"]],
+            ["Service 2", "Service 1"],
+        )
+        self.assertNotIn("car_info", data["services"][0])
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{self.url}?fields=id,services.status")
+        self.assertEqual(
+            response.json(),
+            {"id": self.car.id, "services": [{"status": "pending"}] * 2},
+        )
+        # без services — без prefetch
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{self.url}?fields=id,mileage")
+        self.assertEqual(response.json(), {"id": self.car.id, "mileage": 2000})
+
+    def test_include(self):
+        response = self.client.get(f"{self.url}?fields=brand,model&include=brand,model")
+        self.assertEqual(
+            response.json(),
+            {
+                "brand": {
+                    "id": self.car.car_brand_id,
+                    "title": "BMW",
+                    "logo_filename": "bmw.png",
+                },
+                "model": {
+                    "id": self.car.car_model_id,
+                    "car_brand": self.car.car_brand_id,
+                    "title": "X5",
+                },
+            },
+        )
+
+    def test_invalid(self):
+        for query in ("fields=bogus", "fields=services.bogus", "include=owner"):
+            with self.subTest(query=query), self.assertNumQueries(0):
+                response = self.client.get(f"{self.url}?{query}")
+                self.assertEqual(response.status_code, 400)
+
+    def test_other_owner(self):
+        other = self.create_user("other")
+        response = self.api_client(other).get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_tracks_services(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.filter(car=self.car).first().delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class SearchTests(CarTestCase):
+    """
+    ?q=: префіксний індекс каталогу і повнотекстовий пошук сервісів
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.mercedes = Brand.objects.create(title="Mercedes-Benz")
+        cls.vito = CarModel.objects.create(car_brand=cls.mercedes, title="Vito")
+        Service.objects.bulk_create(
+            Service(
+                car=cls.car,
+                work_description=description,
+                hours=1,
+                scheduled_date=datetime.date(2025, 1, day),
+            )
+            for day, description in enumerate(
+                ["Oil change", "Change oil and filter", "Brake pads", "Заміна масла"],
+                start=1,
+            )
+        )
+        rebuild_summaries([cls.car.id])
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+
+    def search_services(self, query):
+        response = self.client.get("/api/services/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [s["work_description"] for s in response.json()["results"]]
+
+    def test_catalog_search(self):
+        client = self.api_client()
+        response = client.get("/api/catalog/search/?q=benz")
+        self.assertEqual(
+            [brand["title"] for brand in response.json()["brands"]], ["Mercedes-Benz"]
+        )
+        # з памʼяті, без БД
+        with self.assertNumQueries(0):
+            response = client.get("/api/catalog/search/?q=bmw x")
+        self.assertEqual(
+            response.json()["models"],
+            [
+                {
+                    "id": self.model.id,
+                    "title": "X5",
+                    "car_brand": self.brand.id,
+                    "brand": "BMW",
+                }
+            ],
+        )
+        response = client.get(
+            "/api/catalog/search/?q=b", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_brands_and_models(self):
+        client = self.api_client()
+        response = client.get("/api/brands/?q=mer")
+        self.assertEqual(
+            [b["id"] for b in response.json()["results"]], [self.mercedes.id]
+        )
+        response = client.get(f"/api/models/?q=x&brand={self.mercedes.id}")
+        self.assertEqual(response.json()["results"], [])
+        response = client.get("/api/models/?q=vi")
+        self.assertEqual([m["id"] for m in response.json()["results"]], [self.vito.id])
+
+    def test_models_brand_filter_before_limit(self):
+        # CATALOG_SEARCH_LIMIT збігів іншого бренду вище за рангом
+        brand = Brand.objects.create(title="Xpeng")
+        CarModel.objects.bulk_create(
+            CarModel(car_brand=brand, title=f"G{number}")
+            for number in range(CATALOG_SEARCH_LIMIT)
+        )
+        benz = CarModel.objects.create(car_brand=self.mercedes, title="X-Class")
+        client = self.api_client()
+        response = client.get(f"/api/models/?q=x&brand={self.mercedes.id}")
+        self.assertEqual([m["id"] for m in response.json()["results"]], [benz.id])
+        response = client.get("/api/models/?q=x&brand=bmw")
+        self.assertEqual(response.status_code, 400)
+
+    def test_services(self):
+        self.assertEqual(
+            self.search_services("oil chan"), ["Oil change", "Change oil and filter"]
+        )
+        self.assertEqual(self.search_services("масл"), ["Заміна масла"])
+        # синтаксис FTS у запиті — лише слова
+        self.assertEqual(self.search_services('"brake* ('), ["Brake pads"])
+        self.assertEqual(self.search_services("?!"), [])
+
+    def test_services_index_follows_writes(self):
+        Service.objects.filter(work_description="Brake pads").update(
+            work_description="Brake fluid"
+        )
+        self.assertEqual(self.search_services("fluid"), ["Brake fluid"])
+        self.assertEqual(self.search_services("pads"), [])
+        Service.objects.filter(work_description="Brake fluid").delete()
+        self.assertEqual(self.search_services("brake"), [])
+
+    def test_services_own_only(self):
+        other = self.create_user("other")
+        response = self.api_client(other).get("/api/services/?q=oil")
+        self.assertEqual(response.json()["results"], [])
+
+
+class CatalogImportTests(QueryBudgetMixin, TestCase):
+    """
+    Імпорт каталогу: пакетний upsert, повторний імпорт нічого не дублює
+    """
+
+    CSV = (
+        "brand,model,logo_filename\n"
+        "BMW,X5,bmw.png\n"
+        "BMW,X5,\n"
+        "Audi,A6,\n"
+        ",Q7,\n"
+        "Audi,A4,audi.png\n"
+    )
+
+    def import_csv(self, text, batch_size=2):
+        return import_catalog(io.BytesIO(text.encode()), "csv", batch_size)
+
+    def test_upsert(self):
+        Brand.objects.create(title="BMW")
+
+        report = self.import_csv(self.CSV)
+        self.assertEqual(report.brands, {"inserted": 1, "updated": 1, "skipped": 0})
+        self.assertEqual(report.models, {"inserted": 3, "updated": 0, "skipped": 1})
+        self.assertEqual(report.invalid, 1)
+        self.assertEqual(
+            dict(Brand.objects.values_list("title", "logo_filename")),
+            {"BMW": "bmw.png", "Audi": "audi.png"},
+        )
+
+        report = self.import_csv(self.CSV)
+        self.assertEqual(report.brands, {"inserted": 0, "updated": 0, "skipped": 2})
+        self.assertEqual(report.models, {"inserted": 0, "updated": 0, "skipped": 4})
+        self.assertEqual(CarModel.objects.count(), 3)
+
+    def test_endpoint_requires_staff(self):
+        user = CarTestCase.create_user("owner")
+        upload = io.BytesIO(self.CSV.encode())
+        upload.name = "catalog.csv"
+        response = self.api_client(user).post(
+            "/api/catalog/import/", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        upload.seek(0)
+        response = self.api_client(user).post(
+            "/api/catalog/import/", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["models"]["inserted"], 3)
+
+    def test_bad_bytes_are_row_errors(self):
+        user = CarTestCase.create_user("staff", is_staff=True)
+        long_title = "x" * (csv.field_size_limit() + 1)
+        files = {
+            "catalog.csv": (
+                b"brand,model\n"
+                b"BMW,X5\n"
+                b"\xff\xfe,A6\n"
+                b"Audi,A\x004\n" + long_title.encode() + b",Q7\n"
+                b'"Opel",Astra\n'
+            ),
+            "catalog.ndjson": (
+                b'{"brand": "BMW", "model": "X5"}\n'
+                b'{"brand": "\xff\xfe", "model": "A6"}\n'
+                b'{"brand": "Audi", "model": "A\\u00004"}\n'
+                b'{"brand": "Opel", "model": "Astra"}\n'
+            ),
+        }
+        expected = {
+            "catalog.csv": [
+                {"line": 3, "error": "Invalid UTF-8"},
+                {"line": 4, "error": "NUL character is not allowed"},
+                {
+                    "line": 5,
+                    "error": "Malformed row: field larger than field limit "
+                    f"({csv.field_size_limit()})",
+                },
+            ],
+            "catalog.ndjson": [
+                {"line": 2, "error": "Invalid UTF-8"},
+                {"line": 3, "error": "NUL character is not allowed"},
+            ],
+        }
+        for name, content in files.items():
+            with self.subTest(name=name):
+                CarModel.objects.all().delete()
+                upload = io.BytesIO(content)
+                upload.name = name
+                response = self.api_client(user).post(
+                    "/api/catalog/import/", {"file": upload}, format="multipart"
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["errors"], expected[name])
+                self.assertEqual(
+                    sorted(CarModel.objects.values_list("title", flat=True)),
+                    ["Astra", "X5"],
+                )
+
+        upload = io.BytesIO(b"br\xffand,model\nBMW,X5\n")
+        upload.name = "catalog.csv"
+        response = self.api_client(user).post(
+            "/api/catalog/import/", {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncViewsTests(CarTestCase):
+    """
+    /api/async/... віддає те саме, що й sync viewsets
+    """
+
+    brand_fields = {"title": "BMW", "logo_filename": "bmw.png"}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.foreign_car = cls.create_car(owner=cls.create_user("other"))
+        cls.service = Service.objects.create(
+            car=cls.car,
+            work_description="Заміна масла",
+            hours="1.5",
+            scheduled_date=datetime.date(2025, 1, 1),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.api_client(self.user)
+        access = get_tokens_for_user(self.user)["access"]
+        self.auth = {"Authorization": f"Bearer {access}"}
+
+    async def test_same_as_sync(self):
+        for url in (
+            f"brands/{self.brand.id}/",
+            f"models/?brand={self.brand.id}",
+            f"cars/{self.car.id}/",
+            f"services/{self.service.id}/",
+        ):
+            sync = await sync_to_async(self.client.get)(f"/api/{url}")
+            response = await self.async_client.get(
+                f"/api/async/{url}", headers=self.auth
+            )
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response.content, sync.content, url)
+
+    def test_list_query_budget(self):
+        # claims-JWT без запиту користувача: count + сторінка
+        get = async_to_sync(self.async_client.get)
+        response = self.assertQueryBudget(
+            2, lambda: get("/api/async/services/", headers=self.auth), status_code=200
+        )
+        self.assertEqual(response.json()["count"], 1)
+
+    async def test_anonymous(self):
+        response = await self.async_client.get("/api/async/cars/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response.headers)
+
+        response = await self.async_client.get("/api/async/brands/")
+        self.assertEqual(response.status_code, 200)
+
+    async def test_create_service(self):
+        data = {
+            "work_description": "Діагностика",
+            "hours": "1.0",
+            "scheduled_date": "2025-02-01",
+        }
+        response = await self.async_client.post(
+            "/api/async/services/",
+            {**data, "car": self.foreign_car.id},
+            content_type="application/json",
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.async_client.post(
+            "/api/async/services/",
+            {**data, "car": self.car.id},
+            content_type="application/json",
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(await Service.objects.filter(car=self.car).acount(), 2)
+
+
+@override_settings(EVENTS_MAX_DURATION=0)
+class EventStreamTests(CarTestCase):
+    """
+    SSE: події власника після commit, продовження за Last-Event-ID
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = cls.create_user("other")
+
+    def setUp(self):
+        super().setUp()
+        self.backend = LocalEventBackend(backlog=3)
+        patcher = mock.patch("cars.events._backend", self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = self.api_client(self.user)
+
+    def stream(self, user, last_event_id):
+        access = get_tokens_for_user(user)["access"]
+        response = self.api_client().get(
+            "/api/events/",
+            {"token": access},
+            HTTP_ACCEPT="text/event-stream",
+            HTTP_LAST_EVENT_ID=str(last_event_id),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return b"".join(response.streaming_content).decode()
+
+    def test_service_and_mileage_events(self):
+        start = self.backend.head(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/services/",
+                {
+                    "car": self.car.id,
+                    "work_description": "Заміна масла",
+                    "hours": "1.5",
+                    "scheduled_date": "2025-01-01",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        service_id = response.json()["id"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/services/{service_id}/", {"status": "completed"}, format="json"
+            )
+            self.client.patch(
+                f"/api/cars/{self.car.id}/", {"mileage": 2500}, format="json"
+            )
+            # пробіг не змінився — без події
+            self.client.patch(
+                f"/api/cars/{self.car.id}/", {"mileage": 2500}, format="json"
+            )
+
+        content = self.stream(self.user, start)
+        self.assertEqual(
+            re.findall(r"^event: (.+)$", content, re.M),
+            ["service.created", "service.updated", "car.mileage"],
+        )
+        self.assertIn('"status":"completed"', content.replace(" ", ""))
+
+        # інші користувачі нічого не отримують; з останнього id — нових подій нема
+        self.assertNotIn("event:", self.stream(self.other, start))
+        last_id = self.backend.head(self.user.id)
+        self.assertNotIn("event:", self.stream(self.user, last_id))
+
+    def test_resume_after_backlog_overflow(self):
+        start = self.backend.head(self.user.id)
+        for i in range(5):
+            publish(self.user.id, "service.updated", {"id": i})
+
+        content = self.stream(self.user, start)
+        self.assertIn("event: reset", content)
+        self.assertNotIn("service.updated", content)
+
+    def test_bulk_events_one_publish(self):
+        start = self.backend.head(self.user.id)
+        items = [
+            {
+                "car": self.car.id,
+                "work_description": f"Сервіс {i}",
+                "hours": "1.0",
+                "scheduled_date": "2025-01-01",
+            }
+            for i in range(2)
+        ]
+        with mock.patch.object(
+            self.backend, "publish_many", wraps=self.backend.publish_many
+        ) as publish_many, mock.patch(
+            "cars.events.ServiceWriteSerializer", wraps=ServiceWriteSerializer
+        ) as serializer:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post("/api/services/bulk/", items, format="json")
+                ids = [service["id"] for service in response.json()]
+                self.client.delete(
+                    "/api/services/bulk/", {"ids": ids[:1]}, format="json"
+                )
+            # дані готуються лише після commit
+            serializer.assert_not_called()
+            for callback in callbacks:
+                callback()
+        self.assertEqual(publish_many.call_count, 2)
+        serializer.assert_called_once()
+
+        content = self.stream(self.user, start)
+        self.assertEqual(
+            re.findall(r"^event: (.+)$", content, re.M),
+            ["service.created", "service.created", "service.deleted"],
+        )
+
+    def test_resume_from_unknown_id(self):
+        # id попереду head — інший процес / перезапуск: клієнт має перечитати все
+        content = self.stream(self.user, self.backend.head(self.user.id) + 1000)
+        self.assertIn("event: reset", content)
+
+    def test_anonymous(self):
+        response = self.api_client().get(
+            "/api/events/", HTTP_ACCEPT="text/event-stream"
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class ThrottlingTests(CarTestCase):
+    """
+    Token bucket: окремі бакети для анонімного читання, auth і решти API
+    """
+
+    RATES = {
+        **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+        "anon_read": "3/min",
+        "auth": "2/min",
+    }
+
+    def setUp(self):
+        super().setUp()
+        overrides = override_settings(
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": self.RATES,
+            }
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_anonymous_catalog_reads(self):
+        client = self.api_client()
+        for remaining in (2, 1, 0):
+            response = client.get("/api/brands/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["X-RateLimit-Limit"], "3")
+            self.assertEqual(response["X-RateLimit-Remaining"], str(remaining))
+
+        response = client.get("/api/brands/")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "20")
+
+        # користувачі й вхід — в інших бакетах
+        self.assertEqual(
+            self.api_client(self.user).get("/api/brands/").status_code, 200
+        )
+        response = client.post(
+            "/api/auth/signin/",
+            {"username": "owner", "password": "StrongPass123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_auth_endpoints(self):
+        client = self.api_client()
+        payload = {"username": "owner", "password": "wrong"}
+        for _ in range(2):
+            response = client.post("/api/auth/signin/", payload, format="json")
+            self.assertEqual(response.status_code, 401)
+        response = client.post("/api/auth/signin/", payload, format="json")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(client.get("/api/brands/").status_code, 200)
+
+    def test_forwarded_for_does_not_reset_bucket(self):
+        client = self.api_client()
+        for number in range(3):
+            response = client.get(
+                "/api/brands/", HTTP_X_FORWARDED_FOR=f"10.0.0.{number}"
+            )
+            self.assertEqual(response.status_code, 200)
+        response = client.get("/api/brands/", HTTP_X_FORWARDED_FOR="10.0.0.9")
+        self.assertEqual(response.status_code, 429)
+
+    def test_forwarded_for_behind_proxy(self):
+        with self.settings(
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": self.RATES,
+                "NUM_PROXIES": 1,
+            }
+        ):
+            client = self.api_client()
+            # підставлене клієнтом — на початку, проксі дописує справжній IP
+            for number in range(3):
+                response = client.get(
+                    "/api/brands/",
+                    HTTP_X_FORWARDED_FOR=f"10.0.0.{number}, 203.0.113.7",
+                )
+                self.assertEqual(response.status_code, 200)
+            response = client.get(
+                "/api/brands/", HTTP_X_FORWARDED_FOR="10.0.0.9, 203.0.113.7"
+            )
+            self.assertEqual(response.status_code, 429)
+            response = client.get("/api/brands/", HTTP_X_FORWARDED_FOR="203.0.113.8")
+            self.assertEqual(response.status_code, 200)
+
+    def test_local_store_evicts_least_recent(self):
+        store = LocalBucketStore()
+        store.max_buckets = 3
+        for key in ("a", "b", "a", "c"):
+            store.consume(key, 2, 60)
+        # повне сховище не скидає всі бакети: випадає лише "b"
+        store.consume("d", 2, 60)
+        self.assertFalse(store.consume("a", 2, 60).allowed)
+        self.assertEqual(store.consume("b", 2, 60).remaining, 1)
+
+    def test_overhead(self):
+        # сам лімітер — десятки мікросекунд; межа із запасом на повільні машини
+        request = Request(APIRequestFactory().get("/api/brands/"))
+        request.user = self.user
+        view = APIView()
+        rounds = 2000
+        with override_settings(
+            REST_FRAMEWORK={
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": {
+                    **self.RATES,
+                    "user": f"{rounds * 10}/s",
+                },
+            }
+        ):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                view.check_throttles(request)
+            per_request = (time.perf_counter() - started) / rounds
+        self.assertLess(per_request, 300e-6)
+
+
+class MetricsTests(CarTestCase):
+    """
+    Інструментація: гістограми по маршрутах на /metrics/, лог повільних запитів
+    """
+
+    def test_metrics_endpoint(self):
+        self.api_client().get("/api/brands/")
+
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        for line in (
+            'http_request_duration_seconds_count{route="brands-list",method="GET",status="200"}',
+            'http_request_db_queries_sum{route="brands-list",method="GET"}',
+            'http_request_serialize_duration_seconds_count{route="brands-list",method="GET"}',
+            'http_response_size_bytes_count{route="brands-list",method="GET"}',
+        ):
+            self.assertIn(line, content)
+
+        self.assertEqual(
+            self.client.get("/metrics/", REMOTE_ADDR="10.0.0.1").status_code, 403
+        )
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_log(self):
+        with self.assertLogs("autocheck_api.slow_requests", "WARNING") as logs:
+            self.api_client().get("/api/brands/?token=secret")
+        self.assertIn("GET /api/brands/ ", logs.output[0])
+        self.assertIn('FROM "cars_brand"', logs.output[0])
+        self.assertNotIn("secret", logs.output[0])
+
+
+class ProfilingTests(CarTestCase):
+    """
+    X-Profile: профіль і SQL запиту для staff, для решти — звичайна відповідь
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.staff = cls.create_user("staff", is_staff=True)
+
+    def test_staff_profile(self):
+        client = self.api_client(self.staff)
+        response = client.get("/api/brands/", HTTP_X_PROFILE="cprofile")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["title"], "BMW")
+        profile_id = response["X-Profile-Id"]
+
+        profile = client.get(f"/api/profiles/{profile_id}/").json()
+        self.assertEqual(profile["path"], "/api/brands/")
+        self.assertEqual(profile["status"], 200)
+        self.assertTrue(any('FROM "cars_brand"' in q["sql"] for q in profile["sql"]))
+        self.assertIn("function calls", profile["stats"])
+
+        response = client.get("/api/brands/?profile=1")
+        collapsed = client.get(
+            f"/api/profiles/{response['X-Profile-Id']}/?format=collapsed"
+        )
+        # швидкий запит може не дати жодного семпла — тоді тіло порожнє
+        self.assertEqual(collapsed.status_code, 200)
+
+    def test_not_staff(self):
+        client = self.api_client(self.user)
+        response = client.get("/api/brands/", HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(client.get("/api/profiles/missing/").status_code, 403)
+
+
+# репліка — той самий "default": перевіряється маршрутизація, не реплікація
+@override_settings(
+    DATABASE_REPLICAS=["default"],
+    DATABASE_ROUTERS=["autocheck_api.db_router.ReplicaRouter"],
+)
+class ReplicaRoutingTests(CarTestCase):
+    """
+    Списки — з репліки; після запису користувач читає з primary
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.service = Service.objects.create(
+            car=cls.car,
+            work_description="Oil",
+            hours="1.5",
+            scheduled_date=datetime.date(2025, 1, 1),
+        )
+
+    def test_read_your_writes(self):
+        client = self.api_client(self.user)
+        with mock.patch("cars.replicas.use_replica", wraps=use_replica) as replica:
+            client.get("/api/services/")
+            replica.assert_called_once()
+
+            client.patch(
+                f"/api/services/{self.service.pk}/",
+                {"status": "completed"},
+                format="json",
+            )
+            self.assertTrue(is_pinned(self.user.pk))
+            replica.reset_mock()
+            client.get("/api/services/")
+            replica.assert_not_called()
+
+    def test_public_lists_skip_fresh_tables(self):
+        client = self.api_client()
+        with mock.patch("cars.replicas.use_replica", wraps=use_replica) as replica:
+            # лічильник версій щойно створено — таблиця "свіжа"
+            client.get("/api/brands/")
+            replica.assert_not_called()
+
+            with override_settings(DATABASE_REPLICA_MAX_LAG=-1):
+                client.get("/api/brands/")
+            replica.assert_called_once()
+
+
+class BenchCommandTests(QueryBudgetMixin, TransactionTestCase):
+    """
+    seed_bench_data і bench_api на малих обсягах; TransactionTestCase —
+    bench_api ходить в API з окремих потоків (свої зʼєднання з БД)
+    """
+
+    def test_seed_and_bench(self):
+        call_command(
+            "seed_bench_data",
+            users=2,
+            cars=2,
+            services=10,
+            brands=2,
+            models=3,
+            stdout=io.StringIO(),
+        )
+        self.assertEqual(User.objects.filter(username__startswith="bench-").count(), 2)
+        self.assertEqual(Brand.objects.count(), 2)
+        self.assertEqual(CarModel.objects.count(), 6)
+        self.assertEqual(Car.objects.count(), 4)
+        self.assertEqual(Service.objects.count(), 10)
+        summaries = CarSummary.objects.all()
+        self.assertEqual(len(summaries), 4)
+        self.assertEqual(
+            sum(
+                s.pending_count + s.in_progress_count + s.completed_count
+                for s in summaries
+            ),
+            10,
+        )
+        with self.assertRaises(CommandError):
+            call_command("seed_bench_data", users=1, stdout=io.StringIO())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "bench.json")
+            out = io.StringIO()
+            call_command(
+                "bench_api",
+                users=2,
+                concurrency=2,
+                iterations=2,
+                output=output,
+                stdout=out,
+            )
+            with open(output) as file:
+                results = json.load(file)
+            self.assertEqual(results["steps"]["login"]["count"], 2)
+            self.assertEqual(results["steps"]["cars"]["count"], 4)
+            self.assertTrue(
+                all(row["errors"] == 0 for row in results["steps"].values()),
+                out.getvalue(),
+            )
+
+            call_command(
+                "bench_api",
+                users=2,
+                concurrency=1,
+                iterations=1,
+                compare=output,
+                threshold=1e9,
+                stdout=io.StringIO(),
+            )
+            # будь-яка зміна p95 — понад поріг: команда завершується з помилкою
+            with self.assertRaisesMessage(CommandError, "p95 regression"):
+                call_command(
+                    "bench_api",
+                    users=2,
+                    concurrency=1,
+                    iterations=1,
+                    compare=output,
+                    threshold=-1e9,
+                    stdout=io.StringIO(),
+                )
@@ -1,6 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BrandViewSet, CarModelViewSet, CarViewSet, ServiceViewSet
+from .views import (
+    BrandViewSet,
+    CarModelViewSet,
+    CarViewSet,
+    CatalogImportView,
+    CatalogSearchView,
+    CatalogView,
+    EventStreamView,
+    ServiceViewSet,
+)
 
 router = DefaultRouter()
 router.register("cars", CarViewSet, basename="cars")
@@ -9,5 +18,9 @@ router.register("models", CarModelViewSet, basename="models")
 router.register("services", ServiceViewSet, basename="services")
 
 urlpatterns = [
+    path("catalog/", CatalogView.as_view(), name="catalog"),
+    path("catalog/import/", CatalogImportView.as_view(), name="catalog-import"),
+    path("catalog/search/", CatalogSearchView.as_view(), name="catalog-search"),
+    path("events/", EventStreamView.as_view(), name="events"),
     path("", include(router.urls)),
 ]
@@ -0,0 +1,80 @@
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(name):
+    return f"version:{name}"
+
+
+def _changed_at_key(name):
+    return f"version:{name}:changed_at"
+
+
+def table_version_name(model):
+    return model._meta.label_lower
+
+
+def _init_version(name):
+    # Лічильник втрачено (рестарт кешу) — стартуємо з мітки часу,
+    # щоб не повторити значення, на яких уже видані ETag
+    now = time.time()
+    cache.add(_changed_at_key(name), now, timeout=None)
+    if not cache.add(_version_key(name), int(now * 1000), timeout=None):
+        return cache.get(_version_key(name), int(now * 1000))
+    return int(now * 1000)
+
+
+def get_version(name):
+    """
+    Поточне значення лічильника змін `name` у спільному кеші
+    """
+    version = cache.get(_version_key(name))
+    if version is None:
+        version = _init_version(name)
+    return version
+
+
+def get_versions(names):
+    """
+    {name: (version, changed_at)} для кількох лічильників одним зверненням до кешу
+    """
+    keys = []
+    for name in names:
+        keys += [_version_key(name), _changed_at_key(name)]
+    found = cache.get_many(keys)
+
+    result = {}
+    for name in names:
+        version = found.get(_version_key(name))
+        changed_at = found.get(_changed_at_key(name))
+        if version is None or changed_at is None:
+            version = get_version(name)
+            changed_at = cache.get(_changed_at_key(name)) or time.time()
+        result[name] = (version, changed_at)
+    return result
+
+
+def bump_version(name):
+    """
+    Збільшити лічильник змін `name` (викликати після commit)
+    """
+    cache.set(_changed_at_key(name), time.time(), timeout=None)
+    try:
+        return cache.incr(_version_key(name))
+    except ValueError:
+        _init_version(name)
+        return cache.incr(_version_key(name))
+
+
+def bump_table_version(model):
+    return bump_version(table_version_name(model))
+
+
+def user_version_name(user_id):
+    """Лічильник змін даних одного користувача (авто, сервіси)"""
+    return f"user:{user_id}"
+
+
+def bump_user_version(user_id):
+    return bump_version(user_version_name(user_id))
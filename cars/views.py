@@ -1,10 +1,25 @@
+from django.db import transaction
+from django.db.models import Count, F, Min, Prefetch, Sum, Window
+from django.db.models.functions import RowNumber
+from django.utils.functional import cached_property
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import (
+    AllowAny,
+    IsAdminUser,
     IsAuthenticated,
     BasePermission,
     SAFE_METHODS,
 )
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.renderers import JSONRenderer
 
 from drf_spectacular.utils import (
     extend_schema,
@@ -12,17 +27,79 @@ from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
 )
+from drf_spectacular.types import OpenApiTypes
 
-from .models import Brand, CarModel, Car, Service
+from users.authentication import QueryTokenJWTAuthentication
+
+from .bulk import (
+    collect_ids,
+    create_services,
+    delete_services,
+    item_errors,
+    payload_errors,
+    update_service_statuses,
+)
+from .catalog import get_catalog_snapshot
+from .catalog_import import CatalogImportError, detect_format, import_catalog
+from .conditional import ConditionalGetMixin
+from .events import EventStreamRenderer, event_stream_response
+from .export import FORMATTERS, export_services_response
+from .fastpath import CAR_VALUES, SERVICE_VALUES, FastListMixin, car_row, service_row
+from .pagination import (
+    CarKeysetPagination,
+    SelectablePaginationMixin,
+    ServiceKeysetPagination,
+)
+from .models import Brand, CarModel, Car, CarSummary, Service
+from .replicas import ReplicaReadMixin
+from .search import get_catalog_index, order_by_ids, search_services
 from .serializers import (
+    BULK_MAX_ITEMS,
+    CAR_INCLUDES,
     BrandSerializer,
     CarModelSerializer,
     CarReadSerializer,
+    CarServiceSerializer,
+    CarWithServicesSerializer,
     CarWriteSerializer,
+    DashboardSerializer,
+    ServiceBulkCreateSerializer,
+    ServiceBulkDeleteSerializer,
     ServiceReadSerializer,
+    ServiceStatusPatchSerializer,
     ServiceWriteSerializer,
+    parse_include,
+    parse_sparse_fields,
 )
 
+# скільки сервісів віддає /api/cars/<id>/with-services/
+CAR_SERVICES_LIMIT = 100
+# скільки брендів / моделей знаходить ?q= (typeahead)
+CATALOG_SEARCH_LIMIT = 100
+
+CATALOG_SEARCH_PARAMETER = OpenApiParameter(
+    name="q",
+    description="Пошук за початком слова в назві (індекс у памʼяті), найкращі збіги першими",
+    required=False,
+    type=str,
+)
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="pagination",
+        description="cursor — keyset-пагінація без COUNT(*) (next/previous за курсором)",
+        required=False,
+        type=str,
+        enum=["cursor"],
+    ),
+    OpenApiParameter(
+        name="cursor",
+        description="Курсор з посилань next/previous",
+        required=False,
+        type=str,
+    ),
+]
+
 
 # =========================
 # Permissions
@@ -47,7 +124,7 @@ class IsOwnerPermission(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        return hasattr(obj, "owner") and obj.owner == request.user
+        return getattr(obj, "owner_id", None) == request.user.id
 
 
 # =========================
@@ -59,6 +136,7 @@ class IsOwnerPermission(BasePermission):
     list=extend_schema(
         summary="Список брендів",
         description="Публічний endpoint",
+        parameters=[CATALOG_SEARCH_PARAMETER],
         examples=[
             OpenApiExample(
                 "Brands list",
@@ -73,10 +151,159 @@ class IsOwnerPermission(BasePermission):
         summary="Створити бренд (auth)",
     ),
 )
-class BrandViewSet(ModelViewSet):
+class BrandViewSet(ReplicaReadMixin, ConditionalGetMixin, ModelViewSet):
     queryset = Brand.objects.all()
     serializer_class = BrandSerializer
     permission_classes = [ReadOnlyOrAuthenticated]
+    conditional_tables = (Brand,)
+    conditional_public = True
+    replica_actions = None
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        query = self.request.query_params.get("q")
+        if query and self.action == "list":
+            brands = get_catalog_index().brands.search(query, CATALOG_SEARCH_LIMIT)
+            qs = order_by_ids(qs, [brand["id"] for brand in brands])
+        return qs
+
+
+# =========================
+# Catalog (бренди + моделі одним документом)
+# =========================
+
+
+@extend_schema(
+    summary="Каталог брендів і моделей",
+    description="Публічний endpoint. Кешований знімок з ETag за версією каталогу",
+    responses={200: OpenApiTypes.OBJECT},
+    examples=[
+        OpenApiExample(
+            "Catalog",
+            value={
+                "version": 1,
+                "brands": [
+                    {
+                        "id": 1,
+                        "title": "BMW",
+                        "logo_filename": "bmw.png",
+                        "models": [{"id": 1, "title": "X5"}],
+                    }
+                ],
+            },
+        )
+    ],
+)
+class CatalogView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        snapshot = get_catalog_snapshot()
+
+        response = get_conditional_response(request, etag=snapshot.etag)
+        if response is None:
+            response = HttpResponse(snapshot.content, content_type="application/json")
+        response["ETag"] = snapshot.etag
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+@extend_schema(
+    summary="Підказки брендів і моделей (typeahead)",
+    description=(
+        "Публічний endpoint. Префіксний індекс у памʼяті процесу: "
+        "без запитів до БД, ETag за версією каталогу"
+    ),
+    parameters=[
+        OpenApiParameter(name="q", description="Початок назви", type=str),
+        OpenApiParameter(
+            name="brand", description="Лише моделі бренду", required=False, type=int
+        ),
+        OpenApiParameter(
+            name="limit",
+            description=f"До {CATALOG_SEARCH_LIMIT}, за замовчуванням 10",
+            required=False,
+            type=int,
+        ),
+    ],
+    responses={200: OpenApiTypes.OBJECT},
+    examples=[
+        OpenApiExample(
+            "Search",
+            value={
+                "brands": [{"id": 1, "title": "BMW", "logo_filename": "bmw.png"}],
+                "models": [{"id": 1, "title": "X5", "car_brand": 1, "brand": "BMW"}],
+            },
+        )
+    ],
+)
+class CatalogSearchView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            limit = min(int(params.get("limit", 10)), CATALOG_SEARCH_LIMIT)
+            brand_id = int(params["brand"]) if params.get("brand") else None
+        except ValueError:
+            return Response(
+                {"detail": "limit and brand must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        index = get_catalog_index()
+
+        response = get_conditional_response(request, etag=index.etag)
+        if response is None:
+            query = params.get("q", "")
+            response = Response(
+                {
+                    "brands": [] if brand_id else index.brands.search(query, limit),
+                    "models": index.search_models(query, brand_id, limit),
+                }
+            )
+        response["ETag"] = index.etag
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+@extend_schema(
+    summary="Імпорт каталогу брендів і моделей (CSV / NDJSON)",
+    description=(
+        "Файл у полі file: CSV з колонками brand, model, logo_filename "
+        "або NDJSON з тими ж ключами. Лише для staff."
+    ),
+    request={
+        "multipart/form-data": {
+            "type": "object",
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "format": {"type": "string", "enum": ["csv", "ndjson"]},
+            },
+            "required": ["file"],
+        }
+    },
+    responses={200: OpenApiTypes.OBJECT},
+)
+class CatalogImportView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+    throttle_scope = "catalog_import"
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["No file was submitted."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            fmt = detect_format(upload.name, request.data.get("format") or None)
+            report = import_catalog(upload.file, fmt)
+        except CatalogImportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict())
 
 
 # =========================
@@ -93,7 +320,8 @@ class BrandViewSet(ModelViewSet):
                 description="ID бренду",
                 required=False,
                 type=int,
-            )
+            ),
+            CATALOG_SEARCH_PARAMETER,
         ],
         examples=[
             OpenApiExample(
@@ -106,15 +334,29 @@ class BrandViewSet(ModelViewSet):
         ],
     )
 )
-class CarModelViewSet(ModelViewSet):
+class CarModelViewSet(ReplicaReadMixin, ConditionalGetMixin, ModelViewSet):
     serializer_class = CarModelSerializer
     permission_classes = [ReadOnlyOrAuthenticated]
+    conditional_tables = (CarModel,)
+    conditional_public = True
+    replica_actions = None
 
     def get_queryset(self):
         qs = CarModel.objects.select_related("car_brand")
-        brand_id = self.request.query_params.get("brand")
-        if brand_id:
+        brand = self.request.query_params.get("brand")
+        try:
+            brand_id = int(brand) if brand else None
+        except ValueError:
+            raise ValidationError({"brand": "must be an integer"})
+        if brand_id is not None:
             qs = qs.filter(car_brand_id=brand_id)
+        query = self.request.query_params.get("q")
+        if query and self.action == "list":
+            # "bmw x" — і за брендом, і за моделлю; ліміт — після фільтра за брендом
+            models = get_catalog_index().search_models(
+                query, brand_id, CATALOG_SEARCH_LIMIT
+            )
+            qs = order_by_ids(qs, [model["id"] for model in models])
         return qs
 
 
@@ -126,6 +368,7 @@ class CarModelViewSet(ModelViewSet):
 @extend_schema_view(
     list=extend_schema(
         summary="Мої автомобілі",
+        parameters=PAGINATION_PARAMETERS,
     ),
     create=extend_schema(
         summary="Додати автомобіль",
@@ -142,21 +385,134 @@ class CarModelViewSet(ModelViewSet):
         ],
     ),
 )
-class CarViewSet(ModelViewSet):
+class CarViewSet(
+    ReplicaReadMixin,
+    SelectablePaginationMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ModelViewSet,
+):
     permission_classes = [IsAuthenticated, IsOwnerPermission]
+    fast_list = True
+    fast_list_values = CAR_VALUES
+    fast_list_row = staticmethod(car_row)
+    cursor_pagination_class = CarKeysetPagination
+    conditional_tables = (Car, Brand, CarModel, CarSummary)
+    last_modified_field = "updated_mileage_at"
+    replica_actions = ("list", "with_services")
+
+    read_actions = ("list", "retrieve", "dashboard")
 
     def get_queryset(self):
-        return Car.objects.filter(owner=self.request.user).select_related(
-            "car_brand", "car_model"
+        # порядок сторінок — як у keyset-пагінації (і в bootstrap)
+        qs = Car.objects.filter(owner_id=self.request.user.id).order_by(
+            *CarKeysetPagination.ordering
         )
+        if self.action in self.read_actions:
+            # owner — для IsOwnerPermission
+            qs = qs.select_related("car_brand", "car_model", "summary").only(
+                "owner", *CarReadSerializer.Meta.only_fields
+            )
+        elif self.action == "with_services":
+            qs = qs.select_related("car_brand", "car_model", "summary").only(
+                "owner", *CarWithServicesSerializer.Meta.only_fields
+            )
+            if "services" in self.sparse_fields.get("", {"services"}):
+                # останні CAR_SERVICES_LIMIT на авто; не зріз — prefetch для
+                # одного обʼєкта ще фільтрує queryset
+                services = (
+                    Service.objects.annotate(
+                        row_number=Window(
+                            RowNumber(),
+                            partition_by=F("car"),
+                            order_by=(F("scheduled_date").desc(), F("id").desc()),
+                        )
+                    )
+                    .filter(row_number__lte=CAR_SERVICES_LIMIT)
+                    .only(*CarServiceSerializer.Meta.only_fields)
+                )
+                qs = qs.prefetch_related(Prefetch("services", queryset=services))
+        return qs
 
     def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
+        if self.action in self.read_actions:
             return CarReadSerializer
+        if self.action == "with_services":
+            return CarWithServicesSerializer
         return CarWriteSerializer
 
+    def get_conditional_tables(self):
+        if self.action == "with_services":
+            return (*self.conditional_tables, Service)
+        return self.conditional_tables
+
+    @cached_property
+    def sparse_fields(self):
+        return parse_sparse_fields(
+            self.request.query_params.get("fields"),
+            CarWithServicesSerializer,
+            {"services": CarServiceSerializer},
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "with_services":
+            context["fields"] = self.sparse_fields
+            context["include"] = parse_include(self.request.query_params.get("include"))
+        return context
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        serializer.save(owner_id=self.request.user.id)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+    @extend_schema(
+        summary="Зведення по моїх автомобілях",
+        responses={200: DashboardSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        cars = list(self.get_queryset())
+        totals = CarSummary.objects.filter(car__owner_id=request.user.id).aggregate(
+            cars_count=Count("car"),
+            pending=Sum("pending_count", default=0),
+            in_progress=Sum("in_progress_count", default=0),
+            completed=Sum("completed_count", default=0),
+            total_hours=Sum("total_hours", default=0),
+            next_scheduled_date=Min("next_scheduled_date"),
+        )
+        return Response(DashboardSerializer({**totals, "cars": cars}).data)
+
+    @extend_schema(
+        summary="Автомобіль разом із сервісами",
+        description=(
+            f"Один запит замість /api/cars/ і /api/services/?car=<id>. "
+            f"Останні {CAR_SERVICES_LIMIT} сервісів; решта — /api/services/?car=<id>"
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                description="Лише ці поля через кому; поля сервісів — services.<поле>",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="include",
+                description="Обʼєкти замість назв: " + ", ".join(CAR_INCLUDES),
+                required=False,
+                type=str,
+            ),
+        ],
+        responses={200: CarWithServicesSerializer},
+    )
+    @action(detail=True, methods=["get"], url_path="with-services")
+    def with_services(self, request, pk=None):
+        # помилки ?fields= / ?include= — 400 до запитів до БД
+        self.get_serializer_context()
+        return self.conditional_object_response(self.get_object())
 
 
 # =========================
@@ -173,7 +529,17 @@ class CarViewSet(ModelViewSet):
                 description="ID автомобіля",
                 required=False,
                 type=int,
-            )
+            ),
+            OpenApiParameter(
+                name="q",
+                description=(
+                    "Повнотекстовий пошук в описі робіт (усі слова, за початком "
+                    "слова), найрелевантніші першими; лише page-number пагінація"
+                ),
+                required=False,
+                type=str,
+            ),
+            *PAGINATION_PARAMETERS,
         ],
     ),
     create=extend_schema(
@@ -191,29 +557,218 @@ class CarViewSet(ModelViewSet):
         ],
     ),
 )
-class ServiceViewSet(ModelViewSet):
+class ServiceViewSet(
+    ReplicaReadMixin,
+    SelectablePaginationMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ModelViewSet,
+):
     permission_classes = [IsAuthenticated]
+    fast_list = True
+    fast_list_values = SERVICE_VALUES
+    fast_list_row = staticmethod(service_row)
+    cursor_pagination_class = ServiceKeysetPagination
+    conditional_tables = (Service, Car, Brand, CarModel)
+    last_modified_field = "created_at"
+
+    read_actions = ("list", "retrieve")
 
     def get_queryset(self):
-        qs = Service.objects.select_related(
-            "car",
-            "car__car_brand",
-            "car__car_model",
-        ).filter(car__owner=self.request.user)
+        qs = Service.objects.filter(car__owner_id=self.request.user.id)
+        if self.action in self.read_actions:
+            qs = qs.select_related(
+                "car",
+                "car__car_brand",
+                "car__car_model",
+            ).only(*ServiceReadSerializer.Meta.only_fields)
 
         car_id = self.request.query_params.get("car")
         if car_id:
             qs = qs.filter(car_id=car_id)
 
+        query = self.request.query_params.get("q")
+        if query and self.action in ("list", "export"):
+            qs = search_services(qs, query)
+
         return qs
 
+    def use_cursor_pagination(self):
+        # keyset — за датою; пошук упорядкований за релевантністю
+        if self.request.query_params.get("q"):
+            return False
+        return super().use_cursor_pagination()
+
     def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
+        if self.action in self.read_actions:
             return ServiceReadSerializer
         return ServiceWriteSerializer
 
+    # зведення по авто оновлюється в тій самій транзакції, що й сервіс
+
+    @transaction.atomic
     def perform_create(self, serializer):
         car = serializer.validated_data["car"]
-        if car.owner != self.request.user:
+        if car.owner_id != self.request.user.id:
             raise PermissionDenied("You do not own this car")
         serializer.save()
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+    # ---------- export ----------
+
+    @extend_schema(
+        summary="Експорт усієї історії сервісів (NDJSON / CSV)",
+        description="Потокова відповідь; підтримує фільтр ?car=",
+        parameters=[
+            OpenApiParameter(
+                name="fmt",
+                location=OpenApiParameter.PATH,
+                enum=list(FORMATTERS),
+                type=str,
+            ),
+            OpenApiParameter(
+                name="car",
+                description="ID автомобіля",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=f"export/(?P<fmt>{'|'.join(FORMATTERS)})",
+    )
+    def export(self, request, fmt):
+        return export_services_response(
+            request._request, self.filter_queryset(self.get_queryset()), fmt
+        )
+
+    # ---------- bulk ----------
+
+    @extend_schema(
+        summary="Пакетне створення сервісів",
+        description=f"До {BULK_MAX_ITEMS} елементів; все або нічого, помилки по кожному елементу",
+        request=ServiceBulkCreateSerializer(many=True),
+        responses={201: ServiceWriteSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        errors = payload_errors(request.data)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        owned_car_ids = set(
+            Car.objects.filter(
+                owner_id=request.user.id, id__in=collect_ids(request.data, "car")
+            ).values_list("id", flat=True)
+        )
+        serializer = ServiceBulkCreateSerializer(
+            data=request.data,
+            many=True,
+            max_length=BULK_MAX_ITEMS,
+            context={"owned_car_ids": owned_car_ids},
+        )
+        if not serializer.is_valid():
+            return Response(
+                {"errors": item_errors(serializer.errors)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        services = create_services(serializer.validated_data)
+        return Response(
+            ServiceWriteSerializer(services, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        summary="Пакетна зміна статусів",
+        request=ServiceStatusPatchSerializer(many=True),
+        responses={200: ServiceWriteSerializer(many=True)},
+    )
+    @bulk_create.mapping.patch
+    def bulk_update_status(self, request):
+        errors = payload_errors(request.data)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        services = Service.objects.filter(
+            car__owner_id=request.user.id, id__in=collect_ids(request.data, "id")
+        ).in_bulk()
+        serializer = ServiceStatusPatchSerializer(
+            data=request.data,
+            many=True,
+            max_length=BULK_MAX_ITEMS,
+            context={"services": services},
+        )
+        if not serializer.is_valid():
+            return Response(
+                {"errors": item_errors(serializer.errors)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        updated = update_service_statuses(services, serializer.validated_data)
+        return Response(ServiceWriteSerializer(updated, many=True).data)
+
+    @extend_schema(
+        summary="Пакетне видалення сервісів",
+        request=ServiceBulkDeleteSerializer,
+        responses={204: None},
+    )
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        serializer = ServiceBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        queryset = Service.objects.filter(car__owner_id=request.user.id, id__in=ids)
+        found = set(queryset.values_list("id", flat=True))
+        if len(found) != len(set(ids)):
+            return Response(
+                {
+                    "errors": [
+                        {"index": index, "errors": {"id": ["Service not found"]}}
+                        for index, pk in enumerate(ids)
+                        if pk not in found
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        delete_services(queryset)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# =========================
+# Events (SSE)
+# =========================
+
+
+@extend_schema(
+    summary="Потік подій користувача (Server-Sent Events)",
+    description=(
+        "service.created / service.updated / service.deleted, car.mileage, "
+        "car.deleted; reset — частину подій втрачено, дані треба перечитати. "
+        "EventSource передає токен у ?token=, продовження — Last-Event-ID "
+        "(або ?last_event_id=)."
+    ),
+    parameters=[
+        OpenApiParameter(name="token", description="Access token", type=str),
+        OpenApiParameter(name="last_event_id", type=str),
+    ],
+    responses={(200, "text/event-stream"): OpenApiTypes.STR},
+)
+class EventStreamView(APIView):
+    authentication_classes = [QueryTokenJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+    throttle_scope = "events"
+
+    def get(self, request):
+        return event_stream_response(request._request, request.user.id, request.auth)
@@ -0,0 +1,166 @@
+// static/app.js: кеш GET (ETag, stale-while-revalidate), дедуплікація запитів,
+// оптимістичні зміни з відкатом. node --test frontend/app.test.js
+// (запускається і з python manage.py test frontend)
+const assert = require('node:assert/strict');
+const fs = require('node:fs');
+const path = require('node:path');
+const test = require('node:test');
+const vm = require('node:vm');
+
+const SOURCE = fs.readFileSync(path.join(__dirname, '..', 'static', 'app.js'), 'utf8');
+
+function element() {
+    return {
+        value: '',
+        textContent: '',
+        innerHTML: '',
+        classList: { add() {}, remove() {} },
+        addEventListener() {},
+        scrollIntoView() {},
+    };
+}
+
+function response(status, body = null, etag = null) {
+    return {
+        status,
+        ok: status >= 200 && status < 300,
+        headers: { get: (name) => (name === 'ETag' ? etag : null) },
+        json: async () => body,
+        text: async () => JSON.stringify(body),
+    };
+}
+
+// app.js у власному контексті; fetch відповідає з черги replies і записує запити
+function loadApp(replies = []) {
+    const requests = [];
+    const storage = new Map([['access', 'token'], ['refresh', 'refresh']]);
+    const elements = new Map();
+    const context = vm.createContext({
+        console: { error() {} },
+        alert() {},
+        confirm: () => true,
+        location: { protocol: 'http:' },
+        localStorage: {
+            getItem: (key) => storage.get(key) ?? null,
+            setItem: (key, value) => storage.set(key, String(value)),
+            clear: () => storage.clear(),
+        },
+        document: {
+            cookie: '',
+            addEventListener() {},
+            createElement: element,
+            getElementById(id) {
+                if (!elements.has(id)) elements.set(id, element());
+                return elements.get(id);
+            },
+        },
+        fetch: async (url, options) => {
+            requests.push({ url, ...options });
+            const reply = replies.shift();
+            assert.ok(reply, `unexpected fetch ${options.method} ${url}`);
+            return reply;
+        },
+    });
+    vm.runInContext(SOURCE, context);
+    // const / let верхнього рівня видно лише коду в тому ж контексті
+    const run = (code) => vm.runInContext(code, context);
+    return { context, run, requests, elements };
+}
+
+test('fresh cache answers without a request', async () => {
+    const app = loadApp([response(200, { results: [1] }, '"v1"')]);
+    const rendered = [];
+    await app.context.cachedCall('/api/cars/', (data) => rendered.push(data));
+    await app.context.cachedCall('/api/cars/', (data) => rendered.push(data));
+    assert.equal(app.requests.length, 1);
+    assert.equal(rendered.length, 2);
+    assert.equal(rendered[0], rendered[1]);
+});
+
+test('304 keeps cached data and renders once', async () => {
+    const app = loadApp([
+        response(200, { results: [1] }, '"v1"'),
+        response(304),
+    ]);
+    const rendered = [];
+    await app.context.cachedCall('/api/cars/', () => {});
+    const cached = app.run("apiCache.get('/api/cars/')");
+    cached.at = 0;
+
+    await app.context.cachedCall('/api/cars/', (data) => rendered.push(data));
+    assert.equal(app.requests[1].headers['If-None-Match'], '"v1"');
+    assert.equal(app.requests[1].headers.Authorization, 'Bearer token');
+    assert.deepEqual(rendered, [cached.data]);
+    assert.ok(cached.at > 0);
+});
+
+test('stale cache renders first, fresh data second', async () => {
+    const app = loadApp([
+        response(200, { results: [1] }, '"v1"'),
+        response(200, { results: [2] }, '"v2"'),
+    ]);
+    const rendered = [];
+    await app.context.cachedCall('/api/cars/', () => {});
+    await app.context.cachedCall('/api/cars/', (data) => rendered.push(data.results[0]), true);
+    assert.deepEqual(rendered, [1, 2]);
+    assert.equal(app.run("apiCache.get('/api/cars/').etag"), '"v2"');
+});
+
+test('concurrent GETs share one request', async () => {
+    const app = loadApp([response(200, { results: [] })]);
+    const [first, second] = await Promise.all([
+        app.context.apiCall('/api/cars/'),
+        app.context.apiCall('/api/cars/'),
+    ]);
+    assert.equal(app.requests.length, 1);
+    assert.equal(first, second);
+    assert.equal(app.run('inflight.size'), 0);
+});
+
+test('401 refreshes the token once and retries', async () => {
+    const app = loadApp([
+        response(401),
+        response(200, { access: 'new' }),
+        response(200, { results: [] }),
+    ]);
+    await app.context.apiCall('/api/cars/');
+    assert.deepEqual(app.requests.map((r) => r.url), ['/api/cars/', '/api/auth/refresh/', '/api/cars/']);
+    assert.equal(app.requests[2].headers.Authorization, 'Bearer new');
+});
+
+test('status update rolls back on error', async () => {
+    const app = loadApp([response(500, { detail: 'error' })]);
+    app.run("currentServices = [{ id: 1, car: 7, status: 'pending', work_description: 'Oil' }]");
+    await app.context.updateServiceStatus(1, 'completed');
+    assert.equal(app.run('currentServices[0].status'), 'pending');
+    assert.equal(app.requests[0].method, 'PATCH');
+    assert.match(app.elements.get('servicesList').innerHTML, /value="pending" selected/);
+});
+
+test('status update marks the cached list stale', async () => {
+    const app = loadApp([response(200, { id: 1, status: 'completed' })]);
+    app.run(`
+        currentServices = [{ id: 1, car: 7, status: 'pending', work_description: 'Oil' }];
+        apiCache.set(servicesUrl(7), { data: { results: currentServices }, etag: '"v1"', at: Date.now() });
+    `);
+    await app.context.updateServiceStatus(1, 'completed');
+    assert.equal(app.run('currentServices[0].status'), 'completed');
+    assert.equal(app.run('apiCache.get(servicesUrl(7)).at'), 0);
+});
+
+test('delete rolls back the list and the cache on error', async () => {
+    const app = loadApp([response(500, { detail: 'error' })]);
+    app.run(`
+        selectedCarId = 7;
+        currentServices = [
+            { id: 1, car: 7, status: 'pending', work_description: 'Oil' },
+            { id: 2, car: 7, status: 'pending', work_description: 'Tyres' },
+        ];
+        apiCache.set(servicesUrl(7), { data: { results: currentServices }, etag: '"v1"', at: Date.now() });
+    `);
+    await app.context.deleteService(1);
+    assert.equal(app.requests[0].method, 'DELETE');
+    // масиви з контексту app.js — інший realm, порівнюємо копії
+    assert.deepEqual([...app.run('currentServices.map((s) => s.id)')], [1, 2]);
+    assert.deepEqual([...app.run('apiCache.get(servicesUrl(7)).data.results.map((s) => s.id)')], [1, 2]);
+});
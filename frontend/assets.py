@@ -0,0 +1,129 @@
+"""
+Збірка фронтенду (python manage.py build_assets): мініфікація і бандли JS,
+critical CSS для вбудовування в index.html, опційно Tailwind CLI замість
+CDN-скрипта. Результат — у ASSETS_BUILD_DIR; fingerprint, gzip і brotli
+додає collectstatic (CompressedManifestStaticFilesStorage).
+"""
+
+import gzip
+import json
+import re
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # optional
+    rjsmin = None
+
+# імʼя в шаблоні ({% asset_url %}) -> вихідні файли зі static/
+BUNDLES = {
+    "app.js": ["app.js"],
+}
+CRITICAL_CSS = ["app.css"]
+TAILWIND_CDN = "https://cdn.tailwindcss.com"
+TAILWIND_NAME = "tailwind.min.css"
+MANIFEST_NAME = "assets.json"
+
+
+def built_name(name):
+    stem, _, ext = name.rpartition(".")
+    return f"{stem}.min.{ext}"
+
+
+def static_dir():
+    return settings.ASSETS_BUILD_DIR / "static"
+
+
+def manifest_path():
+    return settings.ASSETS_BUILD_DIR / MANIFEST_NAME
+
+
+# =========================
+# Мініфікація
+# =========================
+
+
+def minify_js(source):
+    """
+    rjsmin; без нього (або якщо він не впорався) — вихідний код без змін
+    """
+    if rjsmin is None:
+        return source
+    try:
+        minified = rjsmin.jsmin(source)
+    except Exception:  # зламаний мініфікатор не повинен ламати збірку
+        return source
+    # бандли склеюються: кожен файл — з нового рядка
+    return minified + "\n"
+
+
+def minify_css(source):
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r"\s*([{};,>])\s*", r"\1", source)
+    source = re.sub(r":\s+", ":", source)
+    return source.replace(";}", "}").strip()
+
+
+# =========================
+# Розміри і бюджет
+# =========================
+
+
+def compressed_sizes(content):
+    """{"raw", "gzip", "brotli"} у байтах; brotli — якщо встановлений"""
+    if isinstance(content, str):
+        content = content.encode()
+    sizes = {"raw": len(content), "gzip": len(gzip.compress(content, 9))}
+    if brotli is not None:
+        sizes["brotli"] = len(brotli.compress(content))
+    return sizes
+
+
+def transfer_size(sizes):
+    """Скільки байтів піде мережею (найкраще стиснення)"""
+    return sizes.get("brotli", sizes["gzip"])
+
+
+def render_blocking_scripts(html):
+    """Зовнішні <script> без defer / async у <head>"""
+    head = html.split("</head>", 1)[0]
+    scripts = []
+    for tag in re.findall(r"<script\b[^>]*>", head):
+        src = re.search(r"src=[\"']([^\"']+)", tag)
+        if src and not re.search(r"\b(defer|async)\b", tag):
+            scripts.append(src.group(1))
+    return scripts
+
+
+# =========================
+# Маніфест збірки
+# =========================
+
+_manifest = (None, {})
+
+
+def load_manifest():
+    """
+    {"files": {вихідний: зібраний}, "critical_css": ..., "tailwind": ...};
+    перечитується, якщо збірку оновили
+    """
+    global _manifest
+    path = manifest_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    if _manifest[0] != mtime:
+        _manifest = (mtime, json.loads(path.read_text()))
+    return _manifest[1]
+
+
+def write_manifest(data):
+    manifest_path().write_text(json.dumps(data, indent=2, ensure_ascii=False))
@@ -0,0 +1,94 @@
+"""
+Початковий стан сторінки в index.html: авто користувача, сервіси першого
+авто і каталог — сторінка інтерактивна без запитів до API. Користувач —
+з cookie access (ставить app.js після входу); фрагмент кешується
+на користувача за лічильником змін його даних (cars.signals).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from cars.catalog import CATALOG_VERSION, get_catalog_snapshot
+from cars.fastpath import (
+    CAR_VALUES,
+    SERVICE_VALUES,
+    FastJSONRenderer,
+    car_row,
+    service_row,
+)
+from cars.models import Car, Service
+from cars.pagination import CarKeysetPagination, ServiceKeysetPagination
+from cars.versions import get_versions, user_version_name
+from users.authentication import ClaimsJWTAuthentication
+
+BOOTSTRAP_COOKIE = "access"
+BOOTSTRAP_TIMEOUT = 60 * 60
+# як у json_script: вміст безпечний усередині <script>
+JSON_SCRIPT_ESCAPES = {ord(">"): "\\u003E", ord("<"): "\\u003C", ord("&"): "\\u0026"}
+
+
+def bootstrap_user_id(request):
+    raw_token = request.COOKIES.get(BOOTSTRAP_COOKIE)
+    if not raw_token:
+        return None
+    try:
+        token = ClaimsJWTAuthentication().get_validated_token(raw_token.encode())
+    except InvalidToken:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def build_user_state(user_id):
+    """
+    Те саме, що перші сторінки /api/cars/ (за id) і /api/services/?car=<перше
+    авто> (новіші першими) — порядок з keyset-пагінації цих списків
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    cars = [
+        car_row(row)
+        for row in Car.objects.filter(owner_id=user_id)
+        .order_by(*CarKeysetPagination.ordering)
+        .values(*CAR_VALUES)[:page_size]
+    ]
+    services = None
+    if cars:
+        car_id = cars[0]["id"]
+        rows = (
+            Service.objects.filter(car_id=car_id)
+            .order_by(*ServiceKeysetPagination.ordering)
+            .values(*SERVICE_VALUES)[:page_size]
+        )
+        services = {"car": car_id, "results": [service_row(row) for row in rows]}
+    return {"cars": cars, "services": services}
+
+
+def _escape(content):
+    return content.decode().translate(JSON_SCRIPT_ESCAPES)
+
+
+_catalog = (None, "")
+
+
+def _catalog_json():
+    global _catalog
+    snapshot = get_catalog_snapshot()
+    if _catalog[0] != snapshot.version:
+        _catalog = (snapshot.version, _escape(snapshot.content))
+    return _catalog[1]
+
+
+def get_bootstrap(user_id):
+    """
+    JSON для <script type="application/json">: {"catalog": ..., "user": ...}
+    """
+    name = user_version_name(user_id)
+    versions = get_versions([name, CATALOG_VERSION])
+    # у рядках авто — назви брендів і моделей з каталогу
+    key = f"bootstrap:{user_id}:{versions[name][0]}:{versions[CATALOG_VERSION][0]}"
+    user_state = cache.get(key)
+    if user_state is None:
+        user_state = _escape(FastJSONRenderer().render(build_user_state(user_id)))
+        cache.set(key, user_state, BOOTSTRAP_TIMEOUT)
+    return f'{{"catalog":{_catalog_json()},"user":{user_state}}}'
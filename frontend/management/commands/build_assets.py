@@ -0,0 +1,149 @@
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import override_settings
+
+from frontend.assets import (
+    BUNDLES,
+    CRITICAL_CSS,
+    TAILWIND_NAME,
+    built_name,
+    compressed_sizes,
+    manifest_path,
+    minify_css,
+    minify_js,
+    render_blocking_scripts,
+    rjsmin,
+    static_dir,
+    transfer_size,
+    write_manifest,
+)
+
+TAILWIND_INPUT = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+TAILWIND_CONTENT = ["frontend/templates/**/*.html", "static/**/*.js"]
+
+
+def read_source(name):
+    path = finders.find(name)
+    if path is None:
+        raise CommandError(f"Static file not found: {name}")
+    with open(path) as file:
+        return file.read()
+
+
+class Command(BaseCommand):
+    help = (
+        "Зібрати фронтенд: мініфіковані бандли JS, critical CSS для index.html, "
+        "Tailwind (якщо є CLI) і звіт про розміри з бюджетом ASSET_BUDGETS. "
+        "Далі — collectstatic (fingerprint, gzip, brotli)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tailwind",
+            default=settings.TAILWIND_CLI or shutil.which("tailwindcss"),
+            help="Tailwind CSS v3 CLI (інакше лишається CDN)",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Помилка, якщо перевищено бюджет",
+        )
+
+    def handle(self, *args, **options):
+        output = static_dir()
+        output.mkdir(parents=True, exist_ok=True)
+
+        if rjsmin is None:
+            self.stderr.write("rjsmin is not installed: JS is copied unminified")
+        files = {}
+        sizes = {}
+        for name, sources in BUNDLES.items():
+            content = "".join(minify_js(read_source(source)) for source in sources)
+            files[name] = built_name(name)
+            (output / files[name]).write_text(content)
+            sizes[files[name]] = compressed_sizes(content)
+
+        critical = minify_css("".join(read_source(name) for name in CRITICAL_CSS))
+        manifest = {"files": files, "critical_css": critical}
+        if options["tailwind"]:
+            tailwind = self.build_tailwind(options["tailwind"])
+            if len(tailwind) <= settings.ASSET_INLINE_CSS_MAX:
+                manifest["critical_css"] = tailwind + critical
+                manifest["tailwind"] = "inline"
+            else:
+                (output / TAILWIND_NAME).write_text(tailwind)
+                sizes[TAILWIND_NAME] = compressed_sizes(tailwind)
+                manifest["tailwind"] = TAILWIND_NAME
+        write_manifest(manifest)
+
+        # до collectstatic manifest storage ще не має записів
+        with override_settings(
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {
+                    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+                },
+            }
+        ):
+            html = render_to_string("frontend/index.html")
+        sizes["index.html"] = compressed_sizes(html)
+
+        self.report(sizes)
+        self.stdout.write(f"manifest: {manifest_path()}")
+        self.check_budget(sizes, html, manifest, options["check"])
+
+    def build_tailwind(self, cli):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = f"{tmp}/input.css"
+            target = f"{tmp}/output.css"
+            with open(source, "w") as file:
+                file.write(TAILWIND_INPUT)
+            command = [cli, "-i", source, "-o", target, "--minify"]
+            command += ["--content", ",".join(TAILWIND_CONTENT)]
+            try:
+                subprocess.run(
+                    command, check=True, capture_output=True, cwd=settings.BASE_DIR
+                )
+            except (OSError, subprocess.CalledProcessError) as exc:
+                raise CommandError(f"Tailwind build failed: {exc}")
+            with open(target) as file:
+                return file.read()
+
+    def report(self, sizes):
+        self.stdout.write(f"{'file':>20} {'raw':>8} {'gzip':>8} {'brotli':>8}")
+        for name, row in sizes.items():
+            self.stdout.write(
+                f"{name:>20} {row['raw']:>8} {row['gzip']:>8} {row.get('brotli', '-'):>8}"
+            )
+
+    def check_budget(self, sizes, html, manifest, strict):
+        budgets = settings.ASSET_BUDGETS
+        totals = {
+            # HTML з inline critical CSS — те, що потрібно до першого рендеру
+            "html": transfer_size(sizes["index.html"]),
+            "js": sum(
+                transfer_size(sizes[name]) for name in manifest["files"].values()
+            ),
+            "css": transfer_size(sizes[TAILWIND_NAME]) if TAILWIND_NAME in sizes else 0,
+        }
+        over = []
+        for kind, total in totals.items():
+            line = f"{kind}: {total} / {budgets[kind]} bytes"
+            if total > budgets[kind]:
+                over.append(line)
+                self.stdout.write(self.style.ERROR(f"over budget {line}"))
+            else:
+                self.stdout.write(line)
+
+        for src in render_blocking_scripts(html):
+            self.stdout.write(
+                self.style.WARNING(f"render-blocking script in <head>: {src}")
+            )
+        if over and strict:
+            raise CommandError(f"Asset budget exceeded: {'; '.join(over)}")
@@ -0,0 +1,36 @@
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from frontend.assets import CRITICAL_CSS, TAILWIND_CDN, load_manifest
+
+register = template.Library()
+
+
+@register.simple_tag
+def asset_url(name):
+    """URL зібраного бандла (build_assets), інакше — вихідного файлу"""
+    return static(load_manifest().get("files", {}).get(name, name))
+
+
+@register.simple_tag
+def critical_css():
+    css = load_manifest().get("critical_css")
+    if css is None:
+        # без збірки — вихідні файли як є
+        css = "".join(open(finders.find(name)).read() for name in CRITICAL_CSS)
+    return mark_safe(f"<style>{css}</style>")
+
+
+@register.simple_tag
+def tailwind_css():
+    """Зібраний Tailwind (TAILWIND_CLI), інакше — CDN, що генерує стилі в браузері"""
+    name = load_manifest().get("tailwind")
+    if name == "inline":
+        # уже в critical_css
+        return ""
+    if name:
+        return format_html('<link rel="stylesheet" href="{}">', static(name))
+    return format_html('<script src="{}"></script>', TAILWIND_CDN)
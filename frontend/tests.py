@@ -1,3 +1,189 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.template.loader import render_to_string
+
+from autocheck_api.testing import QueryBudgetMixin
+from cars.models import Brand, CarModel, Car, Service
+from users.models import User
+from users.utils import get_tokens_for_user
+
+from .assets import minify_css, minify_js
+
+# тести без collectstatic: звичайне сховище замість manifest
+PLAIN_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class MinifyTests(SimpleTestCase):
+    def test_minify_js(self):
+        cases = {
+            "// comment\nconst url = `${API.cars}${id}/`;  /* block */\n": (
+                "const url=`${API.cars}${id}/`;\n"
+            ),
+            "let s = '// not a comment', r = /a\\/b[/]/g;\n": (
+                "let s='// not a comment',r=/a\\/b[/]/g;\n"
+            ),
+            "x = a + +b\n": "x=a+ +b\n",
+            # ділення, а не regex
+            "x = i++ / 2;\n": "x=i++/2;\n",
+            "a = {}/2\n": "a={}/2\n",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                self.assertEqual(minify_js(source), expected)
+        # двозначне для мініфікатора — лишається як є
+        self.assertEqual(minify_js("x = y-- / 2 / 3\n"), "x=y--/ 2 /3\n")
+
+    def test_minify_js_fallback(self):
+        source = "let a = 1; // без змін\n"
+        with mock.patch("frontend.assets.rjsmin", None):
+            self.assertEqual(minify_js(source), source)
+        with mock.patch("frontend.assets.rjsmin.jsmin", side_effect=ValueError):
+            self.assertEqual(minify_js(source), source)
+
+    def test_minify_css(self):
+        self.assertEqual(
+            minify_css("/* c */\n.modal {\n    display: none;\n}\n"),
+            ".modal{display:none}",
+        )
+
+
+@skipUnless(shutil.which("node"), "node is not installed")
+class AppJsTests(SimpleTestCase):
+    """
+    static/app.js під node --test (frontend/app.test.js): кеш за ETag,
+    дедуплікація запитів, відкат оптимістичних змін
+    """
+
+    def test_app_js(self):
+        result = subprocess.run(
+            ["node", "--test", str(Path(__file__).with_name("app.test.js"))],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+
+@override_settings(STORAGES=PLAIN_STORAGES, TAILWIND_CLI=None)
+class BuildAssetsTests(SimpleTestCase):
+    def test_build(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(
+            ASSETS_BUILD_DIR=Path(tmp)
+        ):
+            html = render_to_string("frontend/index.html")
+            self.assertIn("/static/app.js", html)
+
+            call_command("build_assets", tailwind=None, stdout=io.StringIO())
+            manifest = json.loads((Path(tmp) / "assets.json").read_text())
+            self.assertEqual(manifest["files"], {"app.js": "app.min.js"})
+            self.assertTrue((Path(tmp) / "static" / "app.min.js").exists())
+
+            html = render_to_string("frontend/index.html")
+            self.assertIn("/static/app.min.js", html)
+            self.assertIn(f"<style>{manifest['critical_css']}</style>", html)
+
+
+@override_settings(STORAGES=PLAIN_STORAGES)
+class BootstrapTests(QueryBudgetMixin, TestCase):
+    """
+    Початковий стан у index.html з cookie access; кеш на користувача
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", "owner@example.com", "pass12345")
+        brand = Brand.objects.create(title="BMW")
+        model = CarModel.objects.create(car_brand=brand, title="X5")
+        cls.car = Car.objects.create(
+            owner=cls.user,
+            car_brand=brand,
+            car_model=model,
+            initial_mileage=1000,
+            mileage=1000,
+        )
+        Service.objects.create(
+            car=cls.car,
+            work_description="Oil </script>",
+            hours="1.5",
+            scheduled_date="2025-01-01",
+        )
+
+    def bootstrap(self):
+        response = self.client.get("/")
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        if 'id="bootstrap"' not in html:
+            return None
+        content = html.split('<script id="bootstrap" type="application/json">')[1]
+        return json.loads(content.split("</script>")[0])
+
+    def test_anonymous(self):
+        self.assertIsNone(self.bootstrap())
+        self.client.cookies["access"] = "invalid"
+        self.assertIsNone(self.bootstrap())
+
+    def test_user_state(self):
+        self.client.cookies["access"] = get_tokens_for_user(self.user)["access"]
+        state = self.bootstrap()
+        self.assertEqual(state["catalog"]["brands"][0]["title"], "BMW")
+        self.assertEqual([car["id"] for car in state["user"]["cars"]], [self.car.pk])
+        services = state["user"]["services"]
+        self.assertEqual(services["car"], self.car.pk)
+        self.assertEqual(services["results"][0]["work_description"], "Oil </script>")
+
+        # з кешу — без запитів до БД
+        with self.assertNumQueries(0):
+            self.bootstrap()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.create(
+                car=self.car,
+                work_description="Brakes",
+                hours="2.0",
+                scheduled_date="2025-02-01",
+            )
+        self.assertEqual(len(self.bootstrap()["user"]["services"]["results"]), 2)
+
+    def test_matches_first_api_pages(self):
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        other = Car.objects.create(
+            owner=self.user,
+            car_brand=self.car.car_brand,
+            car_model=self.car.car_model,
+            initial_mileage=0,
+            mileage=0,
+        )
+        # більше за сторінку, дати не за порядком id, є однакові
+        Service.objects.bulk_create(
+            Service(
+                car=self.car,
+                work_description=f"Work {number}",
+                hours="1.0",
+                scheduled_date=datetime.date(2025, 3, 1)
+                - datetime.timedelta(days=(number * 7) % 5),
+            )
+            for number in range(page_size + 5)
+        )
+
+        self.client.cookies["access"] = get_tokens_for_user(self.user)["access"]
+        state = self.bootstrap()["user"]
+        api = self.api_client(self.user)
+        cars = api.get("/api/cars/").json()["results"]
+        self.assertEqual([car["id"] for car in cars], [self.car.pk, other.pk])
+        self.assertEqual(state["cars"], cars)
+        services = api.get(f"/api/services/?car={self.car.pk}").json()["results"]
+        self.assertEqual(len(services), page_size)
+        self.assertEqual(state["services"]["results"], services)
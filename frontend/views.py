@@ -1,5 +1,14 @@
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .bootstrap import bootstrap_user_id, get_bootstrap
 
 
 def index(request):
-    return render(request, "frontend/index.html")
+    user_id = bootstrap_user_id(request)
+    context = {"bootstrap": get_bootstrap(user_id) if user_id is not None else None}
+    response = render(request, "frontend/index.html", context)
+    # початковий стан — дані користувача з cookie
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Cookie",))
+    return response
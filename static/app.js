@@ -3,15 +3,22 @@
 // =======================
 const API = {
     login: '/api/auth/signin/',
-    refresh: '/api/auth/token/refresh/',
+    refresh: '/api/auth/refresh/',
     cars: '/api/cars/',
     brands: '/api/brands/',
     models: '/api/models/',
     services: '/api/services/',
+    catalog: '/api/catalog/',
+    events: '/api/events/',
 };
 
 let token = localStorage.getItem('access');
 let selectedCarId = null;
+let catalog = null;
+let carsById = {};
+let events = null;
+let lastEventId = null;
+let currentServices = [];
 
 
 // =======================
@@ -34,15 +41,25 @@ async function login() {
     token = data.access;
     localStorage.setItem('access', data.access);
     localStorage.setItem('refresh', data.refresh);
+    setAccessCookie(data.access);
 
     document.getElementById('userInfo').textContent = `👤 ${username}`;
     document.getElementById('loginSection').classList.add('hidden');
     document.getElementById('appSection').classList.remove('hidden');
     loadBrands();
     loadCars();
+    connectEvents();
 }
 
-async function refreshToken() {
+// Кілька одночасних 401 чекають одне оновлення токена
+let refreshing = null;
+
+function refreshToken() {
+    if (!refreshing) refreshing = requestRefresh().finally(() => { refreshing = null; });
+    return refreshing;
+}
+
+async function requestRefresh() {
     const refresh = localStorage.getItem('refresh');
     if (!refresh) return false;
 
@@ -56,47 +73,113 @@ async function refreshToken() {
 
     const data = await response.json();
     localStorage.setItem('access', data.access);
+    setAccessCookie(data.access);
     token = data.access;
     return true;
 }
 
+// Сервер читає cookie, щоб вбудувати початковий стан у сторінку (frontend.bootstrap)
+function setAccessCookie(access) {
+    const secure = location.protocol === 'https:' ? '; Secure' : '';
+    document.cookie = access
+        ? `access=${access}; path=/; SameSite=Strict${secure}`
+        : 'access=; path=/; max-age=0';
+}
+
 function logout() {
+    disconnectEvents();
     localStorage.clear();
+    setAccessCookie(null);
     token = null;
     selectedCarId = null;
+    catalog = null;
+    apiCache.clear();
     showLogin();
 }
 
 
 // =======================
-// API WRAPPER (AUTO REFRESH)
+// API WRAPPER (AUTO REFRESH, CACHE)
 // =======================
-async function apiCall(url, method = 'GET', body = null, retry = true) {
+// GET-відповіді з ETag: url -> { data, etag, at }
+const apiCache = new Map();
+// GET, що вже виконуються: url -> Promise; однакові запити йдуть одним fetch
+const inflight = new Map();
+// стільки мс запис свіжий і віддається без запиту; далі — перевірка за ETag
+const CACHE_TTL = 5000;
+
+function apiCall(url, method = 'GET', body = null) {
+    if (method !== 'GET') return apiRequest(url, method, body);
+    let pending = inflight.get(url);
+    if (!pending) {
+        pending = apiRequest(url).finally(() => inflight.delete(url));
+        inflight.set(url, pending);
+    }
+    return pending;
+}
+
+async function apiRequest(url, method = 'GET', body = null, retry = true) {
+    const cached = method === 'GET' ? apiCache.get(url) : null;
     const options = {
         method,
         headers: {
             'Content-Type': 'application/json',
-            ...(token && { Authorization: `Bearer ${token}` })
+            ...(token && { Authorization: `Bearer ${token}` }),
+            ...(cached && cached.etag && { 'If-None-Match': cached.etag })
         }
     };
 
     if (body) options.body = JSON.stringify(body);
 
-    let response = await fetch(url, options);
+    const response = await fetch(url, options);
 
     if (response.status === 401 && retry) {
         const ok = await refreshToken();
-        if (ok) return apiCall(url, method, body, false);
+        if (ok) return apiRequest(url, method, body, false);
         logout();
         throw new Error('Session expired');
     }
 
+    if (response.status === 304 && cached) {
+        cached.at = Date.now();
+        return cached.data;
+    }
+
     if (!response.ok) {
         const text = await response.text();
         throw new Error(text);
     }
 
-    return response.json();
+    const data = response.status === 204 ? null : await response.json();
+    if (method === 'GET') {
+        apiCache.set(url, { data, etag: response.headers.get('ETag'), at: Date.now() });
+    }
+    return data;
+}
+
+// stale-while-revalidate: кешовані дані малюються одразу, свіжі — коли прийдуть
+// (render не викликається вдруге, якщо сервер відповів 304)
+async function cachedCall(url, render, revalidate = false) {
+    const cached = apiCache.get(url);
+    if (cached) {
+        render(cached.data);
+        if (!revalidate && Date.now() - cached.at < CACHE_TTL) return;
+    }
+    const data = await apiCall(url);
+    if (!cached || data !== cached.data) render(data);
+}
+
+// після запису: списки ресурсу перечитуються з сервера
+function invalidate(prefix) {
+    for (const url of apiCache.keys()) {
+        if (url.startsWith(prefix)) apiCache.delete(url);
+    }
+}
+
+// дані в кеші вже оновлені локально — наступне читання перевірить їх за ETag
+function markStale(url) {
+    const cached = apiCache.get(url);
+    if (cached) cached.at = 0;
 }
 
 // =======================
@@ -116,43 +199,115 @@ function showApp() {
 // =======================
 // BOOTSTRAP
 // =======================
+function readBootstrap() {
+    const element = document.getElementById('bootstrap');
+    return element ? JSON.parse(element.textContent) : null;
+}
+
 document.addEventListener('DOMContentLoaded', () => {
-    if (token) {
-        showApp();
-        loadCars();
-    } else {
+    if (!token) {
         showLogin();
+        return;
     }
+    showApp();
+    const state = readBootstrap();
+    if (state) {
+        // авто, сервіси першого авто і каталог уже в сторінці — без запитів до API
+        catalog = state.catalog;
+        const { cars, services } = state.user;
+        const at = Date.now();
+        apiCache.set(API.cars, { data: { results: cars }, etag: null, at });
+        if (services) {
+            selectedCarId = services.car;
+            apiCache.set(servicesUrl(services.car), { data: { results: services.results }, etag: null, at });
+            document.getElementById('servicesSection').classList.remove('hidden');
+        }
+        renderCars(cars);
+        if (services) renderServices(services.results);
+    } else {
+        loadCars();
+    }
+    loadBrands();
+    connectEvents();
 });
 
 
-// API calls
-async function apiCall(endpoint, method = 'GET', body = null) {
-    const options = {
-        method,
-        headers: {
-            'Authorization': `Bearer ${token}`,
-            'Content-Type': 'application/json'
+// =======================
+// LIVE UPDATES (SSE)
+// =======================
+// Зміни з інших вкладок / клієнтів приходять подіями замість опитування
+function connectEvents() {
+    disconnectEvents();
+    if (!token || !window.EventSource) return;
+
+    // EventSource не вміє заголовки — токен у query
+    const params = new URLSearchParams({ token });
+    if (lastEventId) params.set('last_event_id', lastEventId);
+    const source = new EventSource(`${API.events}?${params}`);
+    events = source;
+
+    const track = (handler) => (event) => {
+        lastEventId = event.lastEventId || lastEventId;
+        handler(JSON.parse(event.data));
+    };
+    const onService = (type) => track((service) => {
+        if (service.car !== selectedCarId) return;
+        // власна зміна, вже показана оптимістично, — без повторного запиту
+        if (serviceShown(type, service)) return;
+        loadServices(selectedCarId, true);
+    });
+    source.addEventListener('service.created', onService('service.created'));
+    source.addEventListener('service.updated', onService('service.updated'));
+    source.addEventListener('service.deleted', onService('service.deleted'));
+    source.addEventListener('car.mileage', track(() => loadCars(true)));
+    source.addEventListener('car.deleted', track((car) => {
+        if (car.id === selectedCarId) {
+            selectedCarId = null;
+            document.getElementById('servicesSection').classList.add('hidden');
         }
+        loadCars(true);
+    }));
+    // частину подій пропущено — перечитати все
+    source.addEventListener('reset', track(() => {
+        loadCars(true);
+        if (selectedCarId) loadServices(selectedCarId, true);
+    }));
+
+    source.onerror = async () => {
+        // обрив мережі браузер перепідключає сам; CLOSED — відмова сервера (прострочений токен)
+        if (source.readyState !== EventSource.CLOSED || events !== source) return;
+        events = null;
+        if (await refreshToken()) setTimeout(connectEvents, 1000);
     };
-    
-    if (body) {
-        options.body = JSON.stringify(body);
-    }
-    
-    const response = await fetch(endpoint, options);
-    if (!response.ok) throw new Error('API call failed');
-    return response.json();
 }
 
+function disconnectEvents() {
+    if (events) events.close();
+    events = null;
+}
+
+function serviceShown(type, service) {
+    const shown = currentServices.find(s => s.id === service.id);
+    if (type === 'service.deleted') return !shown;
+    return Boolean(shown) && shown.status === service.status
+        && shown.work_description === service.work_description;
+}
+
+
 // Load data
+async function loadCatalog() {
+    // Бренди і моделі одним документом; браузер перевіряє актуальність за ETag
+    if (!catalog) catalog = await apiCall(API.catalog);
+    return catalog;
+}
+
 async function loadBrands() {
     try {
-        const response = await apiCall(API.brands);
+        const { brands } = await loadCatalog();
         const select = document.getElementById('carBrand');
         select.innerHTML = '<option value="">Оберіть бренд</option>';
         
-        response.results.forEach(brand => {
+        brands.forEach(brand => {
             const option = document.createElement('option');
             option.value = brand.id;
             option.textContent = brand.title;
@@ -173,10 +328,11 @@ async function loadModels() {
     }
     
     try {
-        const response = await apiCall(`${API.models}?brand=${brandId}`);
+        const { brands } = await loadCatalog();
+        const brand = brands.find(b => b.id === parseInt(brandId));
         
         const options = ['<option value="">Оберіть модель</option>'];
-        response.results.forEach(model => {
+        (brand ? brand.models : []).forEach(model => {
             options.push(`<option value="${model.id}">${model.title}</option>`);
         });
         select.innerHTML = options.join('');
@@ -185,99 +341,117 @@ async function loadModels() {
     }
 }
 
-async function loadCars() {
+async function loadCars(revalidate = false) {
     try {
-        const response = await apiCall(API.cars);
-        const container = document.getElementById('carsList');
-        
-        if (response.results.length === 0) {
-            container.innerHTML = '<p class="text-gray-500 text-center py-8">Немає автомобілів. Додайте свій перший автомобіль!</p>';
-            return;
-        }
-        
-        const carsHTML = response.results.map(car => `
-            <div onclick="selectCar(${car.id})" class="border-2 ${selectedCarId === car.id ? 'border-indigo-500 bg-indigo-50' : 'border-gray-200'} rounded-xl p-5 cursor-pointer hover:shadow-lg transition-all">
-                <div class="flex items-start gap-4">
-                    <div class="text-4xl">${car.logo || '🚗'}</div>
-                    <div class="flex-1">
-                        <h3 class="font-bold text-xl text-gray-900">${car.brand} ${car.model}</h3>
-                        <div class="mt-2 space-y-1 text-sm text-gray-600">
-                            <p>📊 Поточний пробіг: <span class="font-semibold">${car.mileage} км</span></p>
-                            <p>🏁 Початковий: ${car.initial_mileage} км</p>
-                            <p>📅 Оновлено: ${new Date(car.updated_mileage_at).toLocaleDateString('uk-UA')}</p>
-                        </div>
-                    </div>
-                    <button onclick="deleteCar(${car.id}, event)" class="text-red-500 hover:text-red-700 p-2 hover:bg-red-50 rounded-lg transition-colors">
-                        🗑️
-                    </button>
-                </div>
-                ${selectedCarId === car.id ? '<div class="mt-3 pt-3 border-t border-indigo-200 text-indigo-600 text-sm font-medium">✓ Обрано</div>' : ''}
-            </div>
-        `).join('');
-        
-        container.innerHTML = carsHTML;
+        await cachedCall(API.cars, (response) => renderCars(response.results), revalidate);
     } catch (error) {
         console.error('Error loading cars:', error);
     }
 }
 
-async function loadServices(carId) {
-    try {
-        const response = await apiCall(`${API.services}?car=${carId}`);
-        const services = response.results || response;
-        const container = document.getElementById('servicesList');
-        container.innerHTML = '';
-        
-        // Знайти інформацію про обране авто
-        const carsResponse = await apiCall(API.cars);
-        const selectedCar = carsResponse.results.find(car => car.id === carId);
-        if (selectedCar) {
-            document.getElementById('selectedCarInfo').textContent = `${selectedCar.brand} ${selectedCar.model} (${selectedCar.mileage} км)`;
-        }
-        
-        if (services.length === 0) {
-            container.innerHTML = '<p class="text-gray-500 text-center py-8">Немає робіт. Додайте нове обслуговування!</p>';
-            return;
-        }
-        
-        const statusColors = {
-            'pending': 'bg-yellow-100 text-yellow-800',
-            'in_progress': 'bg-blue-100 text-blue-800',
-            'completed': 'bg-green-100 text-green-800'
-        };
-        
-        services.forEach(service => {
-            container.innerHTML += `
-                <div class="border border-gray-200 rounded-xl p-5 hover:shadow-md transition-shadow">
-                    <div class="flex justify-between items-start">
-                        <div class="flex-1">
-                            <h4 class="font-bold text-lg text-gray-900">${service.work_description}</h4>
-                            <div class="flex gap-4 mt-2 text-sm text-gray-600">
-                                <span>⏱️ ${service.hours} год</span>
-                                <span>📅 ${service.scheduled_date}</span>
-                            </div>
-                        </div>
-                        <div class="flex items-center gap-2">
-                            <select onchange="updateServiceStatus(${service.id}, this.value)" class="px-3 py-1 rounded-lg text-sm font-medium ${statusColors[service.status]} border-0">
-                                <option value="pending" ${service.status === 'pending' ? 'selected' : ''}>Очікує</option>
-                                <option value="in_progress" ${service.status === 'in_progress' ? 'selected' : ''}>В роботі</option>
-                                <option value="completed" ${service.status === 'completed' ? 'selected' : ''}>Виконано</option>
-                            </select>
-                            <button onclick="deleteService(${service.id})" class="text-red-500 hover:text-red-700 p-2">🗑️</button>
-                        </div>
+function renderCars(cars) {
+    const container = document.getElementById('carsList');
+
+    if (cars.length === 0) {
+        container.innerHTML = '<p class="text-gray-500 text-center py-8">Немає автомобілів. Додайте свій перший автомобіль!</p>';
+        return;
+    }
+
+    carsById = Object.fromEntries(cars.map(car => [car.id, car]));
+    const carsHTML = cars.map(car => `
+        <div onclick="selectCar(${car.id})" class="border-2 ${selectedCarId === car.id ? 'border-indigo-500 bg-indigo-50' : 'border-gray-200'} rounded-xl p-5 cursor-pointer hover:shadow-lg transition-all">
+            <div class="flex items-start gap-4">
+                <div class="text-4xl">${car.logo || '🚗'}</div>
+                <div class="flex-1">
+                    <h3 class="font-bold text-xl text-gray-900">${car.brand} ${car.model}</h3>
+                    <div class="mt-2 space-y-1 text-sm text-gray-600">
+                        <p>📊 Поточний пробіг: <span class="font-semibold">${car.mileage} км</span></p>
+                        <p>🏁 Початковий: ${car.initial_mileage} км</p>
+                        <p>📅 Оновлено: ${new Date(car.updated_mileage_at).toLocaleDateString('uk-UA')}</p>
                     </div>
                 </div>
-            `;
-        });
+                <button onclick="deleteCar(${car.id}, event)" class="text-red-500 hover:text-red-700 p-2 hover:bg-red-50 rounded-lg transition-colors">
+                    🗑️
+                </button>
+            </div>
+            ${selectedCarId === car.id ? '<div class="mt-3 pt-3 border-t border-indigo-200 text-indigo-600 text-sm font-medium">✓ Обрано</div>' : ''}
+        </div>
+    `).join('');
+    
+    container.innerHTML = carsHTML;
+    showSelectedCarInfo();
+}
+
+function showSelectedCarInfo() {
+    const selectedCar = carsById[selectedCarId];
+    if (selectedCar) {
+        document.getElementById('selectedCarInfo').textContent = `${selectedCar.brand} ${selectedCar.model} (${selectedCar.mileage} км)`;
+    }
+}
+
+function servicesUrl(carId) {
+    return `${API.services}?car=${carId}`;
+}
+
+async function loadServices(carId, revalidate = false) {
+    try {
+        await cachedCall(servicesUrl(carId), (response) => {
+            // відповідь для іншого авто, якщо його вже змінили
+            if (carId === selectedCarId) renderServices(response.results || response);
+        }, revalidate);
     } catch (error) {
         console.error('Error loading services:', error);
     }
 }
 
+function renderServices(services) {
+    currentServices = services;
+    const container = document.getElementById('servicesList');
+    container.innerHTML = '';
+    
+    // Інформація про обране авто — зі списку, вже завантаженого loadCars()
+    showSelectedCarInfo();
+    
+    if (services.length === 0) {
+        container.innerHTML = '<p class="text-gray-500 text-center py-8">Немає робіт. Додайте нове обслуговування!</p>';
+        return;
+    }
+    
+    const statusColors = {
+        'pending': 'bg-yellow-100 text-yellow-800',
+        'in_progress': 'bg-blue-100 text-blue-800',
+        'completed': 'bg-green-100 text-green-800'
+    };
+    
+    services.forEach(service => {
+        container.innerHTML += `
+            <div class="border border-gray-200 rounded-xl p-5 hover:shadow-md transition-shadow">
+                <div class="flex justify-between items-start">
+                    <div class="flex-1">
+                        <h4 class="font-bold text-lg text-gray-900">${service.work_description}</h4>
+                        <div class="flex gap-4 mt-2 text-sm text-gray-600">
+                            <span>⏱️ ${service.hours} год</span>
+                            <span>📅 ${service.scheduled_date}</span>
+                        </div>
+                    </div>
+                    <div class="flex items-center gap-2">
+                        <select onchange="updateServiceStatus(${service.id}, this.value)" class="px-3 py-1 rounded-lg text-sm font-medium ${statusColors[service.status]} border-0">
+                            <option value="pending" ${service.status === 'pending' ? 'selected' : ''}>Очікує</option>
+                            <option value="in_progress" ${service.status === 'in_progress' ? 'selected' : ''}>В роботі</option>
+                            <option value="completed" ${service.status === 'completed' ? 'selected' : ''}>Виконано</option>
+                        </select>
+                        <button onclick="deleteService(${service.id})" class="text-red-500 hover:text-red-700 p-2">🗑️</button>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+}
+
 // Actions
 function selectCar(carId) {
     selectedCarId = carId;
-    loadCars(); // Перезавантажити список авто для оновлення виділення
+    loadCars(); // Перемалювати виділення (зі свіжого кешу — без запиту)
     loadServices(carId);
     
     // Показати секцію сервісів
@@ -298,6 +472,7 @@ async function addCar() {
     try {
         await apiCall(API.cars, 'POST', data);
         closeModal('addCarModal');
+        invalidate(API.cars);
         loadCars();
     } catch (error) {
         console.error('Error adding car:', error);
@@ -315,6 +490,8 @@ async function deleteCar(carId, event) {
             selectedCarId = null;
             document.getElementById('servicesSection').classList.add('hidden');
         }
+        invalidate(API.cars);
+        apiCache.delete(servicesUrl(carId));
         loadCars();
     } catch (error) {
         console.error('Error deleting car:', error);
@@ -332,30 +509,50 @@ async function addService() {
     try {
         await apiCall(API.services, 'POST', data);
         closeModal('addServiceModal');
-        loadServices(selectedCarId);
+        apiCache.delete(servicesUrl(data.car));
+        loadServices(data.car);
     } catch (error) {
         console.error('Error adding service:', error);
         alert('Помилка при додаванні роботи');
     }
 }
 
+// Оптимістично: список змінюється одразу, при помилці — повертається як був
 async function updateServiceStatus(serviceId, newStatus) {
+    const service = currentServices.find(s => s.id === serviceId);
+    if (!service) return;
+    const previous = service.status;
+    service.status = newStatus;
+    renderServices(currentServices);
+
     try {
         await apiCall(`${API.services}${serviceId}/`, 'PATCH', { status: newStatus });
-        loadServices(selectedCarId);
+        markStale(servicesUrl(service.car));
     } catch (error) {
         console.error('Error updating service status:', error);
+        service.status = previous;
+        renderServices(currentServices);
     }
 }
 
 async function deleteService(serviceId) {
     if (!confirm('Видалити роботу?')) return;
-    
+
+    const carId = selectedCarId;
+    const previous = currentServices;
+    const url = servicesUrl(carId);
+    const cached = apiCache.get(url);
+    currentServices = previous.filter(s => s.id !== serviceId);
+    if (cached) cached.data = { ...cached.data, results: currentServices };
+    renderServices(currentServices);
+
     try {
         await apiCall(`${API.services}${serviceId}/`, 'DELETE');
-        loadServices(selectedCarId);
+        markStale(url);
     } catch (error) {
         console.error('Error deleting service:', error);
+        if (cached) cached.data = { ...cached.data, results: previous };
+        if (carId === selectedCarId) renderServices(previous);
     }
 }
 
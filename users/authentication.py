@@ -0,0 +1,139 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import USER_CLAIMS
+
+FULL_USER_TIMEOUT = 60
+# поля users.User у кеші: для /me/ і claims; без пароля
+CACHED_USER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "photo_filename",
+    "date_birth",
+    "country",
+    "currency",
+    "distance_units",
+    "is_staff",
+    "is_active",
+)
+
+
+def _user_cache_key(user_id):
+    return f"user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(_user_cache_key(user_id))
+
+
+class ClaimsUser(TokenUser):
+    """
+    Користувач, зібраний з полів токена (id, username, currency, distance_units).
+    Повний запис users.User — через get_full_user().
+    """
+
+    @cached_property
+    def id(self):
+        # simplejwt кладе id рядком; порівнюємо з owner_id як з числом
+        return get_user_model()._meta.pk.to_python(
+            self.token[api_settings.USER_ID_CLAIM]
+        )
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @property
+    def currency(self):
+        return self.token.get("currency")
+
+    @property
+    def distance_units(self):
+        return self.token.get("distance_units")
+
+
+def get_full_user(user, fresh=False):
+    """
+    Модель users.User для request.user. Із кешу (коротке TTL) — лише
+    CACHED_USER_FIELDS, без пароля, і тільки для читання; fresh=True —
+    повний запис з БД (перед збереженням змін).
+    """
+    if not isinstance(user, ClaimsUser):
+        return user
+
+    User = get_user_model()
+    lookup = {api_settings.USER_ID_FIELD: user.id}
+    if fresh:
+        full_user = User.objects.filter(**lookup).first()
+    else:
+        key = _user_cache_key(user.id)
+        values = cache.get(key)
+        if values is None:
+            values = User.objects.filter(**lookup).values(*CACHED_USER_FIELDS).first()
+            if values is not None:
+                cache.set(key, values, FULL_USER_TIMEOUT)
+        full_user = None if values is None else User(**values)
+    if full_user is None:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    return full_user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT без запиту до users.User: користувач будується з claims.
+    Токени без claims (видані раніше) — звичайна перевірка через БД.
+    """
+
+    @staticmethod
+    def has_claims(validated_token):
+        return api_settings.USER_ID_CLAIM in validated_token and all(
+            claim in validated_token for claim in USER_CLAIMS
+        )
+
+    def get_user(self, validated_token):
+        if self.has_claims(validated_token):
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() для async views: з claims — без потоків і БД
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.has_claims(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        user = await sync_to_async(super().get_user)(validated_token)
+        return user, validated_token
+
+
+class QueryTokenJWTAuthentication(ClaimsJWTAuthentication):
+    """
+    Для EventSource (SSE), який не вміє заголовки: access token у ?token=.
+    Лише для потоку подій — токен у URL потрапляє в логи проксі.
+    """
+
+    query_param = "token"
+
+    def authenticate(self, request):
+        if self.get_header(request) is not None:
+            return super().authenticate(request)
+        raw_token = request.GET.get(self.query_param)
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import check_user_password, hash_password
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend, що перевіряє пароль в обмеженому пулі (users.hashing)
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # той самий час відповіді, що й для наявного користувача
+            hash_password(password)
+            return None
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _cost(name, default):
+    value = getattr(settings, name, None)
+    return default if value is None else value
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 з кількістю ітерацій із PASSWORD_PBKDF2_ITERATIONS
+    """
+
+    @property
+    def iterations(self):
+        return _cost("PASSWORD_PBKDF2_ITERATIONS", super().iterations)
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt з PASSWORD_SCRYPT_WORK_FACTOR (N, степінь двійки)
+    """
+
+    @property
+    def work_factor(self):
+        return _cost("PASSWORD_SCRYPT_WORK_FACTOR", super().work_factor)
+
+    @property
+    def maxmem(self):
+        # стандартна межа OpenSSL (32 МіБ) не пускає N >= 2**15;
+        # запас під старі хеші з більшим N
+        return 256 * max(self.work_factor, 2**16) * self.block_size
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    argon2 (pip install argon2-cffi) з PASSWORD_ARGON2_TIME_COST / _MEMORY_COST
+    """
+
+    @property
+    def time_cost(self):
+        return _cost("PASSWORD_ARGON2_TIME_COST", super().time_cost)
+
+    @property
+    def memory_cost(self):
+        return _cost("PASSWORD_ARGON2_MEMORY_COST", super().memory_cost)
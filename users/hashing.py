@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# pbkdf2 / scrypt (hashlib) і argon2-cffi відпускають GIL,
+# тож потоки рахують хеші паралельно на всіх ядрах
+DEFAULT_QUEUE = 32
+DEFAULT_TIMEOUT = 10
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many concurrent logins, try again shortly."
+    default_code = "hashing_busy"
+
+
+class HashingPool:
+    """
+    Обмеження паралельності хешування паролів: не більше workers одночасно,
+    не більше queue_size у черзі — решта одразу отримує HashingBusy.
+    Потік запиту чекає на результат (run блокує до timeout), тобто пул
+    не звільняє його, а лише не дає входам зайняти всі ядра і чергу воркера.
+    """
+
+    def __init__(self, workers, queue_size=DEFAULT_QUEUE, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    settings.PASSWORD_HASH_WORKERS,
+                    getattr(settings, "PASSWORD_HASH_QUEUE", DEFAULT_QUEUE),
+                    getattr(settings, "PASSWORD_HASH_TIMEOUT", DEFAULT_TIMEOUT),
+                )
+    return _pool
+
+
+def hash_password(raw_password):
+    return get_pool().run(make_password, raw_password)
+
+
+def check_user_password(user, raw_password):
+    """
+    Аналог user.check_password() через пул; застарілий хеш
+    (інший алгоритм або вартість) перераховується і зберігається
+    """
+    is_correct, must_update = get_pool().run(
+        verify_password, raw_password, user.password
+    )
+    if is_correct and must_update:
+        user.password = hash_password(raw_password)
+        user.save(update_fields=["password"])
+    return is_correct
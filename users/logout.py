@@ -2,8 +2,12 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .revocation import revoke_token
+
 
 class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
@@ -19,11 +23,17 @@ class LogoutView(APIView):
 
         try:
             token = RefreshToken(refresh)
-            token.blacklist()
-        except Exception:
+        except TokenError:
+            return Response(
+                {"detail": "Invalid refresh token"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if str(token.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.id):
             return Response(
                 {"detail": "Invalid refresh token"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        revoke_token(token, request.user.id)
+
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
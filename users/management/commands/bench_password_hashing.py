@@ -0,0 +1,83 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+from users.hashers import ScryptPasswordHasher
+
+PASSWORD = "bench-Password-123"
+
+# (алгоритм, базовий клас, атрибут вартості, значення)
+GRID = {
+    "pbkdf2": (
+        hashers.PBKDF2PasswordHasher,
+        "iterations",
+        [250_000, 500_000, 1_000_000],
+    ),
+    "scrypt": (ScryptPasswordHasher, "work_factor", [2**14, 2**15, 2**16]),
+    "argon2": (hashers.Argon2PasswordHasher, "time_cost", [1, 2, 3]),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Виміряти входи/с на ядро для кожного алгоритму і вартості хешування "
+        "(одним потоком і через пул з --workers потоків)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithms", nargs="+", choices=list(GRID), default=list(GRID)
+        )
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        current = get_hasher("default")
+        cores = os.cpu_count() or 1
+        workers = options["workers"]
+        self.stdout.write(
+            f"cores: {cores}, pool workers: {workers}, current: {current.algorithm}"
+        )
+        self.stdout.write(
+            f"{'algorithm':>10} {'cost':>10} {'ms/login':>9} {'logins/s/core':>14} "
+            f"{'pool logins/s':>14}"
+        )
+        for name in options["algorithms"]:
+            base, attribute, values = GRID[name]
+            for value in values:
+                hasher = type("BenchHasher", (base,), {attribute: value})()
+                try:
+                    single, pooled = self.measure(hasher, options["rounds"], workers)
+                except (ImportError, ValueError) as exc:
+                    self.stdout.write(f"{name:>10} {value:>10} skipped: {exc}")
+                    continue
+                marker = (
+                    " *"
+                    if hasher.algorithm == current.algorithm
+                    and getattr(current, attribute) == value
+                    else ""
+                )
+                self.stdout.write(
+                    f"{name:>10} {value:>10} {single * 1000:>9.1f} "
+                    f"{1 / single:>14.1f} {pooled:>14.1f}{marker}"
+                )
+        self.stdout.write("* — поточне налаштування")
+
+    def measure(self, hasher, rounds, workers):
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            hasher.verify(PASSWORD, encoded)
+        single = (time.perf_counter() - started) / rounds
+
+        total = rounds * workers
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            started = time.perf_counter()
+            list(pool.map(lambda _: hasher.verify(PASSWORD, encoded), range(total)))
+            pooled = total / (time.perf_counter() - started)
+        return single, pooled
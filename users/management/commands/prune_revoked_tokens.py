@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.revocation import prune_revoked_tokens
+
+
+class Command(BaseCommand):
+    help = "Видалити прострочені відкликані токени та перебудувати bloom filter"
+
+    def handle(self, *args, **options):
+        deleted = prune_revoked_tokens()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} revoked tokens"))
@@ -1,5 +1,7 @@
 from rest_framework.generics import RetrieveUpdateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+
+from .authentication import get_full_user
 
 from .serializers import UserSerializer, ProfileUpdateSerializer
 
@@ -8,7 +10,10 @@ class MeView(RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # для змін — свіжий запис з БД, а не з кешу
+        return get_full_user(
+            self.request.user, fresh=self.request.method not in SAFE_METHODS
+        )
 
     def get_serializer_class(self):
         if self.request.method in ("PUT", "PATCH"):
@@ -28,3 +28,19 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username or self.email or f"User {self.pk}"
+
+
+class RevokedToken(models.Model):
+    """
+    Відкликані refresh tokens (logout) — джерело істини для bloom filter
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="revoked_tokens", null=True
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
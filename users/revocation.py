@@ -0,0 +1,251 @@
+import datetime
+import hashlib
+import math
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .models import RevokedToken
+
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.01
+# як часто локальний фільтр звіряється з БД (store "local")
+LOCAL_RESYNC_SECONDS = 5
+# як часто перебудова фільтра заодно видаляє прострочені записи
+PRUNE_INTERVAL = 60 * 60
+PRUNE_KEY = "revocation:pruned"
+
+_HEADER = struct.Struct("<IB")
+
+
+class BloomFilter:
+    """
+    Компактна множина jti: "точно немає" або "можливо є"
+    """
+
+    def __init__(self, size, hashes, bits=None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray((size + 7) // 8) if bits is None else bytearray(bits)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def to_bytes(self):
+        return _HEADER.pack(self.size, self.hashes) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        size, hashes = _HEADER.unpack_from(data)
+        return cls(size, hashes, data[_HEADER.size :])
+
+
+def prune_expired():
+    """
+    Видалити прострочені записи, якщо цього не робили останні
+    TOKEN_REVOCATION_PRUNE_INTERVAL секунд (мітка в кеші — один процес на інтервал)
+    """
+    interval = getattr(settings, "TOKEN_REVOCATION_PRUNE_INTERVAL", PRUNE_INTERVAL)
+    if not cache.add(PRUNE_KEY, True, interval):
+        return 0
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def build_filter():
+    """
+    Фільтр з усіх ще не прострочених записів RevokedToken; таблиця
+    заодно чиститься від прострочених (prune_expired)
+    """
+    prune_expired()
+    active = RevokedToken.objects.filter(expires_at__gt=timezone.now())
+    capacity = getattr(settings, "TOKEN_REVOCATION_BLOOM_CAPACITY", BLOOM_CAPACITY)
+    bloom = BloomFilter.for_capacity(max(capacity, active.count() * 2))
+    for jti in active.values_list("jti", flat=True).iterator(chunk_size=2000):
+        bloom.add(jti)
+    return bloom
+
+
+class RevocationStore:
+    """
+    Де живе актуальний bloom filter. Локальна копія в процесі
+    перевіряється за поколінням (generation), яке змінюється з кожним відкликанням.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._bloom = None
+
+    def current_generation(self):
+        raise NotImplementedError
+
+    def load_filter(self, generation):
+        return build_filter()
+
+    def publish(self, jti):
+        raise NotImplementedError
+
+    def get_filter(self):
+        generation = self.current_generation()
+        if generation != self._generation:
+            with self._lock:
+                if generation != self._generation:
+                    self._bloom = self.load_filter(generation)
+                    self._generation = generation
+        return self._bloom
+
+
+class LocalRevocationStore(RevocationStore):
+    """
+    Фільтр лише в памʼяті процесу; відкликання з інших процесів
+    підхоплюються при звірці з БД раз на LOCAL_RESYNC_SECONDS
+    """
+
+    def __init__(self, resync_seconds=LOCAL_RESYNC_SECONDS):
+        super().__init__()
+        self.resync_seconds = resync_seconds
+
+    def current_generation(self):
+        return int(time.monotonic() // self.resync_seconds)
+
+    def publish(self, jti):
+        bloom = self._bloom
+        if bloom is not None:
+            with self._lock:
+                bloom.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._generation = None
+
+
+class CacheRevocationStore(RevocationStore):
+    """
+    Фільтр у спільному кеші (Redis): кожне відкликання — нове покоління,
+    процеси підтягують готовий фільтр замість читання БД
+    """
+
+    generation_key = "revocation:generation"
+    filter_timeout = 60 * 60
+
+    def _filter_key(self, generation):
+        return f"revocation:filter:{generation}"
+
+    def current_generation(self):
+        generation = cache.get(self.generation_key)
+        if generation is None:
+            cache.add(self.generation_key, int(time.time() * 1000), timeout=None)
+            generation = cache.get(self.generation_key)
+        return generation
+
+    def load_filter(self, generation):
+        data = cache.get(self._filter_key(generation))
+        if data is not None:
+            return BloomFilter.from_bytes(data)
+        bloom = build_filter()
+        # покоління вже замінене — не відновлювати ключ, який видалив publish
+        if cache.get(self.generation_key) == generation:
+            cache.add(
+                self._filter_key(generation), bloom.to_bytes(), self.filter_timeout
+            )
+        return bloom
+
+    def _drop_filters(self, first, last):
+        """Фільтри поколінь first..last-1 — у кеші лишається лише поточний"""
+        cache.delete_many([self._filter_key(old) for old in range(first, last)])
+
+    def _bump(self):
+        try:
+            return cache.incr(self.generation_key)
+        except ValueError:
+            self.current_generation()
+            return cache.incr(self.generation_key)
+
+    def publish(self, jti):
+        base = self.current_generation()
+        bloom = self.get_filter()
+        generation = self._bump()
+        if generation == base + 1:
+            # ніхто не відкликав паралельно — достатньо додати jti
+            with self._lock:
+                bloom = BloomFilter.from_bytes(bloom.to_bytes())
+                bloom.add(jti)
+        else:
+            bloom = build_filter()
+        cache.set(self._filter_key(generation), bloom.to_bytes(), self.filter_timeout)
+        self._drop_filters(base, generation)
+        with self._lock:
+            self._bloom, self._generation = bloom, generation
+
+    def reset(self):
+        base = self.current_generation()
+        self._drop_filters(base, self._bump())
+
+
+STORES = {
+    "local": LocalRevocationStore,
+    "cache": CacheRevocationStore,
+}
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = STORES[getattr(settings, "TOKEN_REVOCATION_STORE", "local")]()
+    return _store
+
+
+def is_revoked(jti):
+    """
+    Негативна відповідь — з bloom filter без БД; "можливо" перевіряється в таблиці
+    """
+    if jti not in get_store().get_filter():
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke_token(token, user_id=None):
+    jti = token[jwt_settings.JTI_CLAIM]
+    expires_at = datetime.datetime.fromtimestamp(token["exp"], tz=datetime.timezone.utc)
+    RevokedToken.objects.get_or_create(
+        jti=jti, defaults={"user_id": user_id, "expires_at": expires_at}
+    )
+    transaction.on_commit(lambda: get_store().publish(jti))
+
+
+def prune_revoked_tokens():
+    """
+    Видалити прострочені записи і перебудувати фільтр
+    """
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    get_store().reset()
+    return deleted
@@ -0,0 +1,26 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+    TokenRefreshSerializerExtension,
+)
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "users.authentication.ClaimsJWTAuthentication"
+
+
+class ClaimsTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = "users.serializers.ClaimsTokenObtainPairSerializer"
+
+
+class ClaimsTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "users.serializers.ClaimsTokenRefreshSerializer"
+
+
+class QueryTokenJWTScheme(OpenApiAuthenticationExtension):
+    target_class = "users.authentication.QueryTokenJWTAuthentication"
+    name = "jwtQueryAuth"
+
+    def get_security_definition(self, auto_schema):
+        return {"type": "apiKey", "in": "query", "name": "token"}
@@ -1,7 +1,19 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 
+from .authentication import ClaimsJWTAuthentication
+from .hashing import hash_password
+from .revocation import is_revoked, revoke_token
+from .tokens import ClaimsRefreshToken, add_user_claims, claims_are_current
+
 User = get_user_model()
 
 
@@ -31,7 +43,7 @@ class SignupSerializer(serializers.ModelSerializer):
         validated_data.pop("repeatPassword", None)
         password = validated_data.pop("password")
         user = User(**validated_data)
-        user.set_password(password)
+        user.password = hash_password(password)
         user.save()
         return user
 
@@ -74,3 +86,45 @@ class ProfileUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("name", "lastName", "country", "dateBirth", "photo")
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Новий access token — з claims refresh token'а, без запиту до БД.
+    Користувач змінився після видачі (claims_are_current) або токен без
+    claims — актуальні claims з БД. Відкликані (logout) tokens відхиляються.
+    """
+
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if is_revoked(refresh[jwt_settings.JTI_CLAIM]):
+            raise TokenError("Token is revoked")
+        user_id = User._meta.pk.to_python(refresh.get(jwt_settings.USER_ID_CLAIM))
+
+        user = None
+        if not ClaimsJWTAuthentication.has_claims(refresh) or not claims_are_current(
+            refresh
+        ):
+            user = User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).first()
+            if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"], "no_active_account"
+                )
+            add_user_claims(refresh, user)
+
+        # access token копіює claims з refresh
+        data = {"access": str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                revoke_token(refresh, user_id)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .tokens import CLAIM_FIELDS, mark_claims_changed
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    invalidate_cached_user(instance.pk)
+    # last_login при вході тощо — claims не змінюються
+    if update_fields is None or not update_fields.isdisjoint(CLAIM_FIELDS):
+        mark_claims_changed(instance.pk)
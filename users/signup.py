@@ -3,6 +3,8 @@ from rest_framework.generics import CreateAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
+from autocheck_api.throttling import AuthThrottle
+
 from .serializers import SignupSerializer
 from .utils import get_tokens_for_user
 
@@ -10,6 +12,7 @@ from .utils import get_tokens_for_user
 class SignupView(CreateAPIView):
     serializer_class = SignupSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [AuthThrottle]
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -0,0 +1,238 @@
+import datetime
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from autocheck_api.testing import QueryBudgetMixin
+
+from .hashing import HashingBusy, HashingPool
+from .models import RevokedToken, User
+from .revocation import (
+    CacheRevocationStore,
+    build_filter,
+    is_revoked,
+    prune_revoked_tokens,
+)
+from .utils import get_tokens_for_user
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("john", "john@mail.com", "StrongPass123")
+
+    def test_me(self):
+        client = self.api_client(self.user)
+        self.assertQueryBudget(1, lambda: client.get("/api/users/me/"), status_code=200)
+        # повний користувач уже в кеші
+        self.assertQueryBudget(0, lambda: client.get("/api/users/me/"), status_code=200)
+
+    def test_legacy_token_without_claims(self):
+        client = self.api_client()
+        access = RefreshToken.for_user(self.user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        # + запит users.User
+        self.assertQueryBudget(2, lambda: client.get("/api/cars/"), status_code=200)
+
+    def test_refresh_updates_claims(self):
+        refresh = get_tokens_for_user(self.user)["refresh"]
+        client = self.api_client()
+        # перший виклик будує фільтр відкликаних токенів
+        client.post("/api/auth/refresh/", {"refresh": refresh}, format="json")
+        # claims не змінювались — з refresh token, без БД
+        response = self.assertQueryBudget(
+            0,
+            lambda: client.post(
+                "/api/auth/refresh/", {"refresh": refresh}, format="json"
+            ),
+            status_code=200,
+        )
+        self.assertEqual(AccessToken(response.json()["access"])["currency"], "usd")
+
+        # вхід оновлює лише last_login — claims лишаються актуальними
+        self.user.save(update_fields=["last_login"])
+        self.assertQueryBudget(
+            0,
+            lambda: client.post(
+                "/api/auth/refresh/", {"refresh": refresh}, format="json"
+            ),
+            status_code=200,
+        )
+
+        self.user.currency = "uah"
+        self.user.save()
+        response = self.assertQueryBudget(
+            1,
+            lambda: client.post(
+                "/api/auth/refresh/", {"refresh": refresh}, format="json"
+            ),
+            status_code=200,
+        )
+        self.assertEqual(AccessToken(response.json()["access"])["currency"], "uah")
+
+        self.user.is_active = False
+        self.user.save()
+        response = client.post(
+            "/api/auth/refresh/", {"refresh": refresh}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_cached_user_without_password(self):
+        self.api_client(self.user).get("/api/users/me/")
+        cached = cache.get(f"user:{self.user.pk}")
+        self.assertEqual(cached["username"], "john")
+        self.assertNotIn("password", cached)
+
+    def test_me_update(self):
+        client = self.api_client(self.user)
+        self.assertQueryBudget(
+            2,
+            lambda: client.patch("/api/users/me/", {"country": "UA"}, format="json"),
+            status_code=200,
+        )
+
+    def test_signup(self):
+        payload = {
+            "username": "jane",
+            "email": "jane@mail.com",
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "password": "StrongPass123",
+            "repeatPassword": "StrongPass123",
+        }
+        self.assertQueryBudget(
+            2,
+            lambda: self.api_client().post("/api/auth/signup/", payload, format="json"),
+            status_code=201,
+        )
+
+    def test_signin(self):
+        payload = {"username": "john", "password": "StrongPass123"}
+        self.assertQueryBudget(
+            1,
+            lambda: self.api_client().post("/api/auth/signin/", payload, format="json"),
+            status_code=200,
+        )
+
+
+class RevocationTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("john", "john@mail.com", "StrongPass123")
+
+    def refresh(self, token):
+        return self.api_client().post(
+            "/api/auth/refresh/", {"refresh": token}, format="json"
+        )
+
+    def test_logout_revokes_refresh_token(self):
+        tokens = get_tokens_for_user(self.user)
+        other = get_tokens_for_user(self.user)["refresh"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api_client(self.user).post(
+                "/api/auth/logout/", {"refresh": tokens["refresh"]}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(tokens["refresh"]).status_code, 401)
+        # перевірка відкликання не додає запитів до БД
+        self.assertQueryBudget(0, lambda: self.refresh(other), status_code=200)
+
+    def test_logout_rejects_foreign_token(self):
+        stranger = User.objects.create_user("jane", "jane@mail.com", "StrongPass123")
+        refresh = get_tokens_for_user(stranger)["refresh"]
+        response = self.api_client(self.user).post(
+            "/api/auth/logout/", {"refresh": refresh}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.refresh(refresh).status_code, 200)
+
+    def test_prune_expired(self):
+        RevokedToken.objects.create(
+            jti="old", expires_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+        RevokedToken.objects.create(
+            jti="new", expires_at=timezone.now() + datetime.timedelta(minutes=1)
+        )
+        self.assertEqual(prune_revoked_tokens(), 1)
+        self.assertFalse(is_revoked("old"))
+        self.assertTrue(is_revoked("new"))
+
+    def test_cache_store_keeps_one_filter(self):
+        store = CacheRevocationStore()
+        first = store.current_generation()
+        store.get_filter()
+        for number in range(3):
+            store.publish(f"jti-{number}")
+        current = store.current_generation()
+        self.assertEqual(current, first + 3)
+        self.assertEqual(
+            [
+                generation
+                for generation in range(first, current + 1)
+                if cache.get(store._filter_key(generation)) is not None
+            ],
+            [current],
+        )
+        self.assertIn("jti-2", store.get_filter())
+
+        store.reset()
+        self.assertIsNone(cache.get(store._filter_key(current)))
+
+    def test_rebuild_prunes_periodically(self):
+        expired = timezone.now() - datetime.timedelta(minutes=1)
+        RevokedToken.objects.create(jti="old", expires_at=expired)
+        RevokedToken.objects.create(
+            jti="new", expires_at=timezone.now() + datetime.timedelta(minutes=1)
+        )
+        bloom = build_filter()
+        self.assertNotIn("old", bloom)
+        self.assertIn("new", bloom)
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["new"]
+        )
+
+        # до кінця інтервалу — без DELETE
+        RevokedToken.objects.create(jti="older", expires_at=expired)
+        with self.assertNumQueries(2):
+            build_filter()
+        self.assertTrue(RevokedToken.objects.filter(jti="older").exists())
+
+
+class PasswordHashingTests(TestCase):
+    def test_pool_sheds_load_when_full(self):
+        pool = HashingPool(workers=1, queue_size=0)
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait()
+
+        thread = threading.Thread(target=pool.run, args=(hold,))
+        thread.start()
+        started.wait()
+        try:
+            with self.assertRaises(HashingBusy):
+                pool.run(time.sleep, 0)
+        finally:
+            release.set()
+            thread.join()
+        self.assertIsNone(pool.run(time.sleep, 0))
+
+    def test_signin_rehashes_outdated_password(self):
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = User.objects.create_user("john", "john@mail.com", "StrongPass123")
+        response = self.client.post(
+            "/api/auth/signin/",
+            {"username": "john", "password": "StrongPass123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertFalse(user.password.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(user.check_password("StrongPass123"))
@@ -0,0 +1,45 @@
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# поля користувача, які кладемо в токен, щоб не читати users.User на кожен запит
+USER_CLAIMS = ("username", "currency", "distance_units", "is_staff")
+# зміна цих полів робить claims виданих токенів застарілими
+CLAIM_FIELDS = (*USER_CLAIMS, "is_active")
+
+
+def _claims_changed_key(user_id):
+    return f"user:{user_id}:claims_changed"
+
+
+def mark_claims_changed(user_id):
+    """
+    Токени, видані до цієї миті, при refresh беруть claims з БД
+    (мітка живе, поки живуть refresh tokens)
+    """
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    cache.set(_claims_changed_key(user_id), int(time.time()), timeout)
+
+
+def claims_are_current(token):
+    changed = cache.get(_claims_changed_key(token[api_settings.USER_ID_CLAIM]))
+    # та сама секунда — вважаємо застарілими
+    return changed is None or token["iat"] > changed
+
+
+def add_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token з полями користувача; access token успадковує їх
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return add_user_claims(super().for_user(user), user)
@@ -3,14 +3,25 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
+
+from autocheck_api.throttling import AuthThrottle
+
 from .signup import SignupView
 from .logout import LogoutView
 from .me import MeView
 
 urlpatterns = [
     path("auth/signup/", SignupView.as_view()),
-    path("auth/signin/", TokenObtainPairView.as_view(), name="signin"),
-    path("auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "auth/signin/",
+        TokenObtainPairView.as_view(throttle_classes=[AuthThrottle]),
+        name="signin",
+    ),
+    path(
+        "auth/refresh/",
+        TokenRefreshView.as_view(throttle_classes=[AuthThrottle]),
+        name="token_refresh",
+    ),
     path("auth/logout/", LogoutView.as_view()),
     path("users/me/", MeView.as_view()),
 ]
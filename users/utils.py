@@ -1,8 +1,8 @@
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import ClaimsRefreshToken
 
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsRefreshToken.for_user(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),